@@ -265,6 +265,14 @@ typedef struct MediaState {
 	/* The offset between now and the time of the current frame, at least for video. */
 	double time_offset;
 
+	/* The priority the decode scheduler gives this stream. */
+	int priority; // Schedule lock.
+
+	/* The time spent decoding, and waiting for the decode scheduler, in
+	 * seconds. */
+	double decode_seconds; // Lock.
+	double wait_seconds; // Lock.
+
 } MediaState;
 
 static AVFrame *dequeue_frame(FrameQueue *fq);
@@ -272,6 +280,122 @@ static void free_packet_queue(PacketQueue *pq);
 static SurfaceQueueEntry *dequeue_surface(SurfaceQueueEntry **queue);
 
 
+/* Decode scheduler ***********************************************************/
+
+/* Each stream is decoded by its own thread, but only decode_workers of those
+ * threads may decode at once. When more want to, the streams with the highest
+ * priority go first.
+ */
+
+#define PRIORITIES 5
+
+/* Protects the scheduler state. */
+static SDL_mutex *schedule_lock = NULL;
+
+/* Signalled when a decode slot becomes free, or priorities change. */
+static SDL_cond *schedule_cond = NULL;
+
+/* The number of streams that may decode at once, or 0 for no limit. */
+static int decode_workers = 0;
+
+/* The number of streams that are decoding. */
+static int decode_active = 0;
+
+/* The number of streams of each priority that are waiting to decode. */
+static int decode_waiting[PRIORITIES];
+
+static int clamp_priority(int priority) {
+	if (priority < 0) {
+		return 0;
+	}
+
+	if (priority >= PRIORITIES) {
+		return PRIORITIES - 1;
+	}
+
+	return priority;
+}
+
+/* Returns true if a stream of priority is allowed to start decoding. Must be
+ * called with schedule_lock held.
+ */
+static int schedule_can_decode(int priority) {
+	if (decode_workers && decode_active >= decode_workers) {
+		return 0;
+	}
+
+	for (int i = priority + 1; i < PRIORITIES; i++) {
+		if (decode_waiting[i]) {
+			return 0;
+		}
+	}
+
+	return 1;
+}
+
+/* Waits until the stream can decode, and takes a decode slot. */
+static void schedule_acquire(MediaState *ms) {
+
+	if (!schedule_lock) {
+		return;
+	}
+
+	double start = av_gettime() * 1e-6;
+
+	SDL_LockMutex(schedule_lock);
+
+	int priority = ms->priority;
+
+	decode_waiting[priority] += 1;
+
+	while (!ms->quit && !schedule_can_decode(priority)) {
+		SDL_CondWait(schedule_cond, schedule_lock);
+
+		// The priority may have been changed while waiting.
+		if (priority != ms->priority) {
+			decode_waiting[priority] -= 1;
+			priority = ms->priority;
+			decode_waiting[priority] += 1;
+		}
+	}
+
+	decode_waiting[priority] -= 1;
+	decode_active += 1;
+
+	SDL_CondBroadcast(schedule_cond);
+	SDL_UnlockMutex(schedule_lock);
+
+	SDL_LockMutex(ms->lock);
+	ms->wait_seconds += av_gettime() * 1e-6 - start;
+	SDL_UnlockMutex(ms->lock);
+}
+
+/* Gives up a decode slot. */
+static void schedule_release(MediaState *ms) {
+
+	if (!schedule_lock) {
+		return;
+	}
+
+	SDL_LockMutex(schedule_lock);
+	decode_active -= 1;
+	SDL_CondBroadcast(schedule_cond);
+	SDL_UnlockMutex(schedule_lock);
+}
+
+/* Wakes up streams waiting for the scheduler, so they can notice a change. */
+static void schedule_wake(void) {
+
+	if (!schedule_lock) {
+		return;
+	}
+
+	SDL_LockMutex(schedule_lock);
+	SDL_CondBroadcast(schedule_cond);
+	SDL_UnlockMutex(schedule_lock);
+}
+
+
 /* A queue of MediaState objects that are awaiting deallocation.*/
 static MediaState *deallocate_queue = NULL;
 
@@ -1181,6 +1305,10 @@ static int decode_thread(void *arg) {
 
 	while (!ms->quit) {
 
+		schedule_acquire(ms);
+
+		double start = av_gettime() * 1e-6;
+
 		if (! ms->audio_finished) {
 			decode_audio(ms);
 		}
@@ -1189,8 +1317,14 @@ static int decode_thread(void *arg) {
 			decode_video(ms);
 		}
 
+		double end = av_gettime() * 1e-6;
+
+		schedule_release(ms);
+
 		SDL_LockMutex(ms->lock);
 
+		ms->decode_seconds += end - start;
+
 		if (!ms->ready) {
 			ms->ready = 1;
 			SDL_CondBroadcast(ms->cond);
@@ -1589,6 +1723,68 @@ void media_close(MediaState *ms) {
 	SDL_CondBroadcast(ms->cond);
 	SDL_UnlockMutex(ms->lock);
 
+	schedule_wake();
+}
+
+/**
+ * Sets the priority the decode scheduler gives the stream, from 0 (lowest)
+ * to 4 (highest).
+ */
+void media_priority(MediaState *ms, int priority) {
+
+	priority = clamp_priority(priority);
+
+	if (!schedule_lock) {
+		ms->priority = priority;
+		return;
+	}
+
+	SDL_LockMutex(schedule_lock);
+	ms->priority = priority;
+	SDL_CondBroadcast(schedule_cond);
+	SDL_UnlockMutex(schedule_lock);
+}
+
+/**
+ * Sets the number of streams that can decode at once. If 0, there is no
+ * limit.
+ */
+void media_decode_workers(int workers) {
+
+	if (workers < 0) {
+		workers = 0;
+	}
+
+	if (!schedule_lock) {
+		decode_workers = workers;
+		return;
+	}
+
+	SDL_LockMutex(schedule_lock);
+	decode_workers = workers;
+	SDL_CondBroadcast(schedule_cond);
+	SDL_UnlockMutex(schedule_lock);
+}
+
+/**
+ * Retrieves information about the stream's buffers - the number of seconds
+ * of audio and number of video frames that have been decoded but not yet
+ * played, and the time spent decoding and waiting to decode.
+ */
+void media_buffer_info(MediaState *ms, double *audio_seconds, int *video_frames, double *decode_seconds, double *wait_seconds) {
+
+#ifndef __EMSCRIPTEN__
+	SDL_LockMutex(ms->lock);
+#endif
+
+	*audio_seconds = 1.0 * ms->audio_queue_samples / audio_sample_rate;
+	*video_frames = ms->surface_queue_size;
+	*decode_seconds = ms->decode_seconds;
+	*wait_seconds = ms->wait_seconds;
+
+#ifndef __EMSCRIPTEN__
+	SDL_UnlockMutex(ms->lock);
+#endif
 }
 
 void media_advance_time(void) {
@@ -1604,6 +1800,11 @@ void media_init(int rate, int status, int equal_mono) {
 
     deallocate_mutex = SDL_CreateMutex();
 
+#ifndef __EMSCRIPTEN__
+    schedule_lock = SDL_CreateMutex();
+    schedule_cond = SDL_CreateCond();
+#endif
+
 	audio_sample_rate = rate / SPEED;
 	audio_equal_mono = equal_mono;
 
@@ -78,6 +78,10 @@ SDL_Surface *media_read_video(struct MediaState *ms);
 double media_duration(struct MediaState *ms);
 void media_wait_ready(struct MediaState *ms);
 
+void media_priority(struct MediaState *ms, int priority);
+void media_decode_workers(int workers);
+void media_buffer_info(struct MediaState *ms, double *audio_seconds, int *video_frames, double *decode_seconds, double *wait_seconds);
+
 /* Min and Max */
 #define min(a, b) (((a) < (b)) ? (a) : (b))
 #define max(a, b) (((a) > (b)) ? (a) : (b))
@@ -275,6 +279,12 @@ struct Channel {
      */
     float last_volume;
 
+    /**
+     * The priority the decode scheduler gives the playing stream. Queued
+     * streams are given the lowest priority until they start playing.
+     */
+    int priority;
+
 };
 
 struct Dying {
@@ -458,6 +468,10 @@ static void callback(void *userdata, Uint8 *stream, int length) {
                 c->queued_start_ms = 0;
                 c->queued_relative_volume = 1.0;
 
+                if (c->playing) {
+                    media_priority(c->playing, c->priority);
+                }
+
                 if (c->playing_fadein) {
                     old_tight = 0;
                 }
@@ -560,7 +574,7 @@ static int check_channel(int c) {
  * Loads the provided stream. Returns the stream on success, NULL on
  * failure.
  */
-struct MediaState *load_stream(SDL_RWops *rw, const char *ext, double start, double end, int video) {
+struct MediaState *load_stream(SDL_RWops *rw, const char *ext, double start, double end, int video, int priority) {
     struct MediaState *rv;
     rv = media_open(rw, ext);
     if (rv == NULL)
@@ -568,6 +582,7 @@ struct MediaState *load_stream(SDL_RWops *rw, const char *ext, double start, dou
         return NULL;
     }
     media_start_end(rv, start, end);
+    media_priority(rv, priority);
 
     if (video) {
         media_want_video(rv, video);
@@ -613,7 +628,7 @@ void RPS_play(int channel, SDL_RWops *rw, const char *ext, const char *name, int
 
     /* Allocate playing sample. */
 
-    c->playing = load_stream(rw, ext, start, end, c->video);
+    c->playing = load_stream(rw, ext, start, end, c->video, c->priority);
 
     if (! c->playing) {
         UNLOCK_AUDIO();
@@ -652,7 +667,7 @@ void RPS_queue(int channel, SDL_RWops *rw, const char *ext, const char *name, in
         return;
     }
 
-    MediaState *ms = load_stream(rw, ext, start, end, c->video);
+    MediaState *ms = load_stream(rw, ext, start, end, c->video, 0);
 
     LOCK_AUDIO();
 
@@ -968,6 +983,68 @@ int RPS_get_pos(int channel) {
     return rv;
 }
 
+/*
+ * Sets the priority the decode scheduler gives the playing stream on the
+ * channel, from 0 (lowest) to 4 (highest).
+ */
+void RPS_set_priority(int channel, int priority) {
+    struct Channel *c;
+
+    if (check_channel(channel)) {
+        return;
+    }
+
+    c = &channels[channel];
+
+    LOCK_NAME();
+
+    c->priority = priority;
+
+    if (c->playing) {
+        media_priority(c->playing, priority);
+    }
+
+    UNLOCK_NAME();
+
+    error(SUCCESS);
+}
+
+/*
+ * Sets the number of streams that can be decoded at once. If 0, any number
+ * can be.
+ */
+void RPS_set_decode_workers(int workers) {
+    media_decode_workers(workers);
+    error(SUCCESS);
+}
+
+/*
+ * Retrieves information about the buffers of the playing stream on the
+ * channel. Returns 1 if a stream is playing, and 0 otherwise.
+ */
+int RPS_buffer_info(int channel, double *audio_seconds, int *video_frames, double *decode_seconds, double *wait_seconds) {
+    int rv = 0;
+    struct Channel *c;
+
+    if (check_channel(channel)) {
+        return 0;
+    }
+
+    c = &channels[channel];
+
+    LOCK_NAME();
+
+    if (c->playing) {
+        media_buffer_info(c->playing, audio_seconds, video_frames, decode_seconds, wait_seconds);
+        rv = 1;
+    }
+
+    UNLOCK_NAME();
+
+    error(SUCCESS);
+    return rv;
+}
+
 /*
  * Returns the duration of the file playing on the given channel, in
  * seconds.
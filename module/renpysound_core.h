@@ -43,6 +43,9 @@ void RPS_set_volume(int channel, float volume);
 float RPS_get_volume(int channel);
 void RPS_set_pan(int channel, float pan, float delay);
 void RPS_set_secondary_volume(int channel, float vol2, float delay);
+void RPS_set_priority(int channel, int priority);
+void RPS_set_decode_workers(int workers);
+int RPS_buffer_info(int channel, double *audio_seconds, int *video_frames, double *decode_seconds, double *wait_seconds);
 
 
 int RPS_video_ready(int channel);
@@ -149,6 +149,7 @@ cython("renpy.pydict")
 cython("renpy.style")
 
 cython("renpy.encryption")
+cython("renpy.chunking")
 
 # renpy.compat
 if PY2:
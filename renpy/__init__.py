@@ -215,6 +215,7 @@ backup_blacklist = {
     "renpy.display.swdraw",
     "renpy.display.test",
     "renpy.six",
+    "renpy.startupprofile",
     "renpy.text.ftfont",
     "renpy.test",
     "renpy.test.testast",
@@ -362,6 +363,66 @@ class Backup(_object):
 # A backup of the Ren'Py modules after initial import.
 backup = None
 
+################################################################################
+# Lazy modules
+################################################################################
+
+# A map from the name of a module that isn't imported by import_all, but
+# the first time it's used, to the list of commands the module registers.
+# Python 2 doesn't support module __getattr__, so these are imported by
+# import_all there.
+#
+# Modules that every game uses before its first interaction stay in
+# import_all, as deferring them would only move the time they take. These
+# include renpy.gl2 (the default renderer, created by the interface),
+# renpy.display.video (polled by every interaction), and renpy.sl2.slparser
+# (used by the screen language statements the common code registers).
+lazy_modules = {
+    "renpy.add_from" : [ "add_from" ],
+    "renpy.benchmark" : [ "benchmark", "benchmark_parse", "benchmark_save" ],
+    "renpy.chunking" : [ ],
+    "renpy.translation.dialogue" : [ "dialogue" ],
+    "renpy.translation.extract" : [ "extract_strings" ],
+    "renpy.translation.generation" : [ "translate" ],
+    "renpy.translation.merge" : [ "merge_strings" ],
+    }
+
+
+def lazy_getattr(package, name):
+    """
+    Implements the module __getattr__ of `package`, importing and returning
+    lazy modules when they are first accessed.
+    """
+
+    module = package + "." + name
+
+    if module not in lazy_modules:
+        raise AttributeError("module {!r} has no attribute {!r}".format(package, name))
+
+    import importlib
+    return importlib.import_module(module)
+
+
+def __getattr__(name):
+    return lazy_getattr("renpy", name)
+
+
+def unload_lazy_modules():
+    """
+    Removes the lazy modules that have been imported, so they will be
+    imported again after a reload.
+    """
+
+    for name in lazy_modules:
+
+        if name not in sys.modules:
+            continue
+
+        del sys.modules[name]
+
+        package, _, attr = name.rpartition(".")
+        vars(sys.modules[package]).pop(attr, None)
+
 ################################################################################
 # Import
 ################################################################################
@@ -390,6 +451,7 @@ def import_all():
 
     import renpy.config
     import renpy.log
+    import renpy.startupprofile
 
     import renpy.arguments # @UnresolvedImport
 
@@ -430,6 +492,7 @@ def import_all():
     import renpy.scriptedit
     import renpy.parser
     import renpy.performance
+    import renpy.gcmanager
     import renpy.pydict
     import renpy.revertable
     import renpy.rollback
@@ -452,10 +515,6 @@ def import_all():
     import renpy.substitutions
     import renpy.translation
     import renpy.translation.scanstrings
-    import renpy.translation.generation
-    import renpy.translation.dialogue
-    import renpy.translation.extract
-    import renpy.translation.merge
 
     import renpy.display
 
@@ -466,6 +525,7 @@ def import_all():
     import renpy.display.render
     import renpy.display.displayable
     import renpy.display.core
+    import renpy.display.idle
     import renpy.display.swdraw
 
     import renpy.text
@@ -539,9 +599,16 @@ def import_all():
     import renpy.exports
     import renpy.character
 
-    import renpy.add_from
     import renpy.dump
 
+    # Import or register the commands of the lazy modules.
+    for name, commands in lazy_modules.items():
+        if PY2:
+            __import__(pystr(name))
+        else:
+            for command in commands:
+                renpy.arguments.register_lazy_command(command, name)
+
     import renpy.gl2.gl2draw
     import renpy.gl2.gl2mesh
     import renpy.gl2.gl2model
@@ -605,6 +672,9 @@ def post_import():
     # Import everything into renpy.exports, provided it isn't
     # already there.
     for k, v in globals().items():
+        if k == "__getattr__":
+            continue
+
         renpy.exports.__dict__.setdefault(k, v)
 
 
@@ -665,6 +735,8 @@ def reload_all():
         elif any(issubmodule(i, m) for m in reload_modules):
             del sys.modules[i]
 
+    unload_lazy_modules()
+
     # Restore the state of all modules from backup.
     backup.restore() # type: ignore
 
@@ -688,8 +760,10 @@ if 1 == 0:
     from . import ast
     from . import atl
     from . import audio
+    from . import benchmark
     from . import bootstrap
     from . import character
+    from . import chunking
     from . import color
     from . import compat
     from . import config
@@ -705,6 +779,7 @@ if 1 == 0:
     from . import execution
     from . import exports
     from . import game
+    from . import gcmanager
     from . import gl
     from . import gl2
     from . import lexer
@@ -734,6 +809,7 @@ if 1 == 0:
     from . import script
     from . import scriptedit
     from . import sl2
+    from . import startupprofile
     from . import statements
     from . import style
     from . import styledata
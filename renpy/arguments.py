@@ -31,6 +31,7 @@ from renpy.compat import PY2, basestring, bchr, bord, chr, open, pystr, range, r
 
 
 import argparse
+import importlib
 import os
 import sys
 
@@ -49,6 +50,10 @@ commands = { }
 # True if the command requires the display, false if it doesn't.
 display = { }
 
+# A map from command name to the name of the module that registers the
+# command, for modules that are imported the first time they're used.
+lazy_commands = { }
+
 # Commands that force compile to be set.
 compile_commands = { "compile", "add_from", "merge_strings" }
 
@@ -76,7 +81,7 @@ class ArgumentParser(argparse.ArgumentParser):
 
         argparse.ArgumentParser.__init__(self, description="The Ren'Py visual novel engine.", add_help=False)
 
-        command_names = ", ".join(sorted(commands))
+        command_names = ", ".join(sorted(set(commands) | set(lazy_commands)))
 
         if require_command:
 
@@ -134,6 +139,10 @@ class ArgumentParser(argparse.ArgumentParser):
             '--safe-mode', dest='safe_mode', action='store_true', default=False,
             help="Forces Ren'Py to start in safe mode, allowing the player to configure graphics.")
 
+        self.add_argument(
+            "--profile-startup", action="store", metavar="FILE", default=None,
+            help="Writes the time taken to import each module and by each phase of startup to FILE, as JSON. If FILE is -, writes it to standard output.")
+
         dump = self.add_argument_group("JSON dump arguments", description="Ren'Py can dump information about the game to a JSON file. These options let you select the file, and choose what is dumped.")
         dump.add_argument("--json-dump", action="store", metavar="FILE", help="The name of the JSON file.")
         dump.add_argument("--json-dump-private", action="store_true", default=False, help="Include private names. (Names beginning with _.)")
@@ -254,6 +263,16 @@ def register_command(name, function, uses_display=False):
     display[name] = uses_display
 
 
+def register_lazy_command(name, module):
+    """
+    Registers a command that is registered by `module`, a module that
+    isn't imported until it's used. The module is imported when the
+    command is run.
+    """
+
+    lazy_commands[name] = module
+
+
 def bootstrap():
     """
     Called during bootstrap to perform an initial parse of the arguments, ignoring
@@ -292,6 +311,9 @@ def post_init():
     if command == "run" and renpy.game.args.lint: # type: ignore
         command = "lint"
 
+    if (command not in commands) and (command in lazy_commands):
+        importlib.import_module(lazy_commands[command])
+
     if command not in commands:
         ArgumentParser().error("Command {0} is unknown.".format(command))
 
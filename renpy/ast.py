@@ -3057,3 +3057,62 @@ class RPY(Node):
 
     def get_code(self):
         return "rpy " + " ".join(self.rest)
+
+
+class MissingNode(Node):
+    """
+    Stands in for a node that was saved by name, when a save is loaded into
+    a script that no longer has a node with that name. Executing it raises
+    an exception.
+    """
+
+    __slots__ = [ ]
+
+    def __init__(self, name):
+        super(MissingNode, self).__init__(("<missing>", 0))
+
+        self.name = name
+
+    def diff_info(self):
+        return (MissingNode, self.name)
+
+    def execute(self):
+        raise Exception("Could not find the statement {!r}, as the script has changed.".format(self.name))
+
+
+def node_by_name(name):
+    """
+    Returns the node in the script with `name`, or a MissingNode if there
+    isn't one. This is used to load nodes that were saved by reduce_node.
+    """
+
+    rv = renpy.game.script.namemap.get(name, None)
+
+    if rv is None:
+        rv = MissingNode(name)
+
+    return rv
+
+
+def reduce_node(node):
+    """
+    A save reducer that saves a node that's in the script by its name,
+    rather than saving the node and the rest of the script it leads to.
+    Nodes whose names won't be the same the next time the game runs, like
+    those created by renpy.load_string, are saved as usual.
+    """
+
+    name = node.name
+
+    if isinstance(name, tuple) and name[0].startswith("<"):
+        stable = False
+    else:
+        stable = (name is not None) and (renpy.game.script.namemap.get(name, None) is node)
+
+    if not stable:
+        return node.__reduce_ex__(renpy.compat.pickle.PROTOCOL)
+
+    return (node_by_name, (name, ))
+
+
+renpy.compat.pickle.register_save_reducer(Node, reduce_node, subclasses=True)
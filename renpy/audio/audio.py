@@ -35,6 +35,7 @@ import pygame_sdl2 # @UnusedImport
 import os
 import re
 import threading
+import multiprocessing
 import sys
 import io
 
@@ -259,6 +260,10 @@ class Channel(object):
         # The time the secondary volume of this channel was last set.
         self.secondary_volume_time = None
 
+        # The priority the decode scheduler was last given for this
+        # channel.
+        self.priority = None
+
         # Should we stop playing on mute?
         self.stop_on_mute = stop_on_mute
 
@@ -420,6 +425,30 @@ class Channel(object):
 
         return fn, start, end
 
+    def get_priority(self):
+        """
+        Returns the priority the decode scheduler should give the streams
+        playing on this channel. Video that's being shown goes first, then
+        voice, then music, then everything else.
+        """
+
+        if self.movie != renpy.audio.renpysound.NO_VIDEO:
+
+            if renpy.display.video.fullscreen and (self.name == "movie"):
+                return renpysound.VIDEO_PRIORITY
+
+            for channels in list(renpy.display.video.displayable_channels):
+                if self.name in channels:
+                    return renpysound.VIDEO_PRIORITY
+
+        if self.mixer in renpy.config.voice_mixers:
+            return renpysound.VOICE_PRIORITY
+
+        if self.mixer == "music":
+            return renpysound.MUSIC_PRIORITY
+
+        return renpysound.OTHER_PRIORITY
+
     def periodic(self):
         """
         This is the periodic call that causes this channel to load new stuff
@@ -444,6 +473,12 @@ class Channel(object):
             renpysound.set_volume(self.number, vol)
             self.actual_volume = vol
 
+        priority = self.get_priority()
+
+        if priority != self.priority:
+            renpysound.set_priority(self.number, priority)
+            self.priority = priority
+
         # This should be set from something that checks to see if our
         # mixer is muted.
         force_stop = self.context.force_stop or (renpy.game.preferences.mute.get(self.mixer, False) and self.stop_on_mute)
@@ -742,6 +777,16 @@ class Channel(object):
 
         return renpysound.get_duration(self.number)
 
+    def get_buffer_info(self):
+
+        if not pcm_ok:
+            return None
+
+        if self._number is None:
+            return None
+
+        return renpysound.buffer_info(self.number)
+
     def set_pan(self, pan, delay):
 
         with lock:
@@ -996,6 +1041,17 @@ def init():
             except Exception:
                 pcm_ok = False
 
+    if pcm_ok:
+        workers = renpy.config.audio_decode_workers
+
+        if workers is None:
+            try:
+                workers = multiprocessing.cpu_count()
+            except Exception:
+                workers = 0
+
+        renpysound.set_decode_workers(workers)
+
     # Find all of the mixers in the game.
     mixers = [ ]
 
@@ -390,6 +390,41 @@ def get_pos(channel="music"):
         return None
 
 
+def get_buffer_info(channel="music"):
+    """
+    :doc: audio
+
+    Returns information about how far ahead the audio or video file playing
+    on `channel` has been decoded, or None if no file is playing on
+    `channel`. This is a dictionary with the following keys:
+
+    "audio"
+        The number of seconds of audio that have been decoded, but not yet
+        played.
+
+    "video"
+        The number of frames of video that have been decoded, but not yet
+        shown.
+
+    "decode"
+        The total time, in seconds, spent decoding the file.
+
+    "wait"
+        The total time, in seconds, the file spent waiting to be decoded
+        while other files were decoded. See :var:`config.audio_decode_workers`.
+    """
+
+    try:
+        c = renpy.audio.audio.get_channel(channel)
+        return c.get_buffer_info()
+
+    except Exception:
+        if renpy.config.debug_sound:
+            raise
+
+        return None
+
+
 def get_duration(channel="music"):
     """
     :doc: audio
@@ -73,6 +73,9 @@ cdef extern from "renpysound_core.h":
     float RPS_get_volume(int channel)
     void RPS_set_pan(int channel, float pan, float delay)
     void RPS_set_secondary_volume(int channel, float vol2, float delay)
+    void RPS_set_priority(int channel, int priority)
+    void RPS_set_decode_workers(int workers)
+    int RPS_buffer_info(int channel, double *audio_seconds, int *video_frames, double *decode_seconds, double *wait_seconds)
 
     void RPS_advance_time()
     int RPS_video_ready(int channel)
@@ -319,6 +322,72 @@ def get_volume(channel):
 
     return RPS_get_volume(channel)
 
+# The priorities the decode scheduler gives streams.
+PREFETCH_PRIORITY = 0
+OTHER_PRIORITY = 1
+MUSIC_PRIORITY = 2
+VOICE_PRIORITY = 3
+VIDEO_PRIORITY = 4
+
+def set_priority(channel, priority):
+    """
+    Sets the priority the decode scheduler gives the stream playing on
+    `channel`, and the streams that play on it later. Streams that are
+    queued have PREFETCH_PRIORITY until they start playing.
+
+    `priority`
+        One of the *_PRIORITY constants.
+    """
+
+    RPS_set_priority(channel, priority)
+    check_error()
+
+def set_decode_workers(workers):
+    """
+    Sets the number of streams that can be decoded at the same time. When
+    more streams need decoding, the ones with the highest priority go first.
+    If 0, there is no limit.
+    """
+
+    RPS_set_decode_workers(workers)
+
+def buffer_info(channel):
+    """
+    Returns information about the buffers of the stream playing on
+    `channel`, or None if nothing is playing. This is a dict with the
+    following keys:
+
+    `audio`
+        The number of seconds of audio that have been decoded, but not
+        played.
+
+    `video`
+        The number of frames of video that have been decoded, but not
+        shown.
+
+    `decode`
+        The number of seconds the stream has spent decoding.
+
+    `wait`
+        The number of seconds the stream has spent waiting for the decode
+        scheduler.
+    """
+
+    cdef double audio_seconds = 0.0
+    cdef int video_frames = 0
+    cdef double decode_seconds = 0.0
+    cdef double wait_seconds = 0.0
+
+    if not RPS_buffer_info(channel, &audio_seconds, &video_frames, &decode_seconds, &wait_seconds):
+        return None
+
+    return {
+        "audio" : audio_seconds,
+        "video" : video_frames,
+        "decode" : decode_seconds,
+        "wait" : wait_seconds,
+        }
+
 def video_ready(channel):
     """
     Returns true if the video playing on `channel` has a frame ready for
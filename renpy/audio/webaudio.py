@@ -343,6 +343,36 @@ def get_volume(channel):
     return call_int("get_volume", channel)
 
 
+@proxy_with_channel
+def set_priority(channel, priority):
+    """
+    Sets the priority the decode scheduler gives `channel`. The browser
+    schedules decoding itself, so this does nothing.
+    """
+
+    return
+
+
+@proxy_call_both
+def set_decode_workers(workers):
+    """
+    Sets the number of streams that can be decoded at the same time. The
+    browser schedules decoding itself, so this does nothing.
+    """
+
+    return
+
+
+@proxy_with_channel
+def buffer_info(channel):
+    """
+    Returns information about the buffers of the stream playing on
+    `channel`. The browser doesn't expose this, so this returns None.
+    """
+
+    return None
+
+
 @proxy_with_channel
 def video_ready(channel):
     """
@@ -0,0 +1,539 @@
+# Copyright 2004-2023 Tom Rothamel <pytom@bishoujo.us>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# This file implements the benchmark command, which runs the game with the
+# null renderer, skipping through dialogue and choosing menu choices
+# automatically, and reports how quickly the script executes as JSON.
+
+from __future__ import division, absolute_import, with_statement, print_function, unicode_literals
+from renpy.compat import PY2, basestring, bchr, bord, chr, open, pystr, range, round, str, tobytes, unicode # *
+
+import gc
+import json
+import os
+import sys
+import time
+import zlib
+
+import renpy
+
+clock = getattr(time, "perf_counter", time.time)
+
+# True if a benchmark is running.
+running = False
+
+# The arguments to the benchmark command.
+args = None
+
+# The time the benchmark started at, or None if it hasn't started yet.
+start_time = None
+
+# The number of statements executed.
+statements = 0
+
+# The number of times the start label has been reached. The benchmark ends
+# when it's reached a second time, as that means the game has ended and
+# begun again.
+starts = 0
+
+# A map from the name of a statement type to a [ count, seconds ] list.
+nodes = { }
+
+# The name of the type of the statement that's running, when it started,
+# and the excluded time when it started.
+current = None
+current_start = 0.0
+current_excluded = 0.0
+
+# The number of interactions, and the time spent in them.
+interactions = 0
+interaction_seconds = 0.0
+
+# The number of times the rollback log began a new entry, and the time
+# that took.
+rollbacks = 0
+rollback_seconds = 0.0
+
+# The number of objects tracked by the garbage collector when the
+# benchmark started.
+objects_start = 0
+
+
+def excluded():
+    """
+    Returns the time that isn't counted towards the time taken by
+    statements.
+    """
+
+    return interaction_seconds + rollback_seconds
+
+
+def statement(node):
+    """
+    Called before `node` executes.
+    """
+
+    global start_time
+    global objects_start
+    global statements
+    global starts
+    global current
+    global current_start
+    global current_excluded
+
+    if not running:
+        return
+
+    now = clock()
+
+    if start_time is None:
+        start_time = now
+        objects_start = len(gc.get_objects())
+
+    if current is not None:
+        entry = nodes.get(current, None)
+
+        if entry is None:
+            entry = nodes[current] = [ 0, 0.0 ]
+
+        entry[0] += 1
+        entry[1] += (now - current_start) - (excluded() - current_excluded)
+
+    if isinstance(node, renpy.ast.Label) and (node.name == "start"):
+        starts += 1
+
+        if starts > 1:
+            finish()
+
+    check(now)
+
+    statements += 1
+
+    current = type(node).__name__
+    current_start = clock()
+    current_excluded = excluded()
+
+
+def interaction(seconds):
+    """
+    Called at the end of an interaction that took `seconds`.
+    """
+
+    global interactions
+    global interaction_seconds
+
+    if not running:
+        return
+
+    interactions += 1
+    interaction_seconds += seconds
+
+
+def rollback(seconds):
+    """
+    Called when beginning a rollback log entry took `seconds`.
+    """
+
+    global rollbacks
+    global rollback_seconds
+
+    if not running:
+        return
+
+    rollbacks += 1
+    rollback_seconds += seconds
+
+
+def start_interact():
+    """
+    Called at the start of each interaction, to keep skipping going.
+    """
+
+    renpy.config.skipping = "slow"
+    renpy.config.allow_skipping = True
+    renpy.store._skipping = True
+
+
+def check(now=None):
+    """
+    Ends the benchmark if it's run for too long, or executed too many
+    statements.
+    """
+
+    if (not running) or (start_time is None):
+        return
+
+    if now is None:
+        now = clock()
+
+    if args.statements and (statements >= args.statements):
+        finish()
+
+    if now - start_time >= args.seconds:
+        finish()
+
+
+def stat(count, seconds):
+    """
+    Returns a dict giving `count` and `seconds`, and the mean time in
+    microseconds.
+    """
+
+    return {
+        "count" : count,
+        "seconds" : round(seconds, 6),
+        "mean_us" : round(1000000.0 * seconds / count, 3) if count else 0.0,
+        }
+
+
+def report():
+    """
+    Returns the results of the benchmark, as a dict that can be serialized
+    as JSON.
+    """
+
+    total = clock() - start_time if start_time is not None else 0.0
+    script_seconds = max(total - interaction_seconds, 0.0)
+
+    rv = {
+        "version" : renpy.version_only,
+        "python" : "{}.{}".format(*sys.version_info[:2]),
+        "seconds" : round(total, 6),
+        "statements" : statements,
+        "statements_per_second" : round(statements / total, 3) if total else 0.0,
+        "script_statements_per_second" : round(statements / script_seconds, 3) if script_seconds else 0.0,
+        "completed" : starts > 1,
+        "interactions" : stat(interactions, interaction_seconds),
+        "rollback" : stat(rollbacks, rollback_seconds),
+        "nodes" : { k : stat(v[0], v[1]) for k, v in sorted(nodes.items()) },
+        }
+
+    objects_end = len(gc.get_objects())
+
+    memory = {
+        "objects_start" : objects_start,
+        "objects_end" : objects_end,
+        "objects_growth" : objects_end - objects_start,
+        }
+
+    try:
+        import resource
+        memory["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        pass
+
+    rv["memory"] = memory
+
+    return rv
+
+
+def finish():
+    """
+    Ends the benchmark, writes out the report, and quits.
+    """
+
+    global running
+
+    if not running:
+        return
+
+    running = False
+    renpy.game.benchmark = False
+
+    s = str(json.dumps(report(), indent=1))
+
+    if args.output == "-":
+        renpy.log.real_stdout.write(s + "\n")
+    else:
+        with open(args.output, "w") as f:
+            f.write(s + "\n")
+
+    raise renpy.game.QuitException()
+
+
+def benchmark_command():
+    """
+    The benchmark command. This runs the game without a display, and
+    reports how quickly it executes.
+    """
+
+    ap = renpy.arguments.ArgumentParser(description="Runs the game without a display, skipping through dialogue and automatically choosing menu choices, and reports how quickly the script executes as JSON.")
+    ap.add_argument("--output", default="-", help="The file the results are written to. If -, the results are written to standard output.")
+    ap.add_argument("--seconds", default=60.0, type=float, help="The longest the benchmark will run for, in seconds.")
+    ap.add_argument("--statements", default=0, type=int, help="If not 0, the benchmark ends after this many statements have been run.")
+
+    global args
+    args = ap.parse_args()
+
+    os.environ["RENPY_RENDERER"] = "null"
+    os.environ["RENPY_SKIP_SPLASHSCREEN"] = "1"
+    os.environ["RENPY_SKIP_MAIN_MENU"] = "1"
+
+    renpy.config.skip_delay = 0
+    renpy.config.auto_choice_delay = 0.001
+    renpy.config.has_autosave = False
+    renpy.config.autosave_on_quit = False
+
+    renpy.config.start_interact_callbacks.append(start_interact)
+    renpy.config.periodic_callbacks.append(check)
+
+    renpy.game.preferences.skip_unseen = True
+    renpy.game.preferences.skip_after_choices = True
+    renpy.game.preferences.transitions = 0
+
+    renpy.persistent.should_save_persistent = False
+
+    global running
+    running = True
+    renpy.game.benchmark = True
+
+    return True
+
+
+def synthetic_script(lines):
+    """
+    Returns a synthetic Ren'Py script, with about `lines` lines, that uses
+    a mix of common statements.
+    """
+
+    rv = [ ]
+
+    i = 0
+
+    while len(rv) < lines:
+
+        rv.extend([
+            "label bench_{}:".format(i),
+            "",
+            "    # Comment {}.".format(i),
+            "    scene bg room{} with dissolve".format(i % 7),
+            "    show eileen happy at left",
+            '    e "Hello, [player_name]. This is line {} of the benchmark."'.format(i),
+            '    "Narration with {b}text tags{/b} and a \\"quote\\"."',
+            "    $ score += {}".format(i % 13),
+            "    $ flags = {{ 'seen' : True, 'count' : {} }}".format(i),
+            "",
+            "    python:",
+            "        total = sum(range({}))".format(i % 100),
+            "        names = [ 'a', 'b', 'c' ]",
+            "",
+            "    if score > {}:".format(i % 50),
+            '        e "You have a high score."',
+            "    elif score > 10:",
+            '        e """',
+            '        A triple-quoted string.',
+            '        """',
+            "    else:",
+            "        pass",
+            "",
+            "    menu:",
+            '        "Choice one" if score > 1:',
+            "            jump bench_{}".format(i + 1),
+            '        "Choice two":',
+            "            call bench_{}".format(i + 1),
+            "",
+            "    hide eileen",
+            "    return",
+            "",
+            ])
+
+        i += 1
+
+    return "\n".join(rv) + "\n"
+
+
+def benchmark_parse_command():
+    """
+    The benchmark_parse command. This parses a large synthetic script, and
+    reports how quickly it can be divided into lines, and parsed.
+    """
+
+    ap = renpy.arguments.ArgumentParser(description="Parses a synthetic script, and reports how quickly it was parsed as JSON.")
+    ap.add_argument("--output", default="-", help="The file the results are written to. If -, the results are written to standard output.")
+    ap.add_argument("--lines", default=100000, type=int, help="The number of lines in the synthetic script.")
+    ap.add_argument("--repeat", default=3, type=int, help="The number of times to parse the script. The fastest time is reported.")
+
+    args = ap.parse_args()
+
+    data = synthetic_script(args.lines)
+    lines = data.count("\n")
+
+    fn = os.path.join(renpy.config.gamedir, "benchmark_parse.rpy")
+
+    times = {
+        "logical_lines" : [ ],
+        "group" : [ ],
+        "parse" : [ ],
+        }
+
+    for _i in range(max(args.repeat, 1)):
+
+        start = clock()
+        logical = renpy.lexer.list_logical_lines(fn, data)
+        times["logical_lines"].append(clock() - start)
+
+        start = clock()
+        renpy.lexer.group_logical_lines(logical)
+        times["group"].append(clock() - start)
+
+        start = clock()
+        renpy.parser.parse(fn, data)
+        times["parse"].append(clock() - start)
+
+    if renpy.parser.parse_errors:
+        raise Exception("The synthetic script did not parse:\n" + "\n".join(renpy.parser.parse_errors))
+
+    rv = {
+        "version" : renpy.version_only,
+        "python" : "{}.{}".format(*sys.version_info[:2]),
+        "lines" : lines,
+        "logical_lines" : len(logical),
+        }
+
+    for k, v in times.items():
+        best = min(v)
+
+        rv[k] = {
+            "seconds" : round(best, 6),
+            "lines_per_second" : round(lines / best, 3) if best else 0.0,
+            }
+
+    s = str(json.dumps(rv, indent=1))
+
+    if args.output == "-":
+        renpy.log.real_stdout.write(s + "\n")
+    else:
+        with open(args.output, "w") as f:
+            f.write(s + "\n")
+
+    return False
+
+
+def synthetic_state(entries):
+    """
+    Returns a synthetic game state, made of the types that make up most of
+    a save: a store of revertable objects, and `entries` rollback entries,
+    each with its scene list entries and transform states.
+    """
+
+    store = renpy.revertable.RevertableDict()
+
+    for i in range(200):
+        store["var_{}".format(i)] = i
+        store["name_{}".format(i)] = "Name {}".format(i)
+        store["list_{}".format(i)] = renpy.revertable.RevertableList(range(i % 20))
+        store["dict_{}".format(i)] = renpy.revertable.RevertableDict({ "seen" : True, "count" : i })
+
+    log = [ ]
+
+    for i in range(entries):
+
+        rb = renpy.rollback.Rollback.__new__(renpy.rollback.Rollback)
+        rb.objects = [ (store["list_{}".format(i % 200)], list(range(i % 20))) ]
+        rb.purged = False
+        rb.random = [ ]
+        rb.forward = None
+        rb.stores = { "store" : { "var_{}".format(i % 200) : i } }
+        rb.delta_ebc = { }
+        rb.retain_after_load = False
+        rb.checkpoint = True
+        rb.hard_checkpoint = True
+        rb.not_greedy = False
+        rb.identifier = (0, i)
+
+        scene = [ ]
+
+        for j in range(5):
+            ts = renpy.display.transform.TransformState()
+            ts.xpos = j / 5.0
+            ts.ypos = 1.0
+            ts.xanchor = 0.5
+            ts.yanchor = 1.0
+            ts.zoom = 1.0
+            ts.alpha = 1.0
+
+            sle = renpy.display.core.SceneListEntry("tag{}".format(j), j, 0.0, 0.0, renpy.display.layout.Null(), ("tag{}".format(j), "happy"))
+
+            scene.append((sle, ts))
+
+        log.append((rb, scene))
+
+    return (store, log)
+
+
+def benchmark_save_command():
+    """
+    The benchmark_save command. This pickles and unpickles a synthetic game
+    state with the stock reductions and with the save reducers, and reports
+    how long that took, and how large the result is.
+    """
+
+    ap = renpy.arguments.ArgumentParser(description="Saves and loads a synthetic game state, and reports how quickly that happened and the size of the save as JSON.")
+    ap.add_argument("--output", default="-", help="The file the results are written to. If -, the results are written to standard output.")
+    ap.add_argument("--entries", default=1000, type=int, help="The number of rollback entries in the synthetic game state.")
+    ap.add_argument("--repeat", default=3, type=int, help="The number of times to save and load the state. The fastest time is reported.")
+
+    args = ap.parse_args()
+
+    state = synthetic_state(args.entries)
+
+    rv = {
+        "version" : renpy.version_only,
+        "python" : "{}.{}".format(*sys.version_info[:2]),
+        "entries" : args.entries,
+        }
+
+    for name, save in [ ("stock", False), ("save_reducers", True) ]:
+
+        dump_times = [ ]
+        load_times = [ ]
+
+        for _i in range(max(args.repeat, 1)):
+
+            start = clock()
+            data = renpy.compat.pickle.dumps(state, save=save)
+            dump_times.append(clock() - start)
+
+            start = clock()
+            renpy.compat.pickle.loads(data)
+            load_times.append(clock() - start)
+
+        rv[name] = {
+            "dump_seconds" : round(min(dump_times), 6),
+            "load_seconds" : round(min(load_times), 6),
+            "bytes" : len(data),
+            "compressed_bytes" : len(zlib.compress(data)),
+            }
+
+    s = str(json.dumps(rv, indent=1))
+
+    if args.output == "-":
+        renpy.log.real_stdout.write(s + "\n")
+    else:
+        with open(args.output, "w") as f:
+            f.write(s + "\n")
+
+    return False
+
+
+renpy.arguments.register_command("benchmark", benchmark_command)
+renpy.arguments.register_command("benchmark_parse", benchmark_parse_command)
+renpy.arguments.register_command("benchmark_save", benchmark_save_command)
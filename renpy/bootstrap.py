@@ -175,6 +175,10 @@ def bootstrap(renpy_base):
     import renpy.arguments
     args = renpy.arguments.bootstrap()
 
+    if args.profile_startup:
+        import renpy.startupprofile
+        renpy.startupprofile.start(args.profile_startup)
+
     if args.trace:
         enable_trace(args.trace)
 
@@ -249,6 +253,9 @@ You may be using a system install of python. Please run {0}.sh,
     import renpy
     renpy.import_all()
 
+    if args.profile_startup:
+        renpy.startupprofile.end_imports()
+
     renpy.loader.init_importer()
 
     exit_status = None
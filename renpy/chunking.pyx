@@ -0,0 +1,373 @@
+# Copyright 2004-2023 Tom Rothamel <pytom@bishoujo.us>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# This file contains the content-defined chunking used to build and apply
+# delta updates. A file is split into chunks at points determined by a
+# rolling hash of its contents, so an insertion or deletion only changes
+# the chunks around it. The distributor writes an index of the chunks in
+# an update file, and a data file containing each distinct chunk. The
+# updater chunks the files it already has, and only downloads the chunks
+# it doesn't have.
+
+from __future__ import print_function
+
+from libc.stdint cimport uint8_t, uint64_t
+
+import hashlib
+import os
+import struct
+import zlib
+
+# The smallest and largest chunks, in bytes, other than the last chunk
+# of a file.
+DEF MIN_SIZE = 16384
+DEF MAX_SIZE = 262144
+
+# A chunk ends where the low bits of the hash are all zero, giving an
+# average chunk size of about MIN_SIZE + 64k.
+DEF MASK = 0xffff
+
+# The number of bytes that affect the gear hash.
+DEF WINDOW = 64
+
+# The magic number at the start of an index.
+MAGIC = b"RENPY CHUNKS 1\n"
+
+# The format of an index entry, following the 32-byte digest.
+ENTRY = struct.Struct("<QII")
+
+cdef uint64_t gear[256]
+
+cdef void init_gear():
+    """
+    Fills the gear table with pseudo-random numbers, using splitmix64 so the
+    table is the same everywhere.
+    """
+
+    cdef uint64_t x = 0x52656e2750792121ULL
+    cdef uint64_t z
+    cdef int i
+
+    for 0 <= i < 256:
+        x += 0x9e3779b97f4a7c15ULL
+        z = x
+        z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL
+        z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL
+        gear[i] = z ^ (z >> 31)
+
+init_gear()
+
+
+cdef Py_ssize_t find_cut(const uint8_t *p, Py_ssize_t n):
+    """
+    Returns the length of the chunk at the start of the `n` bytes at `p`,
+    or 0 if more data is needed to find the end of the chunk.
+    """
+
+    cdef uint64_t h = 0
+    cdef Py_ssize_t i
+
+    if n <= MIN_SIZE:
+        return 0
+
+    # The hash only depends on the last WINDOW bytes, so it's safe to start
+    # WINDOW bytes before the first place a chunk can end.
+    for MIN_SIZE - WINDOW <= i < n:
+        h = (h << 1) + gear[p[i]]
+
+        if i + 1 < MIN_SIZE:
+            continue
+
+        if (h & MASK) == 0:
+            return i + 1
+
+        if i + 1 >= MAX_SIZE:
+            return MAX_SIZE
+
+    return 0
+
+
+def chunk_file(fn):
+    """
+    Splits the file `fn` into chunks. Returns a list of (offset, length,
+    digest) tuples, where digest is the SHA-256 of the chunk.
+    """
+
+    cdef bytes buf = b""
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t cut
+    cdef const uint8_t *p
+
+    rv = [ ]
+
+    offset = 0
+    eof = False
+
+    with open(fn, "rb") as f:
+
+        while True:
+
+            if (not eof) and (len(buf) - pos < MAX_SIZE):
+                data = f.read(1024 * 1024)
+
+                if data:
+                    buf = buf[pos:] + data
+                    pos = 0
+                else:
+                    eof = True
+
+                continue
+
+            if pos >= len(buf):
+                break
+
+            p = <const uint8_t *> <const char *> buf
+            cut = find_cut(p + pos, len(buf) - pos)
+
+            if cut == 0:
+                cut = len(buf) - pos
+
+            rv.append((offset, cut, hashlib.sha256(buf[pos:pos + cut]).digest()))
+
+            offset += cut
+            pos += cut
+
+    return rv
+
+
+def make_delta(fn, index_fn, data_fn):
+    """
+    Chunks the file `fn`. Writes each distinct chunk, compressed, to the
+    data file `data_fn`, and writes the index of the chunks to `index_fn`.
+    """
+
+    # A map from digest to the index entry for that chunk.
+    entries = { }
+
+    index = [ ]
+
+    with open(fn, "rb") as f, open(data_fn, "wb") as data_f:
+
+        for offset, length, digest in chunk_file(fn):
+
+            entry = entries.get(digest, None)
+
+            if entry is None:
+                f.seek(offset)
+                data = zlib.compress(f.read(length), 9)
+
+                entry = ENTRY.pack(data_f.tell(), len(data), length)
+                entries[digest] = entry
+
+                data_f.write(data)
+
+            index.append(digest + entry)
+
+    with open(index_fn, "wb") as f:
+        f.write(MAGIC)
+        f.write(zlib.compress(b"".join(index)))
+
+
+def read_index(data):
+    """
+    Reads the index in the bytes `data`. Returns a list of (digest,
+    data_offset, data_length, length) tuples, one per chunk, in order.
+    """
+
+    if not data.startswith(MAGIC):
+        raise Exception("Not a chunk index.")
+
+    data = zlib.decompress(data[len(MAGIC):])
+
+    size = 32 + ENTRY.size
+
+    if len(data) % size:
+        raise Exception("The chunk index is truncated.")
+
+    rv = [ ]
+
+    for i in range(0, len(data), size):
+        data_offset, data_length, length = ENTRY.unpack_from(data, i + 32)
+        rv.append((data[i:i + 32], data_offset, data_length, length))
+
+    return rv
+
+
+def apply_delta(index, sources, out_fn, fetch, progress=None):
+    """
+    Builds the file described by `index`, which is returned by read_index,
+    in `out_fn`.
+
+    `sources`
+        A list of files that may contain chunks of the new file, like
+        previous versions of it. These are chunked, and matching chunks
+        are copied from them.
+
+    `fetch`
+        A function that's called with a start and end offset in the data
+        file, and returns the bytes in that range.
+
+    `progress`
+        If not None, a function that's called with the fraction of the
+        work done, from 0.0 to 1.0.
+
+    Returns the number of bytes fetched.
+    """
+
+    # A map from digest to a (filename, offset, length) tuple.
+    local = { }
+
+    for fn in sources:
+        for offset, length, digest in chunk_file(fn):
+            local.setdefault(digest, (fn, offset, length))
+
+    # The chunks that have to be fetched, as a map from digest to
+    # (data_offset, data_length).
+    missing = { }
+
+    for digest, data_offset, data_length, length in index:
+        if digest not in local:
+            missing[digest] = (data_offset, data_length)
+
+    # Group the missing chunks into runs that are next to each other in the
+    # data file, so they can be fetched together.
+    runs = [ ]
+
+    for data_offset, data_length in sorted(missing.values()):
+        if runs and (runs[-1][1] == data_offset) and (runs[-1][1] - runs[-1][0] < 16 * 1024 * 1024):
+            runs[-1][1] = data_offset + data_length
+        else:
+            runs.append([ data_offset, data_offset + data_length ])
+
+    total = sum(end - start for start, end in runs) + sum(i[3] for i in index)
+    done = 0
+
+    # The fetched data is stored, decompressed, in this file, and fetched
+    # is a map from digest to (offset, length) in it.
+    fetched = { }
+    fetched_bytes = 0
+
+    missing_at = { v[0] : k for k, v in missing.items() }
+
+    with open(out_fn + ".chunks", "wb+") as chunks_f:
+
+        for start, end in runs:
+            data = fetch(start, end)
+
+            if len(data) != end - start:
+                raise Exception("Fetched {} bytes of chunk data, expected {}.".format(len(data), end - start))
+
+            fetched_bytes += len(data)
+
+            offset = start
+
+            while offset < end:
+                digest = missing_at[offset]
+                data_length = missing[digest][1]
+
+                chunk = zlib.decompress(data[offset - start:offset - start + data_length])
+
+                fetched[digest] = (chunks_f.tell(), len(chunk))
+                chunks_f.write(chunk)
+
+                offset += data_length
+
+            done += end - start
+
+            if progress is not None:
+                progress(1.0 * done / total)
+
+        files = { }
+
+        try:
+
+            with open(out_fn, "wb") as out_f:
+
+                for digest, data_offset, data_length, length in index:
+
+                    if digest in fetched:
+                        f = chunks_f
+                        offset, length = fetched[digest]
+                    else:
+                        fn, offset, length = local[digest]
+
+                        f = files.get(fn, None)
+
+                        if f is None:
+                            f = files[fn] = open(fn, "rb")
+
+                    f.seek(offset)
+                    chunk = f.read(length)
+
+                    if hashlib.sha256(chunk).digest() != digest:
+                        raise Exception("A chunk does not have the correct digest.")
+
+                    out_f.write(chunk)
+
+                    done += length
+
+                    if progress is not None:
+                        progress(1.0 * done / total)
+
+        finally:
+            for f in files.values():
+                f.close()
+
+    try:
+        os.unlink(out_fn + ".chunks")
+    except Exception:
+        pass
+
+    return fetched_bytes
+
+
+class URLFetcher(object):
+    """
+    A fetch function for apply_delta that downloads byte ranges of the data
+    file at `url`. If the server doesn't support ranges, the whole data file
+    is downloaded once, and the ranges are taken from it.
+
+    Calling this returns None if the server returns an error.
+    """
+
+    def __init__(self, url):
+        self.url = url
+
+        # The whole data file, if the server doesn't support ranges.
+        self.whole = None
+
+    def __call__(self, start, end):
+
+        if self.whole is not None:
+            return self.whole[start:end]
+
+        import requests
+
+        resp = requests.get(self.url, headers={ "Range" : "bytes={}-{}".format(start, end - 1) })
+
+        if resp.status_code == 206:
+            return resp.content
+
+        if resp.status_code == 200:
+            self.whole = resp.content
+            return self.whole[start:end]
+
+        return None
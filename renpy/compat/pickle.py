@@ -30,6 +30,55 @@ import io
 # Protocol 2 can be loaded on Python 2 and Python 3.
 PROTOCOL = 2
 
+# A map from a type to a function that reduces objects of exactly that
+# type when the game is saved, in place of their __reduce_ex__ method.
+save_reducers = { }
+
+# A map from a type to a function that reduces objects of that type and its
+# subclasses when the game is saved.
+subclass_save_reducers = { }
+
+
+def register_save_reducer(cls, function, subclasses=False):
+    """
+    Registers `function` to reduce objects of exactly the type `cls` when
+    the game is saved. The function takes the object, and returns a tuple
+    like the one returned by __reduce__. It's not used to pickle script
+    or cache files.
+
+    `subclasses`
+        If true, the function is also used for the subclasses of `cls`,
+        including those defined after this is called.
+    """
+
+    if subclasses:
+        subclass_save_reducers[cls] = function
+    else:
+        save_reducers[cls] = function
+
+
+def save_dispatch_table():
+    """
+    Returns a map from type to the function used to reduce objects of that
+    type when the game is saved. This is computed when a save begins, so it
+    includes subclasses defined by the game.
+    """
+
+    rv = { }
+
+    def add_subclasses(cls, function):
+        rv[cls] = function
+
+        for i in cls.__subclasses__():
+            add_subclasses(i, function)
+
+    for cls, function in subclass_save_reducers.items():
+        add_subclasses(cls, function)
+
+    rv.update(save_reducers)
+
+    return rv
+
 if PY2:
 
     import cPickle # type: ignore
@@ -46,20 +95,43 @@ if PY2:
         else:
             return pickle.loads(s)
 
-    def dump(o, f, highest=False):
+    # The save reducers require Pickler.dispatch_table, which Python 2
+    # doesn't have, so saves use the stock reductions.
+
+    def dump(o, f, highest=False, save=False):
         if renpy.config.use_cpickle:
             cPickle.dump(o, f, PROTOCOL)
         else:
             pickle.dump(o, f,PROTOCOL)
 
-    def dumps(o, highest=False): # type: ignore
+    def dumps(o, highest=False, save=False): # type: ignore
         if renpy.config.use_cpickle:
             return cPickle.dumps(o, PROTOCOL)
         else:
             return pickle.dumps(o, PROTOCOL)
 
+    def pickler(f, highest=False, save=False): # type: ignore
+        if renpy.config.use_cpickle:
+            return cPickle.Pickler(f, PROTOCOL)
+        else:
+            return pickle.Pickler(f, PROTOCOL)
+
+    def unpickler(f): # type: ignore
+        if renpy.config.use_cpickle:
+            return cPickle.Unpickler(f)
+        else:
+            return pickle.Unpickler(f)
+
+    def pickler_memo(p): # type: ignore
+        return { k : v[0] for k, v in p.memo.items() }
+
+    def unpickler_memo(up): # type: ignore
+        # The pure-Python unpickler uses strings as keys.
+        return { int(k) : v for k, v in up.memo.items() }
+
 else:
 
+    import copyreg
     import functools
     import datetime
 
@@ -92,15 +164,81 @@ else:
 
             return super().find_class(module, name)
 
+    def unpickler(f):
+        """
+        Returns an unpickler that reads from `f`. Each call to its load
+        method loads an object written by a call to the dump method of a
+        pickler from `pickler`, and can refer to objects that earlier calls
+        loaded.
+        """
+
+        return Unpickler(f, fix_imports=True, encoding="utf-8", errors="surrogateescape")
+
+    def pickler_memo(p):
+        """
+        Returns a map from the id of each object that the pickler `p` has
+        pickled to its index in the pickle memo.
+        """
+
+        return { k : v[0] for k, v in p.memo.copy().items() }
+
+    def unpickler_memo(up):
+        """
+        Returns a map from the index of each object in the memo of the
+        unpickler `up` to the object.
+        """
+
+        return up.memo.copy()
+
     def load(f):
-        up = Unpickler(f, fix_imports=True, encoding="utf-8", errors="surrogateescape")
-        return up.load()
+        return unpickler(f).load()
 
     def loads(s):
         return load(io.BytesIO(s))
 
-    def dump(o, f, highest=False):
-        pickle.dump(o, f, pickle.HIGHEST_PROTOCOL if highest else PROTOCOL)
+    class SavePickler(pickle.Pickler):
+        """
+        A pickler that uses the save reducers for the types they've been
+        registered for, and the usual reductions for everything else.
+        """
+
+        def __init__(self, f, protocol):
+
+            # This has to be set before the pickler is initialized, as
+            # that's when it's read.
+            self.dispatch_table = dict(copyreg.dispatch_table)
+            self.dispatch_table.update(save_dispatch_table())
+
+            super().__init__(f, protocol)
+
+    def pickler(f, highest=False, save=False):
+        """
+        Returns a pickler that writes to `f`. If `save` is true, the save
+        reducers are used. Objects pickled by a call to the dump method are
+        shared with the objects pickled by later calls, rather than being
+        pickled again.
+        """
+
+        protocol = pickle.HIGHEST_PROTOCOL if highest else PROTOCOL
+
+        if save:
+            return SavePickler(f, protocol)
+        else:
+            return pickle.Pickler(f, protocol)
+
+    def dump(o, f, highest=False, save=False):
+        """
+        Pickles `o` to the file `f`. If `save` is true, the save reducers
+        are used.
+        """
+
+        pickler(f, highest, save).dump(o)
+
+    def dumps(o, highest=False, save=False):
+
+        if save:
+            f = io.BytesIO()
+            dump(o, f, highest, save)
+            return f.getvalue()
 
-    def dumps(o, highest=False):
         return pickle.dumps(o, pickle.HIGHEST_PROTOCOL if highest else PROTOCOL)
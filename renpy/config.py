@@ -105,6 +105,10 @@ image_cache_size_mb = 400
 # path. The current node is counted in this number.
 predict_statements = 32
 
+# If not None, the number of seconds statement prediction may take in
+# each frame.
+predict_statements_time = None
+
 # Causes the contents of the image cache to be printed to stdout when
 # it changes.
 debug_image_cache = ("RENPY_DEBUG_IMAGE_CACHE" in os.environ)
@@ -722,6 +726,10 @@ replay_scope = { "_game_menu_screen" : "preferences" }
 # The mixer to use for auto-defined movie channels.
 movie_mixer = "music"
 
+# The number of textures each movie channel updates in place, in turn, as
+# frames are decoded. If 0, a new texture is loaded for each frame.
+movie_texture_ring = 2
+
 # Auto audio channels. A map from base name to:
 # * mixer
 # * file prefix
@@ -858,6 +866,10 @@ keep_show_layer_state = True
 # A list of callbacks that are called when fast skipping happens.
 fast_skipping_callbacks = [ ]
 
+# The number of audio and video streams that can be decoded at once. None
+# for the number of CPUs, 0 for no limit.
+audio_decode_workers = None
+
 # Should the audio periodic callback run in its own thread.
 audio_periodic_thread = True
 if renpy.emscripten:
@@ -891,6 +903,12 @@ profile_time = 1.0 / 50.0
 # What event do we check to see if the profile needs to be printed?
 profile_to_event = "flip"
 
+# Should the frame profiler record frames?
+frame_profile = False
+
+# The number of frames the frame profiler keeps.
+frame_profile_frames = 600
+
 # Should we instantly zap transient displayables, or properly hide them?
 fast_unhandled_event = True
 
@@ -912,10 +930,34 @@ idle_gc_count = 2500
 # Should we print unreachable.
 gc_print_unreachable = "RENPY_GC_PRINT_UNREACHABLE" in os.environ
 
+# Should the objects that exist after init be frozen, so the garbage
+# collector doesn't scan them?
+gc_freeze = True
+
+# The longest a full collection can be put off, waiting for an idle frame
+# with enough time for it, in seconds.
+gc_full_max_delay = 60.0
+
 # The first frame that we consider to be "idle", so we can do gc and
 # prediction.
 idle_frame = 4
 
+# The least time, in seconds, the idle tasks get on a frame where they
+# can't take as long as they want.
+idle_frame_budget = 0.0005
+
+# The number of idle frames in a row an idle task can go without running
+# before it's run first.
+idle_task_starvation = 30
+
+# If not 0, the gl2 renderer draws a Render that's been drawn unchanged for
+# this many frames to a texture, and draws that texture in its place.
+render_texture_cache_frames = 0
+
+# The least number of textures a Render has to contain to be drawn to a
+# texture.
+render_texture_cache_children = 8
+
 # Does taking the transform state go through image reference targets?
 take_state_from_target = False
 
@@ -1047,6 +1089,10 @@ return_not_found_label = None
 # A list of (regex, autoreload function) tuples.
 autoreload_functions = [ ]
 
+# Should autoreload try to reload a changed .rpy file by itself, rather
+# than reloading the whole game?
+autoreload_incremental = True
+
 # A list of voice mixers (that should not be dropped when self voicing is
 # enabled).
 voice_mixers = [ "voice" ]
@@ -1398,6 +1444,14 @@ ex_rollback_classes = [ ]
 # Should we revert to the old behavior of box_reverse?
 simple_box_reverse = False
 
+# Should the seen statements in the persistent data be saved as a dict,
+# which older versions of Ren'Py can load?
+persistent_seen_dicts = False
+
+# Should contexts, rollback entries, scene lists, and transform states be
+# saved as vectors of fields, which older versions of Ren'Py can't load?
+save_object_vectors = True
+
 
 del os
 del collections
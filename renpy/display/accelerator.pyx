@@ -919,13 +919,13 @@ cdef class RenderTransform:
                 for name in state.shader:
                     rv.add_shader(name)
 
-        for name in renpy.display.transform.uniforms:
+        for name in state.nondefault(renpy.display.transform.uniforms):
             value = getattr(state, name, None)
 
             if value is not None:
                 rv.add_uniform(name, value)
 
-        for name in renpy.display.transform.gl_properties:
+        for name in state.nondefault(renpy.display.transform.gl_properties):
             value = getattr(state, name, None)
 
             if value is not None:
@@ -474,6 +474,67 @@ class SceneLists(renpy.object.Object):
             self.music = None
             self.focused = None
 
+    def compact(self, other):
+        """
+        Called on scene lists that are part of the rollback log, to share
+        containers that haven't changed since `other`, the scene lists in
+        the rollback entry before this one. unshare must be called before
+        these scene lists are changed.
+        """
+
+        def same_list(a, b):
+            return (len(a) == len(b)) and all(i is j for i, j in zip(a, b))
+
+        def same_dict(a, b):
+            if len(a) != len(b):
+                return False
+
+            for k, v in a.items():
+                if b.get(k, None) is not v:
+                    return False
+
+            return True
+
+        for layer, l in self.layers.items():
+            ol = other.layers.get(layer, None)
+
+            if (ol is not None) and same_list(l, ol):
+                self.layers[layer] = ol
+
+        for layer, d in self.at_list.items():
+            od = other.at_list.get(layer, None)
+
+            if (od is not None) and same_dict(d, od):
+                self.at_list[layer] = od
+
+        if same_list(self.additional_transient, other.additional_transient):
+            self.additional_transient = other.additional_transient
+
+        if same_dict(self.layer_transform, other.layer_transform):
+            self.layer_transform = other.layer_transform
+
+        if same_dict(self.camera_transform, other.camera_transform):
+            self.camera_transform = other.camera_transform
+
+        if same_dict(self.sticky_tags, other.sticky_tags):
+            self.sticky_tags = other.sticky_tags
+
+    def unshare(self):
+        """
+        Copies the containers that may have been shared by compact.
+        """
+
+        for layer, l in self.layers.items():
+            self.layers[layer] = l[:]
+
+        for layer, d in self.at_list.items():
+            self.at_list[layer] = d.copy()
+
+        self.additional_transient = list(self.additional_transient)
+        self.layer_transform = dict(self.layer_transform)
+        self.camera_transform = dict(self.camera_transform)
+        self.sticky_tags = dict(self.sticky_tags)
+
     def replace_transient(self, prefix="hide"): # type: (str|None) -> None
         """
         Replaces the contents of the transient display list with
@@ -1161,6 +1222,10 @@ class SceneLists(renpy.object.Object):
         sl.sort(key=lambda sle : sle.zorder)
 
 
+renpy.compat.pickle.register_save_reducer(SceneListEntry, renpy.object.reduce_object)
+renpy.compat.pickle.register_save_reducer(SceneLists, renpy.object.reduce_object)
+
+
 def scene_lists(index=-1):
     """
     Returns either the current scenelists object, or the one for the
@@ -1846,6 +1911,7 @@ class Interface(object):
             emscripten.run_script("loadCache()")
 
         renpy.main.log_clock("Interface start.")
+        renpy.startupprofile.write()
 
         self.started = True
 
@@ -2052,6 +2118,9 @@ class Interface(object):
         if renderer == "sw":
             renderers = [ "sw" ]
 
+        if renderer == "null":
+            renderers = [ "null" ]
+
         # Software renderer is the last hope for PC and mac.
         if not (renpy.android or renpy.ios or renpy.emscripten):
             renderers = renderers + [ "sw" ]
@@ -2088,6 +2157,7 @@ class Interface(object):
         make_draw("gles2", "renpy.gl2.gl2draw", "GL2Draw", "gles2")
 
         make_draw("sw", "renpy.display.swdraw", "SWDraw")
+        make_draw("null", "renpy.display.swdraw", "NullDraw")
 
         rv = [ ]
 
@@ -2197,20 +2267,29 @@ class Interface(object):
 
     def draw_screen(self, root_widget, fullscreen_video, draw):
 
+        span = renpy.performance.begin_span()
+
         try:
             renpy.display.render.per_frame = True
             renpy.display.screen.per_frame()
         finally:
             renpy.display.render.per_frame = False
 
+        renpy.performance.end_span("update", span)
+        span = renpy.performance.begin_span()
+
         surftree = renpy.display.render.render_screen(
             root_widget,
             renpy.config.screen_width,
             renpy.config.screen_height,
             )
 
+        renpy.performance.end_span("render", span)
+
         if draw:
+            span = renpy.performance.begin_span()
             renpy.display.draw.draw_screen(surftree)
+            renpy.performance.end_span("draw", span)
 
         if renpy.emscripten:
             emscripten.sleep(0)
@@ -2987,6 +3066,8 @@ class Interface(object):
         preloads = self.preloads
         self.preloads = [ ]
 
+        interact_start = get_time()
+
         try:
             self.start_interact = True
 
@@ -3037,33 +3118,58 @@ class Interface(object):
                 renpy.store._side_image_attributes = None
                 renpy.store._side_image_attributes_reset = False
 
-    def consider_gc(self):
+            if renpy.game.benchmark:
+                renpy.benchmark.interaction(get_time() - interact_start)
+
+    def consider_gc(self, time_left=None):
         """
-        Considers if we should peform a garbage collection.
+        Considers if we should peform a garbage collection. `time_left` is
+        the time available for it, or None if there's no limit.
         """
 
         if not renpy.config.manage_gc:
             return
 
-        count = gc.get_count()
+        renpy.gcmanager.consider(time_left)
 
-        if count[0] >= renpy.config.idle_gc_count:
-            renpy.plog(2, "before gc")
+    def predict_task(self, expensive):
+        """
+        The idle task that advances the prediction coroutine. Returns True
+        if it should be called again during this idle frame.
+        """
 
-            if count[2] >= renpy.config.gc_thresholds[2]:
-                gen = 2
-            elif count[1] >= renpy.config.gc_thresholds[1]:
-                gen = 1
-            else:
-                gen = 0
+        if not self.prediction_coroutine:
+            return False
 
-            gc.collect(gen)
+        span = renpy.performance.begin_span()
 
-            if gc.garbage:
-                renpy.memory.print_garbage(gen)
-                del gc.garbage[:]
+        try:
+            result = self.prediction_coroutine.send(expensive)
+        except ValueError:
+            # Saw this happen once during a quit, giving a
+            # ValueError: generator already executing
+            result = None
+
+        renpy.performance.end_span("predict", span)
+
+        if result is None:
+            self.prediction_coroutine = None
+            return False
+
+        elif result is False:
+            return expensive
+
+        return True
+
+    def autosave_task(self):
+        """
+        The idle task that autosaves, once per interaction.
+        """
 
-            renpy.plog(2, "after gc")
+        if not self.did_autosave:
+            renpy.loadsave.autosave()
+            renpy.persistent.check_update()
+            self.did_autosave = True
 
     def idle_frame(self, can_block, expensive):
         """
@@ -3079,74 +3185,25 @@ class Interface(object):
         # frames where we GC.
         start = get_time()
 
-        step = 1
-
-        while True:
-
-            if self.event_peek() and not self.force_prediction:
-                break
-
-            if not (can_block and expensive):
-                if get_time() > (start + .0005):
-                    break
-
-            # Step 1: Run gc.
-            if step == 1:
-                self.consider_gc()
-                step += 1
-
-            # Step 2: Push textures to GPU.
-            elif step == 2:
-                renpy.display.draw.ready_one_texture()
-                step += 1
-
-            # Step 3: Predict more images.
-            elif step == 3:
-
-                if not self.prediction_coroutine:
-                    step += 1
-                    continue
-
-                try:
-                    result = self.prediction_coroutine.send(expensive)
-                except ValueError:
-                    # Saw this happen once during a quit, giving a
-                    # ValueError: generator already executing
-                    result = None
-
-                if result is None:
-                    self.prediction_coroutine = None
-                    step += 1
-
-                elif result is False:
-                    if not expensive:
-                        step += 1
-
-            # Step 4: Preload images (on emscripten)
-            elif step == 4:
-
-                if expensive and renpy.emscripten:
-                    renpy.display.im.cache.preload_thread_pass()
-
-                step += 1
-
-            # Step 5: Autosave.
-            elif step == 5:
+        if can_block and expensive:
+            deadline = None
+        else:
 
-                if not self.did_autosave:
-                    renpy.loadsave.autosave()
-                    renpy.persistent.check_update()
-                    self.did_autosave = True
+            # The time left before the next frame is due, less half a frame
+            # to draw it in.
+            frame_duration = self.frame_duration or (1.0 / 60.0)
+            left = frame_duration - ((start - self.frame_time) % frame_duration) - frame_duration / 2
 
-                step += 1
+            deadline = start + max(renpy.config.idle_frame_budget, left)
 
-            else:
+        def interrupt():
+            return self.event_peek() and not self.force_prediction
 
-                # Check to see if preloading has finished
-                if renpy.display.im.cache.done():
-                    self.force_prediction = False
+        if renpy.display.idle.run(deadline, expensive, interrupt):
 
-                break
+            # Check to see if preloading has finished
+            if renpy.display.im.cache.done():
+                self.force_prediction = False
 
         if expensive:
             renpy.plog(1, "end idle_frame (expensive)")
@@ -3583,6 +3640,8 @@ class Interface(object):
 
                         self.force_redraw = False
 
+                        renpy.performance.begin_frame()
+
                         renpy.display.render.process_redraws()
 
                         # If we have a movie, start showing it.
@@ -3960,6 +4019,8 @@ class Interface(object):
 
                     renpy.plog(1, "start mouse focus handling")
 
+                    span = renpy.performance.begin_span()
+
                     # Handle the event normally.
                     rv = renpy.display.focus.mouse_handler(ev, x, y)
 
@@ -3971,6 +4032,8 @@ class Interface(object):
                     if rv is None:
                         rv = renpy.display.focus.key_handler(ev)
 
+                    renpy.performance.end_span("event", span)
+
                     renpy.plog(1, "finish event handling")
 
                     if rv is not None:
@@ -4050,7 +4113,7 @@ class Interface(object):
             pygame.time.set_timer(TIMEEVENT, 0)
             pygame.time.set_timer(REDRAW, 0)
 
-            self.consider_gc()
+            self.consider_gc(0.0)
 
             renpy.game.context().runtime += end_time - start_time
 
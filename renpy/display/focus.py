@@ -266,18 +266,79 @@ def get_grab():
     return grab
 
 
+class FocusGrid(object):
+    """
+    A uniform grid over the screen that indexes the rectangles in the focus
+    list, so the focus at a point can be found without walking the tree of
+    renders. This is only correct when the rectangles exactly describe where
+    the focuses are, as reported by renpy.display.render.focus_exact.
+    """
+
+    # The size of a grid cell, in pixels.
+    CELL = 64
+
+    def __init__(self, focuses, render):
+
+        # The render the focuses were taken from.
+        self.render = render
+
+        # A map from (column, row) to a list of focuses that overlap that
+        # cell, in the order they are in the focus list. Later focuses are
+        # above earlier ones.
+        self.cells = { }
+
+        cell = self.CELL
+
+        for f in focuses:
+
+            if f.x is None:
+                continue
+
+            for col in range(int(f.x // cell), int((f.x + f.w) // cell) + 1):
+                for row in range(int(f.y // cell), int((f.y + f.h) // cell) + 1):
+                    self.cells.setdefault((col, row), [ ]).append(f)
+
+    def at_point(self, x, y):
+        """
+        Returns a Focus for the uppermost focus at (`x`, `y`), or None if
+        there is no focus there.
+        """
+
+        l = self.cells.get((int(x // self.CELL), int(y // self.CELL)), None)
+
+        if not l:
+            return None
+
+        for f in reversed(l):
+            if (f.x <= x < f.x + f.w) and (f.y <= y < f.y + f.h):
+                return Focus(f.widget, f.arg, None, None, None, None, f.screen)
+
+        return None
+
+
 # The current list of focuses that we know about.
 focus_list = [ ]
 
+# A FocusGrid built from focus_list, or None if the focus list can't be
+# used to find the focus at a point.
+focus_grid = None
+
 # This takes in a focus list from the rendering system.
 
 
 def take_focuses():
     global focus_list
+    global focus_grid
+
     focus_list = [ ]
 
     renpy.display.render.take_focuses(focus_list)
 
+    if renpy.display.render.focus_exact:
+        focus_grid = FocusGrid(focus_list, renpy.display.render.screen_render)
+    else:
+        focus_grid = None
+
     global global_focus
     global_focus = None
 
@@ -594,7 +655,10 @@ def mouse_handler(ev, x, y, default=False):
             pending_focus_type = "mouse"
 
     try:
-        new_focus = renpy.display.render.focus_at_point(x, y)
+        if (focus_grid is not None) and (focus_grid.render is renpy.display.render.screen_render):
+            new_focus = focus_grid.at_point(x, y)
+        else:
+            new_focus = renpy.display.render.focus_at_point(x, y)
     except renpy.display.layout.IgnoreLayers:
         new_focus = None
 
@@ -0,0 +1,258 @@
+# Copyright 2004-2023 Tom Rothamel <pytom@bishoujo.us>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# This file contains the scheduler for the tasks that are run during idle
+# frames - garbage collection, texture uploads, prediction, autosave, and
+# any tasks registered by the game.
+
+from __future__ import division, absolute_import, with_statement, print_function, unicode_literals
+from renpy.compat import PY2, basestring, bchr, bord, chr, open, pystr, range, round, str, tobytes, unicode # *
+
+import renpy
+
+
+def get_time():
+    return renpy.display.core.get_time()
+
+
+class IdleTask(object):
+    """
+    A task that's run during idle frames, and the time it has taken.
+    """
+
+    def __init__(self, name, function, priority, budget, expensive):
+
+        # The name of the task.
+        self.name = name
+
+        # The function that's called to do some of the task's work.
+        self.function = function
+
+        # Tasks with lower priorities run first.
+        self.priority = priority
+
+        # The fraction of an idle frame's time this task may use.
+        self.budget = budget
+
+        # If true, the task only runs during expensive idle frames.
+        self.expensive = expensive
+
+        # The number of idle frames in a row that this task wanted to
+        # run but didn't.
+        self.starved = 0
+
+        # Accounting.
+        self.calls = 0
+        self.frames = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.starvations = 0
+
+    def stats(self):
+        return {
+            "name" : self.name,
+            "priority" : self.priority,
+            "budget" : self.budget,
+            "expensive" : self.expensive,
+            "calls" : self.calls,
+            "frames" : self.frames,
+            "seconds" : self.seconds,
+            "max_seconds" : self.max_seconds,
+            "starvations" : self.starvations,
+            }
+
+
+# A map from name to IdleTask.
+tasks = { }
+
+# True if the idle frame being run is expensive.
+expensive = False
+
+# The time at which the running task should stop, or None if it can take
+# as long as it wants.
+task_deadline = None
+
+
+def register(name, function, priority=0, budget=1.0, expensive=False):
+    """
+    Registers (or replaces) the idle task named `name`.
+    """
+
+    tasks[name] = IdleTask(name, function, priority, budget, expensive)
+
+
+def unregister(name):
+    """
+    Removes the idle task named `name`, if it exists.
+    """
+
+    tasks.pop(name, None)
+
+
+def run(deadline, is_expensive, interrupt):
+    """
+    Runs the idle tasks.
+
+    `deadline`
+        The time at which the tasks should stop, or None if they can take
+        as long as they want.
+
+    `is_expensive`
+        True if this is an expensive idle frame.
+
+    `interrupt`
+        A function that's called before each task is run, and returns
+        True if the idle tasks should stop, because an event is waiting.
+
+    Returns True if every task that wanted to run did, and False if the
+    tasks were stopped early.
+    """
+
+    global expensive
+    global task_deadline
+
+    expensive = is_expensive
+
+    start = get_time()
+
+    runnable = [ i for i in tasks.values() if is_expensive or not i.expensive ]
+
+    # Tasks that have been starved run first, then the rest by priority.
+    starvation = renpy.config.idle_task_starvation
+
+    runnable.sort(key=lambda i : (i.starved < starvation, i.priority))
+
+    completed = True
+
+    for i, task in enumerate(runnable):
+
+        # A starved task gets to run once, even if time has run out.
+        starved = task.starved >= starvation
+
+        if interrupt() or ((not starved) and (deadline is not None) and (get_time() >= deadline)):
+
+            for j in runnable[i:]:
+                j.starved += 1
+
+                if j.starved == starvation:
+                    j.starvations += 1
+
+            completed = False
+            break
+
+        if deadline is not None:
+            task_deadline = min(deadline, get_time() + (deadline - start) * task.budget)
+        else:
+            task_deadline = None
+
+        task.starved = 0
+        task.frames += 1
+
+        while True:
+
+            call_start = get_time()
+
+            try:
+                more = task.function()
+            finally:
+                call_end = get_time()
+                duration = call_end - call_start
+
+                task.calls += 1
+                task.seconds += duration
+                task.max_seconds = max(task.max_seconds, duration)
+
+            if (not more) or starved:
+                break
+
+            if (task_deadline is not None) and (call_end >= task_deadline):
+                break
+
+            if interrupt():
+                break
+
+    task_deadline = None
+
+    return completed
+
+
+def time_left():
+    """
+    Returns the number of seconds the running idle task has left, or None
+    if it can take as long as it wants.
+    """
+
+    if task_deadline is None:
+        return None
+
+    return max(0.0, task_deadline - get_time())
+
+
+def get_stats():
+    """
+    Returns a list of dicts giving the time taken by each idle task, in
+    the order they run.
+    """
+
+    return [ i.stats() for i in sorted(tasks.values(), key=lambda i : i.priority) ]
+
+
+def clear_stats():
+    """
+    Clears the time taken by each idle task.
+    """
+
+    for i in tasks.values():
+        i.calls = 0
+        i.frames = 0
+        i.seconds = 0.0
+        i.max_seconds = 0.0
+        i.starvations = 0
+
+
+# The tasks Ren'Py runs itself.
+
+def gc_task():
+    renpy.display.interface.consider_gc(time_left())
+
+
+def texture_task():
+    renpy.display.draw.ready_one_texture()
+
+
+def predict_task():
+    return renpy.display.interface.predict_task(expensive)
+
+
+def preload_task():
+    if renpy.emscripten:
+        renpy.display.im.cache.preload_thread_pass()
+
+
+def autosave_task():
+    renpy.display.interface.autosave_task()
+
+
+register("gc", gc_task, priority=-500)
+register("texture", texture_task, priority=-400)
+register("predict", predict_task, priority=-300)
+register("preload", preload_task, priority=-200, expensive=True)
+register("autosave", autosave_task, priority=-100)
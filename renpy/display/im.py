@@ -142,6 +142,12 @@ class Cache(object):
         # This is only updated when config.developer is True.
         self.load_log = [ ]
 
+        # The number of times a texture needed to display an image was
+        # found in the cache (hits), or had to be loaded while the
+        # interaction was running (misses).
+        self.hits = 0
+        self.misses = 0
+
     def done(self):
         """
         Returns true if the cache does not have any images to preload.
@@ -310,6 +316,8 @@ class Cache(object):
                 if predict:
                     return None
 
+                self.hits += 1
+
                 if render:
                     return make_render(ce)
                 else:
@@ -321,6 +329,9 @@ class Cache(object):
         # Otherwise, we load the image ourselves.
         if ce is None:
 
+            if not predict:
+                self.misses += 1
+
             if image in self.pin_cache:
                 surf = self.pin_cache[image]
             else:
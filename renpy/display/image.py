@@ -805,10 +805,19 @@ class ShownImageInfo(renpy.object.Object):
 
     __version__ = 2
 
-    def __init__(self, old=None):
+    # True if attributes and shown are shared with another object, and
+    # need to be copied before being changed.
+    shared = False
+
+    def __init__(self, old=None, share=False):
         """
         Creates a new object. If `old` is given, copies the default state
         from old, otherwise initializes the object to a default state.
+
+        `share`
+            If true, the state is shared with `old` until this object
+            is changed. This is used by prediction, where `old` will not
+            change again.
         """
 
         if old is None:
@@ -823,10 +832,25 @@ class ShownImageInfo(renpy.object.Object):
             # screen right now.
             self.shown = set()
 
+        elif share:
+            self.attributes = old.attributes
+            self.shown = old.shown
+            self.shared = True
+
         else:
             self.attributes = old.attributes.copy()
             self.shown = old.shown.copy()
 
+    def unshare(self):
+        """
+        Copies the shared state, so this object can be changed.
+        """
+
+        if self.shared:
+            self.attributes = self.attributes.copy()
+            self.shown = self.shown.copy()
+            self.shared = False
+
     def after_upgrade(self, version):
         if version < 2:
 
@@ -899,6 +923,8 @@ class ShownImageInfo(renpy.object.Object):
         if layer is None:
             layer = 'master'
 
+        self.unshare()
+
         for l, t in list(self.attributes.keys()):
             if l == layer:
                 del self.attributes[l, t]
@@ -919,6 +945,8 @@ class ShownImageInfo(renpy.object.Object):
 
         layer = renpy.exports.default_layer(layer, tag)
 
+        self.unshare()
+
         self.attributes[layer, tag] = rest
 
         if show:
@@ -929,6 +957,8 @@ class ShownImageInfo(renpy.object.Object):
 
         layer = renpy.exports.default_layer(layer, tag)
 
+        self.unshare()
+
         if (layer, tag) in self.attributes:
             del self.attributes[layer, tag]
 
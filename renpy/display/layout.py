@@ -2170,8 +2170,11 @@ class Flatten(Container):
     when the textures overlap on screen. Flatten creates a single texture
     from multiple textures, which can prevent this problem.
 
-    Flatten is a relatively expensive operation, and so should only be used
-    when absolutely required.
+    The texture is kept until `child` changes, so flattening a complex
+    displayable that doesn't change often, like an interface frame made up
+    of many images, can make it faster to draw. Otherwise, Flatten is a
+    relatively expensive operation, and so should only be used when
+    absolutely required.
 
     `drawable_resolution`
         Defaults to true, which is usually the right choice, but may cause
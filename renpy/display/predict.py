@@ -43,6 +43,21 @@ predicting = False
 # like to predict.
 screens = [ ]
 
+# The set of statements reached by the most recent statement prediction.
+# This is kept between interactions, so it can be compared against the
+# statements that actually run.
+predicted_nodes = set()
+
+# The number of statements that were run after being predicted, and
+# that were run without being predicted.
+statement_hits = 0
+statement_misses = 0
+
+# If not None, a list that (function, args, kwargs) tuples are appended to
+# when a displayable or screen is predicted, so that statement prediction can
+# repeat the prediction without predicting the statement again.
+record = None
+
 
 def displayable(d):
     """
@@ -52,6 +67,9 @@ def displayable(d):
     if d is None:
         return
 
+    if record is not None:
+        record.append((displayable, (d, ), { }))
+
     if d not in predicted:
         predicted.add(d)
         d.visit_all(lambda i : i.predict_one())
@@ -63,9 +81,81 @@ def screen(_screen_name, *args, **kwargs):
     with the given arguments.
     """
 
+    if record is not None:
+        record.append((screen, (_screen_name, ) + args, kwargs))
+
     screens.append((_screen_name, args, kwargs))
 
 
+def statement(node):
+    """
+    Called when `node` is about to be executed, to record if the node was
+    predicted.
+    """
+
+    global statement_hits
+    global statement_misses
+
+    if not predicted_nodes:
+        return
+
+    if node in predicted_nodes:
+        statement_hits += 1
+    else:
+        statement_misses += 1
+
+
+def get_statistics():
+    """
+    Returns a dictionary giving the effectiveness of prediction. The
+    keys are:
+
+    `statement_hits`, `statement_misses`
+        The number of statements run that were and were not reached by
+        statement prediction.
+
+    `image_hits`, `image_misses`
+        The number of times an image was found in the image cache when it
+        was needed, or had to be loaded during the interaction.
+
+    `statement_rate`, `image_rate`
+        The fraction of statements and images that were hits, or None if
+        there were none.
+    """
+
+    def rate(hits, misses):
+        if hits + misses:
+            return 1.0 * hits / (hits + misses)
+        else:
+            return None
+
+    cache = renpy.display.im.cache
+
+    return {
+        "statement_hits" : statement_hits,
+        "statement_misses" : statement_misses,
+        "statement_rate" : rate(statement_hits, statement_misses),
+        "image_hits" : cache.hits,
+        "image_misses" : cache.misses,
+        "image_rate" : rate(cache.hits, cache.misses),
+        }
+
+
+def reset_statistics():
+    """
+    Resets the statistics returned by get_statistics.
+    """
+
+    global statement_hits
+    global statement_misses
+
+    statement_hits = 0
+    statement_misses = 0
+
+    renpy.display.im.cache.hits = 0
+    renpy.display.im.cache.misses = 0
+
+
 def reset():
     global image
     image = renpy.display.im.cache.get_texture
@@ -112,10 +202,12 @@ def prediction_coroutine(root_widget):
     # Predict images that are going to be reached in the next few
     # clicks.
 
-    for _i in renpy.game.context().predict():
+    # This yields False when statement prediction has used its time for
+    # this frame, so the rest of the frame isn't spent on prediction.
+    for more in renpy.game.context().predict():
 
         predicting = False
-        yield True
+        yield more
         predicting = True
 
     # If there's a parent context, predict we'll be returning to it
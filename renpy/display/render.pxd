@@ -98,6 +98,13 @@ cdef class Render:
     # True if the texture has been loaded.
     cdef public bint loaded
 
+    # The number of frames this Render has been drawn on without changing,
+    # the last of those frames, and whether cached_texture is drawn in place
+    # of the children. (These are used by gl2 to cache static renders.)
+    cdef public int cache_frames
+    cdef public int cache_frame
+    cdef public bint texture_cached
+
     # A flag that's used to enable debugging on a per-render basis.
     cdef public bint debug
 
@@ -423,12 +423,20 @@ def redraw(d, when):
 
 IDENTITY = Matrix2D(1, 0, 0, 1)
 
+# True if the rectangles found by the last call to take_focuses exactly
+# describe where the focuses are. This is false if a focus has a mask or
+# was transformed in a way that isn't axis-aligned, or if a render was
+# modal or an imagedissolve, as focus_at_point has to handle those.
+focus_exact = True
 
 def take_focuses(focuses):
     """
     Adds a list of rectangular focus regions to the focuses list.
     """
 
+    global focus_exact
+    focus_exact = True
+
     screen_render.take_focuses(
         0, 0,
         screen_render.width, screen_render.height,
@@ -706,6 +714,16 @@ cdef class Render:
         # Have the textures been loaded?
         self.loaded = False
 
+        # The number of frames this has been drawn on without changing, or
+        # -1 if it shouldn't be cached as a texture.
+        self.cache_frames = 0
+
+        # The last frame this was drawn on.
+        self.cache_frame = 0
+
+        # True if cached_texture is drawn in place of the children.
+        self.texture_cached = False
+
         live_renders.append(self)
 
     _types = """\
@@ -745,6 +763,9 @@ cdef class Render:
         cached_texture: Any
         cached_model: Any
         loaded: bool
+        cache_frames: int
+        cache_frame: int
+        texture_cached: bool
         """
 
     def __repr__(self): #@DuplicatedSignature
@@ -1164,6 +1185,7 @@ cdef class Render:
 
         self.cached_texture = None
         self.cached_model = None
+        self.texture_cached = False
 
 
     def add_focus(self, d, arg=None, x=0, y=0, w=None, h=None, mx=None, my=None, mask=None):
@@ -1209,9 +1231,14 @@ cdef class Render:
             The list of focuses to add to.
         """
 
+        global focus_exact
+
         if self.focus_screen is not None:
             screen = self.focus_screen
 
+        if self.modal or (self.operation == IMAGEDISSOLVE):
+            focus_exact = False
+
         if self.modal:
 
             if self.modal == "window":
@@ -1243,12 +1270,18 @@ cdef class Render:
 
         if self.focuses:
 
+            if transform.xdy or transform.ydx:
+                focus_exact = False
+
             for (d, arg, xo, yo, w, h, mx, my, mask) in self.focuses:
 
                 if xo is None:
                     focuses.append(renpy.display.focus.Focus(d, arg, None, None, None, None, screen))
                     continue
 
+                if mx is not None:
+                    focus_exact = False
+
                 x1, y1 = transform.transform(xo, yo)
                 x2, y2 = transform.transform(xo + w, yo + h)
 
@@ -54,6 +54,64 @@ class Clipper(object):
         # The set of surfaces that have been mutated recently.
         self.mutated = set()
 
+        # Maps from (id(render), xo, yo, clip) to a (render, blits, forced,
+        # text_rect) tuple, giving what was recorded when each Render was
+        # drawn in this frame and the last one. A Render that's drawn in
+        # the same place as last frame has not changed, since the render
+        # cache would have replaced it otherwise, so what it recorded can be
+        # reused rather than walking it again.
+        self.renders = { }
+        self.old_renders = { }
+
+        # The Render that's being recorded.
+        self.recording = None
+
+    def record(self, clip, what, xo, yo, screen):
+        """
+        Records the blits that drawing the Render `what` would perform,
+        reusing the blits it recorded last frame if it hasn't changed.
+        """
+
+        key = (id(what), xo, yo, clip)
+
+        entry = self.old_renders.get(key, None)
+
+        if (entry is not None) and (entry[0] is what):
+            self.blits.extend(entry[1])
+            self.forced.update(entry[2])
+
+            if entry[3] is not None:
+                renpy.display.interface.text_rect = entry[3]
+
+            self.renders[key] = entry
+            return
+
+        old_recording = self.recording
+        old_forced = self.forced
+        old_text_rect = renpy.display.interface.text_rect
+
+        start = len(self.blits)
+        self.forced = set()
+
+        renpy.display.interface.text_rect = None
+        self.recording = what
+
+        try:
+            draw(self, clip, what, xo, yo, screen)
+        finally:
+            self.recording = old_recording
+
+            forced = self.forced
+            self.forced = old_forced
+            self.forced.update(forced)
+
+            text_rect = renpy.display.interface.text_rect
+
+            if text_rect is None:
+                renpy.display.interface.text_rect = old_text_rect
+
+        self.renders[key] = (what, self.blits[start:], forced, text_rect)
+
     def compute(self, full_redraw):
         """
         This returns a clipping rectangle, and a list of update rectangles
@@ -74,6 +132,8 @@ class Clipper(object):
         self.old_forced = forced
         self.forced = set()
         self.mutated = set()
+        self.old_renders = self.renders
+        self.renders = { }
 
         sw = renpy.config.screen_width
         sh = renpy.config.screen_height
@@ -385,6 +445,10 @@ def draw(dest, clip, what, xo, yo, screen):
 
         return
 
+    if clip and (what is not dest.recording):
+        dest.record(clip, what, xo, yo, screen)
+        return
+
     if what.text_input:
         renpy.display.interface.text_rect = what.screen_rect(xo, yo, None)
 
@@ -394,12 +458,12 @@ def draw(dest, clip, what, xo, yo, screen):
         xo = int(xo)
         yo = int(yo)
 
+        # The change is clipped to clip when the damage is computed.
         if clip:
-            dx0, dy0, dx1, dy1 = clip
-            dw = dx1 - dx0
-            dh = dy1 - dy0
-        else:
-            dw, dh = dest.get_size()
+            dest.forced.add((xo, yo, xo + what.width, yo + what.height, clip))
+            return
+
+        dw, dh = dest.get_size()
 
         if xo >= 0:
             newx = 0
@@ -428,11 +492,8 @@ def draw(dest, clip, what, xo, yo, screen):
         if subw <= 0 or subh <= 0:
             return
 
-        if clip:
-            dest.forced.add((subx, suby, subx + subw, suby + subh, clip))
-        else:
-            newdest = dest.subsurface((subx, suby, subw, subh))
-            draw_special(what, newdest, newx, newy)
+        newdest = dest.subsurface((subx, suby, subw, subh))
+        draw_special(what, newdest, newx, newy)
 
         return
 
@@ -450,11 +511,10 @@ def draw(dest, clip, what, xo, yo, screen):
             if cx0 > cx1 or cy0 > cy1:
                 return
 
+            # The children are recorded with the narrower clip, so only
+            # the parts of the clipped area that change are redrawn.
             clip = (cx0, cy0, cx1, cy1)
 
-            dest.forced.add(clip + (clip,))
-            return
-
         else:
 
             # After this code, x and y are the coordinates of the subsurface
@@ -512,13 +572,10 @@ def draw_transformed(dest, clip, what, xo, yo, alpha, forward, reverse):
         # is on the screen.
         sw, sh = what.get_size()
         if clip:
-
             dx0, dy0, dx1, dy1 = clip
-            dw = dx1 - dx0
-            dh = dy1 - dy0
-
         else:
-            dw, dh = dest.get_size()
+            dx0 = dy0 = 0
+            dx1, dy1 = dest.get_size()
 
         x0, y0 = 0.0, 0.0
         x1, y1 = reverse.transform(sw, 0.0)
@@ -530,17 +587,17 @@ def draw_transformed(dest, clip, what, xo, yo, alpha, forward, reverse):
         miny = math.floor(min(y0, y1, y2, y3) + yo)
         maxy = math.ceil(max(y0, y1, y2, y3) + yo)
 
-        if minx < 0:
-            minx = 0
-        if miny < 0:
-            miny = 0
+        if minx < dx0:
+            minx = dx0
+        if miny < dy0:
+            miny = dy0
 
-        if maxx > dw:
-            maxx = dw
-        if maxy > dh:
-            maxy = dh
+        if maxx > dx1:
+            maxx = dx1
+        if maxy > dy1:
+            maxy = dy1
 
-        if minx > dw or miny > dh or maxx < 0 or maxy < 0:
+        if minx > dx1 or miny > dy1 or maxx < dx0 or maxy < dy0:
             return
 
         cx, cy = forward.transform(minx - xo, miny - yo)
@@ -548,7 +605,7 @@ def draw_transformed(dest, clip, what, xo, yo, alpha, forward, reverse):
         if clip:
 
             dest.blits.append(
-                (minx, miny, maxx + dx0, maxy + dy0, clip, what, # type: ignore
+                (minx, miny, maxx, maxy, clip, what, # type: ignore
                  (cx, cy,
                   forward.xdx, forward.ydx,
                   forward.xdy, forward.ydy,
@@ -661,10 +718,21 @@ def do_draw_screen(screen_render, full_redraw, swdraw):
     if cliprect is None:
         return [ ]
 
-    x, y, _w, _h = cliprect
+    # If the updates cover much less than the rectangle containing them all,
+    # redraw each on its own, rather than the area between them.
+    rects = [ cliprect ]
 
-    dest = swdraw.window.subsurface(cliprect)
-    draw(dest, None, screen_render, -x, -y, True)
+    if len(updates) > 1:
+        _x, _y, w, h = cliprect
+
+        if sum(uw * uh for _ux, _uy, uw, uh in updates) * 2 < w * h:
+            rects = updates
+
+    for rect in rects:
+        x, y, _w, _h = rect
+
+        dest = swdraw.window.subsurface(rect)
+        draw(dest, None, screen_render, -x, -y, True)
 
     return updates
 
@@ -966,3 +1034,25 @@ class SWDraw(object):
         Return the physical width and height of the screen.
         """
         return renpy.config.screen_width, renpy.config.screen_height
+
+
+class NullDraw(SWDraw):
+    """
+    A renderer that renders the screen, but never draws it. This is used
+    when benchmarking, to measure the speed of the script and displayables
+    without the cost of drawing.
+    """
+
+    def reset(self):
+        SWDraw.reset(self)
+
+        self.info["renderer"] = "null"
+
+    def should_redraw(self, needs_redraw, first_pass, can_block):
+        return needs_redraw
+
+    def draw_screen(self, surftree):
+        self.full_redraw = False
+
+    def event_peek_sleep(self):
+        return
@@ -119,10 +119,19 @@ class TransformState(renpy.object.Object):
 
     def take_state(self, ts):
 
+        # Properties that have not been set live on the class, so only the
+        # properties in the instance dicts can differ from their defaults,
+        # and only those need to be copied.
+
         d = self.__dict__
+        tsd = ts.__dict__
+
+        for k in [ k for k in d if (k in all_properties) and (k not in tsd) ]:
+            del d[k]
 
-        for k in all_properties:
-            d[k] = getattr(ts, k)
+        for k, v in tsd.items():
+            if k in all_properties:
+                d[k] = v
 
         self.last_angle = ts.last_angle
         self.last_anchorangle = ts.last_anchorangle
@@ -158,7 +167,13 @@ class TransformState(renpy.object.Object):
 
         rv = { }
 
-        for prop in diff2_properties:
+        # A property that is set on neither state has its default value
+        # on both, and so can't have changed.
+        changed = set(self.__dict__)
+        changed.update(newts.__dict__)
+        changed &= diff2_properties
+
+        for prop in changed:
             new = getattr(newts, prop)
             old = getattr(self, prop)
 
@@ -180,6 +195,14 @@ class TransformState(renpy.object.Object):
 
         return rv
 
+    def nondefault(self, names):
+        """
+        Returns a list of the properties in `names` that have been set on
+        this state, and hence may have a value other than the default.
+        """
+
+        return [ k for k in self.__dict__ if k in names ]
+
     def get_placement(self, cxoffset=0, cyoffset=0):
 
         if self.perspective is not None: # type: ignore
@@ -504,6 +527,9 @@ class TransformState(renpy.object.Object):
     xycenter = property(get_xycenter, set_xycenter)
 
 
+renpy.compat.pickle.register_save_reducer(TransformState, renpy.object.reduce_object)
+
+
 class Proxy(object):
     """
     This class proxies a field from the transform to its state.
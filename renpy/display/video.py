@@ -103,6 +103,14 @@ reset_channels = set()
 # These store the textures for movies in the same group.
 group_texture = { }
 
+# A map from a (channel, kind) tuple, where kind is "frame" or "mask", to a
+# list of textures that are updated in place, in turn, as new frames are
+# decoded.
+texture_ring = { }
+
+# The index of the last texture used in each ring.
+texture_ring_index = { }
+
 
 def early_interact():
     """
@@ -126,6 +134,11 @@ def interact():
         if not renpy.audio.music.get_playing(i):
             del texture[i]
 
+    for i in list(texture_ring.keys()):
+        if i[0] not in texture:
+            del texture_ring[i]
+            texture_ring_index.pop(i, None)
+
     if renpy.audio.music.get_playing("movie"):
 
         for i in displayable_channels.keys():
@@ -164,7 +177,6 @@ def get_movie_texture(channel, mask_channel=None, side_mask=False, mipmap=None):
             w //= 2
 
             mask_surf = surf.subsurface((w, 0, w, h))
-            surf = surf.subsurface((0, 0, w, h))
 
         else:
             mask_surf = None
@@ -175,24 +187,125 @@ def get_movie_texture(channel, mask_channel=None, side_mask=False, mipmap=None):
     else:
         mask_surf = None
 
-    if mask_surf is not None:
+    # Something went wrong with the mask video.
+    if (mask_surf is not None) and (not surf):
+        surf = None
 
-        # Something went wrong with the mask video.
-        if surf:
+    if surf is None:
+        tex = texture.get(channel, None)
+        return tex, False
+
+    span = renpy.performance.begin_span()
+
+    tex = None
+
+    if renpy.display.draw.info.get("models", False):
+        tex = load_movie_model(channel, surf, mask_surf, side_mask, mipmap)
+
+    if tex is None:
+
+        if side_mask:
+            w, h = surf.get_size()
+            surf = surf.subsurface((0, 0, w // 2, h))
+
+        if mask_surf is not None:
             renpy.display.module.alpha_munge(mask_surf, surf, renpy.display.im.identity)
-        else:
-            surf = None
 
-    if surf is not None:
         renpy.display.render.mutated_surface(surf)
         tex = renpy.display.draw.load_texture(surf, True, { "mipmap" : mipmap })
-        texture[channel] = tex
-        new = True
+
+    renpy.performance.end_span("video", span)
+
+    texture[channel] = tex
+
+    return tex, True
+
+
+def load_movie_frame(key, surf, mipmap):
+    """
+    Returns a texture containing the movie frame `surf`. Where the renderer
+    can, this reuses a texture from the ring of textures for `key`, updating
+    it in place, rather than loading a new texture for every frame.
+    """
+
+    renpy.display.render.mutated_surface(surf)
+
+    ring_size = renpy.config.movie_texture_ring
+    update_texture = getattr(renpy.display.draw, "update_texture", None)
+
+    if (not ring_size) or (update_texture is None):
+        return renpy.display.draw.load_texture(surf, True, { "mipmap" : mipmap })
+
+    ring = texture_ring.setdefault(key, [ ])
+
+    index = (texture_ring_index.get(key, -1) + 1) % ring_size
+    texture_ring_index[key] = index
+
+    if index < len(ring):
+        tex = ring[index]
+
+        if (tex.get_size() == surf.get_size()) and (tex.has_mipmaps() == bool(mipmap)) and update_texture(tex, surf):
+            return tex
+
+    tex = renpy.display.draw.load_texture(surf, True, { "mipmap" : mipmap })
+
+    # Textures that are too big are split into multiple textures, which
+    # can't be updated in place.
+    if not hasattr(tex, "has_mipmaps"):
+        return tex
+
+    if index < len(ring):
+        ring[index] = tex
     else:
-        tex = texture.get(channel, None)
-        new = False
+        ring.append(tex)
+
+    return tex
+
+
+def load_movie_model(channel, surf, mask_surf, side_mask, mipmap):
+    """
+    Loads the movie frame `surf` into a texture, and returns a model that
+    draws it with `mask_surf` applied as an alpha mask by a shader, rather
+    than on the CPU. Returns None if the frame is too big to be loaded
+    into a single texture.
+    """
+
+    frame = load_movie_frame((channel, "frame"), surf, mipmap)
+
+    if not hasattr(frame, "has_mipmaps"):
+        return None
+
+    if mask_surf is None:
+        return frame
+
+    w, h = mask_surf.get_size()
+
+    if side_mask:
+        # The shader samples the mask from the right half of the frame.
+        shaders = ("renpy.side_mask",)
+        uniforms = { "tex0" : frame }
+        right = 0.5
+
+    else:
+        mask_frame = load_movie_frame((channel, "mask"), mask_surf, mipmap)
+
+        if (not hasattr(mask_frame, "has_mipmaps")) or (mask_frame.get_size() != frame.get_size()):
+            return None
+
+        shaders = ("renpy.alpha_mask",)
+        uniforms = { "tex0" : frame, "tex1" : mask_frame }
+        right = 1.0
+
+    from renpy.gl2.gl2mesh2 import Mesh2
+    from renpy.gl2.gl2model import GL2Model
+
+    mesh = Mesh2.texture_rectangle(
+        0.0, 0.0, w, h,
+        0.0, 0.0, right, 1.0,
+        )
+
+    return GL2Model((w, h), mesh, shaders, uniforms)
 
-    return tex, new
 
 def get_movie_texture_web(channel, mask_channel, side_mask, mipmap):
     """
@@ -590,10 +590,16 @@ class VPGrid(Viewport):
 
     allow_underfull = None
 
+    item_count = 0
+    item_function = None
+    item_cache = { }
+
     def __init__(self, cols=None, rows=None,
                  transpose=None,
                  style="vpgrid",
                  allow_underfull=None,
+                 item_count=None,
+                 item_function=None,
                  **properties):
 
         super(VPGrid, self).__init__(style=style, **properties)
@@ -609,6 +615,47 @@ class VPGrid(Viewport):
         self.grid_transpose = transpose
         self.allow_underfull = allow_underfull
 
+        if item_function is not None:
+
+            # The number of items, and a function that is called with an
+            # index to create the displayable for that item.
+            self.item_count = item_count or 0
+            self.item_function = item_function
+
+            # A map from the index of an item to its displayable, for the
+            # items that are currently close enough to be shown.
+            self.item_cache = { }
+
+    def get_item(self, index, items):
+        """
+        Returns the displayable for item `index`, creating it if it isn't
+        in `items` or the item cache, and storing it in `items`.
+        """
+
+        rv = items.get(index, None)
+
+        if rv is not None:
+            return rv
+
+        rv = self.item_cache.get(index, None)
+
+        if rv is None:
+            rv = renpy.easy.displayable(self.item_function(index))
+            rv.set_style_prefix(self.style.prefix, False)
+
+            # The item didn't exist when the interaction started, so give it
+            # the per-interact call it would have gotten then.
+            rv.visit_all(lambda d : d.per_interact())
+
+        items[index] = rv
+        return rv
+
+    def visit(self):
+        if self.item_function is None:
+            return super(VPGrid, self).visit()
+
+        return [ self.item_cache[i] for i in sorted(self.item_cache) ]
+
     def render(self, width, height, st, at):
 
         self.width = width
@@ -617,12 +664,32 @@ class VPGrid(Viewport):
         child_width = self.child_width or width
         child_height = self.child_height or height
 
-        if not self.children:
-            self.offsets = [ ]
-            return renpy.display.render.Render(0, 0)
+        # The items that are close enough to the viewport to be shown, when
+        # item_function is given.
+        items = { }
+
+        if self.item_function is not None:
+
+            lc = self.item_count
 
-        # The number of children.
-        lc = len(self.children)
+            if not lc:
+                self.item_cache = { }
+                self.children = [ ]
+                self.offsets = [ ]
+                return renpy.display.render.Render(0, 0)
+
+            first = self.get_item(0, items)
+
+        else:
+
+            if not self.children:
+                self.offsets = [ ]
+                return renpy.display.render.Render(0, 0)
+
+            # The number of children.
+            lc = len(self.children)
+
+            first = self.children[0]
 
         # Figure out the number of columns and rows.
         cols = self.grid_cols
@@ -656,7 +723,7 @@ class VPGrid(Viewport):
         top_margin = renpy.display.layout.scale(self.style.top_margin, height)
         bottom_margin = renpy.display.layout.scale(self.style.bottom_margin, height)
 
-        rend = renpy.display.render.render(self.children[0], child_width, child_height, st, at)
+        rend = renpy.display.render.render(first, child_width, child_height, st, at)
         cw, ch = rend.get_size()
 
         tw = (cw + xspacing) * cols - xspacing + left_margin + right_margin
@@ -679,7 +746,40 @@ class VPGrid(Viewport):
         # Render everything.
         rv = renpy.display.render.Render(width, height)
 
-        for index, c in enumerate(self.children):
+        if self.item_function is not None:
+
+            # Only the items in the rows and columns that intersect the
+            # viewport, plus one on each side, are created.
+            xstep = max(cw + xspacing, 1)
+            ystep = max(ch + yspacing, 1)
+
+            mincol = max(int((-cxo - cw) // xstep) - 1, 0)
+            maxcol = min(int((width - cxo) // xstep) + 1, cols - 1)
+            minrow = max(int((-cyo - ch) // ystep) - 1, 0)
+            maxrow = min(int((height - cyo) // ystep) + 1, rows - 1)
+
+            indices = [ ]
+
+            for col in range(mincol, maxcol + 1):
+                for row in range(minrow, maxrow + 1):
+                    if self.grid_transpose:
+                        index = col * rows + row
+                    else:
+                        index = row * cols + col
+
+                    if index < lc:
+                        indices.append(index)
+
+            indices.sort()
+
+            self.children = [ self.get_item(i, items) for i in indices ]
+            self.child = self.children[-1] if self.children else None
+            self.item_cache = items
+
+        else:
+            indices = range(len(self.children))
+
+        for index, c in zip(indices, self.children):
 
             if self.grid_transpose:
                 x = index // rows
@@ -720,6 +820,9 @@ class VPGrid(Viewport):
         return rv
 
     def add(self, d):
+        if self.item_function is not None:
+            raise Exception("A VPGrid with an item_function can't have children.")
+
         super(VPGrid, self).add(d)
 
         if None not in (self.grid_cols, self.grid_rows):
@@ -730,6 +833,9 @@ class VPGrid(Viewport):
     def per_interact(self):
         super(VPGrid, self).per_interact()
 
+        if self.item_function is not None:
+            return
+
         children = len(self.children)
 
         given = self.grid_cols or self.grid_rows # ignore if both are 0
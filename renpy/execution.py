@@ -92,6 +92,30 @@ class PredictInfo(renpy.object.Object):
     """
 
 
+class PredictState(object):
+    """
+    The statements that have been predicted from a context, kept between
+    interactions so they don't need to be predicted again.
+    """
+
+    def __init__(self):
+
+        # A map from a node that's been predicted to a (record, successors)
+        # tuple. The record is a list of the (function, args, kwargs) calls
+        # that predicted its images and screens, and successors is a list of
+        # (node, images, return_stack) tuples that it leads to.
+        self.predicted = { }
+
+        # The set of nodes that have been considered since the last
+        # prediction that finished.
+        self.seen = set()
+
+        # The frame_time of the frame that prediction last ran in, and the
+        # time spent predicting during that frame.
+        self.frame = None
+        self.spent = 0.0
+
+
 class LineLogEntry(object):
 
     def __init__(self, filename, line, node, abnormal):
@@ -142,10 +166,13 @@ class Context(renpy.object.Object):
 
     __version__ = 16
 
-    nosave = [ 'next_node' ]
+    nosave = [ 'next_node', 'predict_state' ]
 
     next_node = None
 
+    # A PredictState, or None if prediction needs to start over.
+    predict_state = None
+
     force_checkpoint = False
 
     come_from_name = None
@@ -157,6 +184,10 @@ class Context(renpy.object.Object):
 
     predict_return_stack = None # type: list|None
 
+    # True if this context shares containers with another context in the
+    # rollback log.
+    shared = False
+
     def __repr__(self):
 
         try:
@@ -570,7 +601,12 @@ class Context(renpy.object.Object):
             if update_rollback:
 
                 if self.rollback and renpy.game.log:
-                    renpy.game.log.begin(force=force_rollback)
+                    if renpy.game.benchmark:
+                        rollback_start = renpy.benchmark.clock()
+                        renpy.game.log.begin(force=force_rollback)
+                        renpy.benchmark.rollback(renpy.benchmark.clock() - rollback_start)
+                    else:
+                        renpy.game.log.begin(force=force_rollback)
 
                 if self.rollback and self.force_checkpoint:
                     renpy.game.log.force_checkpoint = True
@@ -580,6 +616,11 @@ class Context(renpy.object.Object):
 
             renpy.test.testexecution.take_name(self.current)
 
+            if renpy.game.benchmark:
+                renpy.benchmark.statement(node)
+
+            renpy.display.predict.statement(node)
+
             try:
                 try:
                     check_infinite_loop()
@@ -779,6 +820,67 @@ class Context(renpy.object.Object):
 
         return rv
 
+    def compact(self, other):
+        """
+        Called on a rollback copy of a context to share the containers that
+        are unchanged since `other`, the rollback copy made before it, to
+        reduce the memory the rollback log takes. unshare must be called
+        before this context is run again.
+        """
+
+        def same_dict(a, b):
+            if len(a) != len(b):
+                return False
+
+            for k, v in a.items():
+                if (k not in b) or (b[k] is not v):
+                    return False
+
+            return True
+
+        if self.call_location_stack == other.call_location_stack:
+            self.call_location_stack = other.call_location_stack
+
+        if self.return_stack == other.return_stack:
+            self.return_stack = other.return_stack
+
+        if self.abnormal_stack == other.abnormal_stack:
+            self.abnormal_stack = other.abnormal_stack
+
+        if len(self.dynamic_stack) == len(other.dynamic_stack):
+            self.dynamic_stack = [ o if same_dict(d, o) else d for d, o in zip(self.dynamic_stack, other.dynamic_stack) ]
+
+        images = self.images
+        other_images = other.images
+
+        if (images.attributes == other_images.attributes) and (images.shown == other_images.shown):
+            self.images = other_images
+            self.scene_lists.shown = other_images
+
+        self.scene_lists.compact(other.scene_lists)
+
+        self.shared = True
+
+    def unshare(self):
+        """
+        Copies the containers that may have been shared by compact, so
+        this context can be run.
+        """
+
+        if not self.shared:
+            return
+
+        self.call_location_stack = list(self.call_location_stack)
+        self.return_stack = list(self.return_stack)
+        self.abnormal_stack = list(self.abnormal_stack)
+        self.dynamic_stack = [ i.copy() for i in self.dynamic_stack ]
+
+        self.images = renpy.display.image.ShownImageInfo(self.images)
+        self.scene_lists.shown = self.images
+        self.scene_lists.unshare()
+
+        self.shared = False
+
     def predict_call(self, label, return_site):
         """
         This is called by the prediction code to indicate that a call to
@@ -816,6 +918,15 @@ class Context(renpy.object.Object):
         Performs image prediction, calling the given callback with each
         images that we predict to be loaded, in the rough order that
         they will be potentially loaded.
+
+        This yields True after each statement is considered, and False if
+        config.predict_statements_time has been used up for this frame.
+
+        Statements predicted during earlier interactions aren't predicted
+        again. Instead, the images and screens they predicted are predicted
+        again, and prediction continues from the statements they lead to.
+        This starts over when the current statement is one that wasn't
+        predicted.
         """
 
         if not self.current:
@@ -824,15 +935,9 @@ class Context(renpy.object.Object):
         if renpy.config.predict_statements_callback is None:
             return
 
-        old_images = self.images
-
-        # A worklist of (node, images, return_stack) tuples.
-        nodes = [ ]
-
-        # The set of nodes we've seen. (We only consider each node once.)
-        seen = set()
-
         # Find the roots.
+        roots = [ ]
+
         for label in renpy.config.predict_statements_callback(self.current):
 
             if not renpy.game.script.has_label(label):
@@ -840,46 +945,115 @@ class Context(renpy.object.Object):
 
             node = renpy.game.script.lookup(label)
 
-            if node in seen:
-                continue
+            if node not in roots:
+                roots.append(node)
+
+        state = self.predict_state
+
+        if (state is None) or not all(i in state.seen for i in roots):
+            state = self.predict_state = PredictState()
+
+        # This is kept after prediction finishes, so it can be compared with
+        # the statements that are actually run.
+        renpy.display.predict.predicted_nodes = state.seen
+
+        old_images = self.images
 
-            nodes.append((node, self.images, self.return_stack))
-            seen.add(node)
+        # The images shown at the roots. This is copied once, so later
+        # changes to self.images don't affect prediction. Past this, each
+        # node's images are shared with its predecessor until changed.
+        root_images = renpy.display.image.ShownImageInfo(self.images)
+
+        # A worklist of (node, images, return_stack) tuples.
+        nodes = [ (i, root_images, self.return_stack) for i in roots ]
+
+        # The set of nodes that are in the worklist. (We only consider each
+        # node once.)
+        queued = set(roots)
+
+        # Prediction considers up to config.predict_statements statements,
+        # and if config.predict_statements_time is set, spends at most that
+        # much time on it each frame.
+        limit = renpy.config.predict_statements
+        budget = renpy.config.predict_statements_time
 
         # Predict statements.
-        for i in range(0, renpy.config.predict_statements):
+        i = 0
 
-            if i >= len(nodes):
-                break
+        while (i < len(nodes)) and (i < limit):
 
             node, images, return_stack = nodes[i]
+            i += 1
 
-            self.images = renpy.display.image.ShownImageInfo(images)
-            self.predict_return_stack = return_stack
+            state.seen.add(node)
 
-            try:
+            frame = getattr(renpy.display.interface, "frame_time", None)
 
-                for n in node.predict():
-                    if n is None:
-                        continue
+            if frame != state.frame:
+                state.frame = frame
+                state.spent = 0.0
 
-                    if n not in seen:
-                        nodes.append((n, self.images, self.predict_return_stack))
-                        seen.add(n)
+            start = time.time()
 
-            except Exception:
+            entry = state.predicted.get(node, None)
+
+            if entry is None:
+
+                self.images = renpy.display.image.ShownImageInfo(images, share=True)
+                self.predict_return_stack = return_stack
+
+                record = [ ]
+                successors = [ ]
 
-                if renpy.config.debug_prediction:
-                    import traceback
+                renpy.display.predict.record = record
 
-                    print("While predicting images.")
-                    traceback.print_exc()
-                    print()
+                try:
+
+                    for n in node.predict():
+                        if n is not None:
+                            successors.append((n, self.images, self.predict_return_stack))
+
+                except Exception:
+
+                    if renpy.config.debug_prediction:
+                        import traceback
+
+                        print("While predicting images.")
+                        traceback.print_exc()
+                        print()
 
-            self.images = old_images
-            self.predict_return_stack = None
+                finally:
+                    renpy.display.predict.record = None
 
-            yield True
+                self.images = old_images
+                self.predict_return_stack = None
+
+                entry = state.predicted[node] = (record, successors)
+
+            else:
+
+                for function, args, kwargs in entry[0]:
+                    try:
+                        function(*args, **kwargs)
+                    except Exception:
+                        pass
+
+            for successor in entry[1]:
+                if successor[0] not in queued:
+                    nodes.append(successor)
+                    queued.add(successor[0])
+
+            state.spent += time.time() - start
+
+            yield not ((budget is not None) and (state.spent >= budget))
+
+        # Forget the statements that were left behind.
+        considered = set(n[0] for n in nodes[:i])
+
+        state.predicted = { k : v for k, v in state.predicted.items() if k in considered }
+        state.seen = considered
+
+        renpy.display.predict.predicted_nodes = considered
 
         yield False
 
@@ -935,6 +1109,9 @@ class Context(renpy.object.Object):
             self.dynamic_stack.append({})
 
 
+renpy.compat.pickle.register_save_reducer(Context, renpy.object.reduce_object)
+
+
 def run_context(top):
     """
     Runs the current context until it can't be run anymore, while handling
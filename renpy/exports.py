@@ -93,7 +93,7 @@ from renpy.lexer import unelide_filename
 from renpy.parser import get_parse_errors
 
 from renpy.translation import change_language, known_languages, translate_string, get_translation_identifier
-from renpy.translation.generation import generic_filter as transform_text
+from renpy.translation import generic_filter as transform_text
 
 from renpy.persistent import register_persistent
 
@@ -105,7 +105,9 @@ import renpy.audio.music as music
 from renpy.statements import register as register_statement
 from renpy.text.extras import check_text_tags
 
-from renpy.memory import profile_memory, diff_memory, profile_rollback
+from renpy.memory import profile_memory, diff_memory, profile_rollback, profile_rollback_entries
+
+from renpy.performance import get_frame_profile, clear_frame_profile, frame_profile_summary, frame_time_histogram, export_frame_profile
 
 from renpy.text.textsupport import TAG as TEXT_TAG, TEXT as TEXT_TEXT, PARAGRAPH as TEXT_PARAGRAPH, DISPLAYABLE as TEXT_DISPLAYABLE
 
@@ -4185,6 +4187,132 @@ def get_refresh_rate(precision=5):
     return rv
 
 
+def register_idle_task(name, function, priority=0, budget=1.0, expensive=False):
+    """
+    :doc: idle_task
+
+    Registers a function that's called to do work in the background, during
+    frames where Ren'Py is otherwise idle. If a task with `name` already
+    exists, it is replaced.
+
+    `name`
+        A string giving the name of the task.
+
+    `function`
+        A function that's called with no arguments to do a small piece of
+        work. If it returns true, there is more work to do, and it may be
+        called again during the same frame if time remains. Each call
+        should take no more than a millisecond or so.
+
+    `priority`
+        Tasks with lower priorities run first. Ren'Py's own tasks - garbage
+        collection, texture upload, prediction, and autosave - have
+        priorities between -500 and -100.
+
+    `budget`
+        The fraction of the time available during a frame that this task
+        may use, from 0.0 to 1.0.
+
+    `expensive`
+        If true, the task only runs when Ren'Py expects nothing to change
+        on the screen for a while.
+
+    A task that has not run for :var:`config.idle_task_starvation` idle
+    frames in a row is run once before the other tasks.
+    """
+
+    renpy.display.idle.register(name, function, priority=priority, budget=budget, expensive=expensive)
+
+
+def unregister_idle_task(name):
+    """
+    :doc: idle_task
+
+    Removes the idle task with `name`, if it exists.
+    """
+
+    renpy.display.idle.unregister(name)
+
+
+def get_idle_task_stats(clear=False):
+    """
+    :doc: idle_task
+
+    Returns a list of dicts, one for each idle task in the order they run,
+    with the following keys:
+
+    "name", "priority", "budget", "expensive"
+        The parameters given when the task was registered.
+
+    "calls"
+        The number of times the task's function has been called.
+
+    "frames"
+        The number of idle frames the task has run on.
+
+    "seconds", "max_seconds"
+        The total time taken by the task's function, and the longest single
+        call to it, in seconds.
+
+    "starvations"
+        The number of times the task had to be run first because it had not
+        run for :var:`config.idle_task_starvation` frames.
+
+    `clear`
+        If true, the statistics are cleared after they're returned.
+    """
+
+    rv = renpy.display.idle.get_stats()
+
+    if clear:
+        renpy.display.idle.clear_stats()
+
+    return rv
+
+
+def get_gc_stats(clear=False):
+    """
+    :doc: gc
+
+    Returns a dict giving information about the pauses caused by garbage
+    collection. The dict has the following keys:
+
+    "generations"
+        A list of three dicts, one for each generation, with the keys:
+
+        "collections"
+            The number of collections of that generation.
+
+        "seconds", "max_seconds"
+            The total time taken by those collections, and the longest
+            single collection, in seconds.
+
+        "estimate"
+            The time Ren'Py expects the next collection to take, in seconds,
+            or None if it doesn't know.
+
+        "histogram"
+            A list of (limit, count) tuples. Each count is the number of
+            collections that took less than limit milliseconds, and more
+            than the limit before it. The last limit is None, and counts
+            the collections that took longer than every other limit.
+
+    "deferred"
+        The number of times a level-2 collection was put off, because
+        there was not enough time for it.
+
+    "frozen"
+        The number of objects frozen by :var:`config.gc_freeze`.
+
+    `clear`
+        If true, the statistics are cleared after they're returned.
+
+    Collections started by Python itself are only included on Python 3.
+    """
+
+    return renpy.gcmanager.get_stats(clear=clear)
+
+
 def get_identifier_checkpoints(identifier):
     """
     :doc: rollback
@@ -76,6 +76,11 @@ new_translates_count = 0
 # True if we're in the first interaction after a rollback or rollforward.
 after_rollback = False
 
+# True if the benchmark command is running. When it is, statements,
+# rollbacks, and interactions are reported to renpy.benchmark, which
+# isn't imported otherwise.
+benchmark = False
+
 # Code that's run after the init code.
 post_init = [ ]
 
@@ -0,0 +1,255 @@
+# Copyright 2004-2023 Tom Rothamel <pytom@bishoujo.us>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# This file paces garbage collection. It measures how long collections of
+# each generation take, only runs the expensive ones when an idle frame has
+# the time for them, and keeps a histogram of the pauses collections cause.
+
+from __future__ import division, absolute_import, with_statement, print_function, unicode_literals
+from renpy.compat import PY2, basestring, bchr, bord, chr, open, pystr, range, round, str, tobytes, unicode # *
+
+import gc
+import time
+
+import renpy
+
+clock = getattr(time, "perf_counter", time.time)
+
+# The upper bounds of the buckets of the pause histogram, in milliseconds.
+# The last bucket has no upper bound.
+HISTOGRAM_BUCKETS = [ 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0 ]
+
+
+class Generation(object):
+    """
+    The time taken by collections of one generation.
+    """
+
+    def __init__(self):
+
+        # The estimated time a collection takes, in seconds, or None if no
+        # collection has been measured yet.
+        self.estimate = None
+
+        self.collections = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+        # The number of pauses in each bucket of the histogram.
+        self.histogram = [ 0 ] * (len(HISTOGRAM_BUCKETS) + 1)
+
+    def record(self, seconds):
+
+        if self.estimate is None:
+            self.estimate = seconds
+        else:
+            self.estimate = self.estimate * 0.75 + seconds * 0.25
+
+        self.collections += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+        ms = seconds * 1000.0
+
+        for i, limit in enumerate(HISTOGRAM_BUCKETS):
+            if ms < limit:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    def stats(self):
+        return {
+            "collections" : self.collections,
+            "seconds" : self.seconds,
+            "max_seconds" : self.max_seconds,
+            "estimate" : self.estimate,
+            "histogram" : list(zip(HISTOGRAM_BUCKETS + [ None ], self.histogram)),
+            }
+
+
+generations = [ Generation(), Generation(), Generation() ]
+
+# The number of times a full collection was put off because there wasn't
+# time for it.
+deferred = 0
+
+# The time at which a full collection that was put off became due, or None
+# if one isn't waiting.
+full_due = None
+
+# The time the collection in progress started, and its generation.
+callback_start = None
+
+
+def callback(phase, info):
+    """
+    Called by the garbage collector before and after each collection,
+    including the ones it starts itself.
+    """
+
+    global callback_start
+
+    if phase == "start":
+        callback_start = clock()
+
+    elif callback_start is not None:
+        generations[info["generation"]].record(clock() - callback_start)
+        callback_start = None
+
+
+def init():
+    """
+    Called when the game starts, to start measuring collections.
+    """
+
+    callbacks = getattr(gc, "callbacks", None)
+
+    if (callbacks is not None) and (callback not in callbacks):
+        callbacks.append(callback)
+
+    # Objects frozen by the last run of the game can be collected now.
+    if hasattr(gc, "unfreeze"):
+        gc.unfreeze()
+
+
+def collect(generation=2):
+    """
+    Collects `generation`, and records how long it took.
+    """
+
+    if not hasattr(gc, "callbacks"):
+        start = clock()
+        gc.collect(generation)
+        generations[generation].record(clock() - start)
+    else:
+        gc.collect(generation)
+
+    if gc.garbage:
+        renpy.memory.print_garbage(generation)
+        del gc.garbage[:]
+
+
+def freeze():
+    """
+    Called once, after init and the initial collection. Moves the objects
+    that exist now - which are mostly created by init code, and will last as
+    long as the game runs - out of the way of future collections.
+    """
+
+    if not (renpy.config.manage_gc and renpy.config.gc_freeze):
+        return
+
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+def fits(generation, time_left):
+    """
+    Returns true if a collection of `generation` is expected to take less
+    than `time_left` seconds.
+    """
+
+    if time_left is None:
+        return True
+
+    estimate = generations[generation].estimate
+
+    if estimate is None:
+        return False
+
+    return estimate <= time_left
+
+
+def consider(time_left):
+    """
+    Considers if a garbage collection should be performed.
+
+    `time_left`
+        The time available, in seconds, or None if there is no limit.
+        Level-0 collections always happen when needed, while level-1 and
+        level-2 collections only happen when they're expected to fit into
+        this time.
+    """
+
+    global deferred
+    global full_due
+
+    count = gc.get_count()
+
+    if count[0] < renpy.config.idle_gc_count:
+        return
+
+    if count[2] >= renpy.config.gc_thresholds[2]:
+        generation = 2
+    elif count[1] >= renpy.config.gc_thresholds[1]:
+        generation = 1
+    else:
+        generation = 0
+
+    now = time.time()
+
+    if generation == 2:
+
+        if full_due is None:
+            full_due = now
+
+        if not fits(2, time_left) and (now - full_due < renpy.config.gc_full_max_delay):
+            deferred += 1
+            generation = 1
+
+    if generation == 1 and not fits(1, time_left):
+        generation = 0
+
+    renpy.plog(2, "before gc")
+
+    span = renpy.performance.begin_span()
+    collect(generation)
+    renpy.performance.end_span("gc", span)
+
+    renpy.plog(2, "after gc")
+
+    if generation == 2:
+        full_due = None
+
+
+def get_stats(clear=False):
+    """
+    Returns statistics about garbage collection. See renpy.get_gc_stats.
+    """
+
+    global deferred
+
+    rv = {
+        "generations" : [ i.stats() for i in generations ],
+        "deferred" : deferred,
+        "frozen" : gc.get_freeze_count() if hasattr(gc, "get_freeze_count") else 0,
+        }
+
+    if clear:
+        for i in generations:
+            estimate = i.estimate
+            i.__init__()
+            i.estimate = estimate
+
+        deferred = 0
+
+    return rv
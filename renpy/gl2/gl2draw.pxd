@@ -92,4 +92,7 @@ cdef class GL2Draw:
     # The current FBO.
     cdef public GLuint current_fbo
 
+    # The number of the frame being drawn, used to cache static renders.
+    cdef public int draw_frame
+
     cdef void change_fbo(self, GLuint fbo)
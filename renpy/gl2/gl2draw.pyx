@@ -104,6 +104,9 @@ cdef class GL2Draw:
         # The time between redraws.
         self.redraw_period = .2
 
+        # The number of frames that have been drawn.
+        self.draw_frame = 0
+
         # Info.
         self.info = { "resizable" : True, "additive" : True, "renderer" : name, "models" : True }
 
@@ -824,6 +827,15 @@ cdef class GL2Draw:
 
         return self.texture_loader.load_surface(surf, properties)
 
+    def update_texture(self, tex, surf):
+        """
+        Replaces the contents of `tex`, which was returned by load_texture,
+        with `surf`, in place. Returns false if this can't be done, and a
+        new texture needs to be loaded.
+        """
+
+        return self.texture_loader.update_texture(tex, surf)
+
     def ready_one_texture(self):
         """
         Call from the main thread to make a single texture ready.
@@ -859,12 +871,16 @@ cdef class GL2Draw:
 
         renpy.plog(1, "flip")
 
+        span = renpy.performance.begin_span()
+
         try:
             pygame.display.flip()
         except pygame.error as e:
             renpy.display.log.write("Flip failed %r", e)
             renpy.game.interface.display_reset = True
 
+        renpy.performance.end_span("flip", span)
+
         end = time.time()
 
         if vsync:
@@ -899,6 +915,8 @@ cdef class GL2Draw:
         if surf is None:
             return
 
+        self.draw_frame += 1
+
         # Load all the textures and RTTs.
         self.load_all_textures(surf)
 
@@ -951,6 +969,7 @@ cdef class GL2Draw:
         cdef Render r = what
 
         if r.loaded:
+            self.consider_texture_cache(r)
             return
 
         r.loaded = True
@@ -984,6 +1003,37 @@ cdef class GL2Draw:
                 uniforms)
 
 
+    def consider_texture_cache(self, Render r):
+        """
+        Called with a Render that was loaded on an earlier frame, and so
+        hasn't changed since. If it's been drawn unchanged for enough frames,
+        and is eligible, renders it to a texture that's drawn in place of its
+        children.
+        """
+
+        frames = renpy.config.render_texture_cache_frames
+
+        if (not frames) or (r.cache_frames < 0) or r.texture_cached:
+            return
+
+        if r.cache_frame == self.draw_frame:
+            return
+
+        r.cache_frame = self.draw_frame
+        r.cache_frames += 1
+
+        if r.cache_frames < frames:
+            return
+
+        if texture_cache_count(r) < renpy.config.render_texture_cache_children:
+            r.cache_frames = -1
+            return
+
+        if r.cached_texture is None:
+            r.cached_texture = self.texture_loader.render_to_texture(r, { "mipmap" : False, "pixel_perfect" : True })
+
+        r.texture_cached = True
+
     def render_to_texture(self, what, alpha=True, properties={}):
         """
         Renders `what` to a texture. The texture will have the drawable
@@ -1179,6 +1229,50 @@ cdef class GL2Draw:
         return (x, y)
 
 
+cdef int texture_cache_count(Render r):
+    """
+    Returns the number of textures and models that would be drawn as part of
+    `r`, or -1 if `r` can't be drawn as a texture, because it or one of its
+    children uses a mesh, shader, uniform, property, or transform, or has
+    a child that isn't entirely inside it.
+    """
+
+    cdef int rv = 0
+    cdef int count
+
+    if r.mesh or r.cached_model is not None:
+        return -1
+
+    if r.shaders or r.uniforms or r.properties or r.text_input:
+        return -1
+
+    if (r.reverse is not None) and (r.reverse is not IDENTITY):
+        return -1
+
+    clipping = r.xclipping and r.yclipping
+
+    for child, cx, cy, focus, main in r.children:
+
+        if isinstance(child, Render):
+            count = texture_cache_count(child)
+
+            if count < 0:
+                return -1
+
+            rv += count
+
+        else:
+            rv += 1
+
+        if not clipping:
+            cw, ch = child.get_size()
+
+            if (cx < 0) or (cy < 0) or (cx + cw > r.width) or (cy + ch > r.height):
+                return -1
+
+    return rv
+
+
 cdef class GL2DrawingContext:
     """
     This is an object that represents the state of the GL rendering
@@ -1197,6 +1291,9 @@ cdef class GL2DrawingContext:
 
     cdef bint debug
 
+    # The transform the root of the tree is drawn with.
+    cdef Matrix root_transform
+
     def __init__(self, GL2Draw draw, width, height, debug=False):
         self.gl2draw = draw
 
@@ -1385,6 +1482,9 @@ cdef class GL2DrawingContext:
         if r.cached_model is not None:
             children = [ (r.cached_model, 0, 0, False, False) ]
 
+        elif r.texture_cached and (r.cached_texture is not None) and (not shaders) and ("blend_func" not in properties) and self.unscaled(transform):
+            children = [ (r.cached_texture, 0, 0, False, False) ]
+
         for child, cx, cy, focus, main in children:
 
             child_transform = transform
@@ -1416,8 +1516,25 @@ cdef class GL2DrawingContext:
         return 0
 
 
+    cdef bint unscaled(self, Matrix transform):
+        """
+        Returns true if `transform` draws at the same scale as the root
+        of the tree, so a texture cached at drawable resolution will
+        look the same as the Render it replaces.
+        """
+
+        cdef Matrix root = self.root_transform
+
+        return (
+            transform.xdx == root.xdx and transform.xdy == root.xdy and
+            transform.ydx == root.ydx and transform.ydy == root.ydy and
+            transform.wdx == root.wdx and transform.wdy == root.wdy
+            )
+
     def draw(self, what, Matrix transform):
 
+        self.root_transform = transform
+
         clip_polygon = None
         shaders = ()
         uniforms = {}
@@ -51,6 +51,10 @@ cdef class TextureLoader:
 
     cdef GLfloat max_anisotropy
 
+    # The pixel buffer used to stream pixel data into textures, or 0 if
+    # it hasn't been created yet.
+    cdef GLuint pixel_buffer
+
 
 cdef class GLTexture(GL2Model):
 
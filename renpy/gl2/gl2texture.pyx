@@ -78,6 +78,7 @@ cdef class TextureLoader:
         self.free_list = [ ]
         self.total_texture_size = 0
         self.texture_load_queue = weakref.WeakSet()
+        self.pixel_buffer = 0
 
         if not self.draw.gles:
             glGetFloatv(MAX_TEXTURE_MAX_ANISOTROPY_EXT, &self.max_anisotropy)
@@ -95,6 +96,11 @@ cdef class TextureLoader:
 
         self.allocated = set()
 
+        if self.pixel_buffer:
+            texnums[0] = self.pixel_buffer
+            glDeleteBuffers(1, texnums)
+            self.pixel_buffer = 0
+
     def get_texture_size(self):
         """
         Returns the amount of memory locked up in textures.
@@ -197,6 +203,36 @@ cdef class TextureLoader:
 
         return rv
 
+    def update_texture(self, tex, surf):
+        """
+        Replaces the contents of `tex`, which was returned by load_surface,
+        with `surf`, reusing the texture rather than allocating a new one.
+        Returns true if this was done, or false if `tex` can't be updated,
+        and a new texture has to be loaded.
+        """
+
+        cdef GLTexture t
+
+        if not isinstance(tex, GLTexture):
+            return False
+
+        t = tex
+
+        if (t.loader is not self) or ((t.width, t.height) != surf.get_size()):
+            return False
+
+        # If the texture hasn't been loaded, it can be loaded from the new
+        # surface instead.
+        if not t.loaded:
+            t.surface = surf
+            return True
+
+        if (not t.number) or (t.number not in self.allocated):
+            return False
+
+        t.update_gltexture(surf)
+        return True
+
     def render_to_texture(self, what, properties):
         """
         Renders `what` to a texture.
@@ -406,22 +442,59 @@ cdef class GLTexture(GL2Model):
         and the texture is ready to use.
         """
 
-        cdef GLuint tex
         cdef GLuint premultiplied
-        cdef Program program
-        cdef SDL_Surface *s
-        cdef GLuint pixel_buffer
 
         if self.loaded:
             return
 
+        self.draw_premultiplied(self.surface)
+
+        # Create premultiplied.
+        glGenTextures(1, &premultiplied)
+
+        self.allocate_texture(premultiplied, self.width, self.height, self.properties)
+
+        glCopyTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, 0, 0, self.width, self.height, 0)
+
+        self.mipmap_texture(premultiplied, self.width, self.height, self.properties)
+
+        # Store the loaded texture.
+        self.number = premultiplied
+        self.loader.allocated.add(self.number)
+
+        self.loaded = True
+        self.surface = None
+
+    def update_gltexture(GLTexture self, surface):
+        """
+        Replaces the contents of this texture, which must be loaded, with
+        `surface`, which must be the same size.
+        """
+
+        self.draw_premultiplied(surface)
+
+        glBindTexture(GL_TEXTURE_2D, self.number)
+        glCopyTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, 0, 0, self.width, self.height)
+
+        self.mipmap_texture(self.number, self.width, self.height, self.properties)
+
+    def draw_premultiplied(GLTexture self, surface):
+        """
+        Draws `surface`, premultiplied, into the lower-left corner of the
+        framebuffer, so it can be copied into this texture.
+        """
+
+        cdef GLuint tex
+        cdef GLuint pixel_buffer
+        cdef Program program
+        cdef SDL_Surface *s
+
         draw = self.loader.draw
 
-        s = PySurface_AsSurface(self.surface)
+        s = PySurface_AsSurface(surface)
 
         # Generate the old textures.
         glGenTextures(1, &tex)
-        glGenTextures(1, &premultiplied)
 
         # Bind the framebuffer.
         draw.change_fbo(draw.fbo)
@@ -445,15 +518,20 @@ cdef class GLTexture(GL2Model):
         # But it doesn't seem to work with ANGLE or emscripten, so we avoid using PBOs when
         # angle is in use.
 
+        # The pixel buffer is kept between loads, and orphaned by each
+        # glBufferData, so streaming frames doesn't wait on the last upload.
+
         if not renpy.emscripten and not draw.angle:
 
-            glGenBuffers(1, &pixel_buffer)
-            glBindBuffer(GL_PIXEL_UNPACK_BUFFER, pixel_buffer)
-            glBufferData(GL_PIXEL_UNPACK_BUFFER, s.h * s.pitch, s.pixels, GL_STATIC_DRAW)
+            if not self.loader.pixel_buffer:
+                glGenBuffers(1, &pixel_buffer)
+                self.loader.pixel_buffer = pixel_buffer
+
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER, self.loader.pixel_buffer)
+            glBufferData(GL_PIXEL_UNPACK_BUFFER, s.h * s.pitch, s.pixels, GL_STREAM_DRAW)
             glPixelStorei(GL_UNPACK_ROW_LENGTH, s.pitch // 4)
             glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, self.width, self.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, <void *> 0)
-            glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
-            glDeleteBuffers(1, &pixel_buffer)
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
 
         else:
             glPixelStorei(GL_UNPACK_ROW_LENGTH, s.pitch // 4)
@@ -476,23 +554,9 @@ cdef class GLTexture(GL2Model):
         program.draw(mesh, {})
         program.finish()
 
-        # Create premultiplied.
-        self.allocate_texture(premultiplied, self.width, self.height, self.properties)
-
-        glCopyTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, 0, 0, self.width, self.height, 0)
-
-        self.mipmap_texture(premultiplied, self.width, self.height, self.properties)
-
         # Delete tex.
         glDeleteTextures(1, &tex)
 
-        # Store the loaded texture.
-        self.number = premultiplied
-        self.loader.allocated.add(self.number)
-
-        self.loaded = True
-        self.surface = None
-
     def allocate_texture(GLTexture self, GLuint tex, int tw, int th, properties={}):
         """
         Allocates the VRAM required to store `tex`, which is a `tw` x `th`
@@ -32,7 +32,7 @@ import contextlib
 
 import renpy
 
-from renpy.lexersupport import match_logical_word
+from renpy.lexersupport import match_logical_word, split_logical_lines
 
 # The filename that's in the line text cache.
 line_text_filename = ""
@@ -174,6 +174,13 @@ def unicode_filename(fn):
 # before this.
 lllword = re.compile(r'__(\w+)|\w+| +|.', re.S)
 
+# A map from a regexp string to the compiled regexp, used by
+# Lexer.match_regexp.
+regexp_cache = { }
+
+# Matches whitespace, including backslash-newline.
+whitespace_regexp = re.compile(r"(\s+|\\\n)+", re.DOTALL)
+
 
 def munge_filename(fn):
     # The prefix that's used when __ is found in the file.
@@ -285,17 +292,12 @@ def list_logical_lines(filename, filedata=None, linenumber=1, add_lines=False):
     # Add some newlines, to fix lousy editors.
     data += "\n\n"
 
-    # The result.
-    rv = []
-
     # The line number in the physical file.
     number = linenumber
 
     # The current position we're looking at in the buffer.
     pos = 0
 
-    # Are we looking at a triple-quoted string?
-
     # Skip the BOM, if any.
     if len(data) and data[0] == u'\ufeff':
         pos += 1
@@ -305,184 +307,12 @@ def list_logical_lines(filename, filedata=None, linenumber=1, add_lines=False):
     else:
         lines = { }
 
-    len_data = len(data)
-
     renpy.scriptedit.files.add(filename)
 
-    line = 0
-    start_number = 0
-
-    # Looping over the lines in the file.
-    while pos < len_data:
-
-        # The line number of the start of this logical line.
-        start_number = number
-
-        # The line that we're building up.
-        line = [ ]
-
-        # The number of open parenthesis there are right now.
-        parendepth = 0
-
-        loc = (filename, start_number)
-        lines[loc] = renpy.scriptedit.Line(original_filename, start_number, pos)
-
-        endpos = None
-
-        while pos < len_data:
-
-            startpos = pos
-            c = data[pos]
-
-            if c == u'\t':
-                raise ParseError(filename, number, "Tab characters are not allowed in Ren'Py scripts.")
-
-            if c == u'\n' and not parendepth:
-
-                line = ''.join(line)
-
-                # If not blank...
-                if not re.match(r"^\s*$", line):
-
-                    # Add to the results.
-                    rv.append((filename, start_number, line))
-
-                if endpos is None:
-                    endpos = pos
-
-                lines[loc].end_delim = endpos + 1
-
-                while data[endpos - 1] in u' \r':
-                    endpos -= 1
-
-                lines[loc].end = endpos
-                lines[loc].text = data[lines[loc].start:lines[loc].end]
-                lines[loc].full_text = data[lines[loc].start:lines[loc].end_delim]
-
-                pos += 1
-                number += 1
-                endpos = None
-                # This helps out error checking.
-                line = [ ]
-                break
-
-            if c == u'\n':
-                number += 1
-                endpos = None
-
-            if c == u"\r":
-                pos += 1
-                continue
-
-            # Backslash/newline.
-            if c == u"\\" and data[pos + 1] == u"\n":
-                pos += 2
-                number += 1
-                line.append(u"\\\n")
-                continue
-
-            # Parenthesis.
-            if c in u'([{':
-                parendepth += 1
-
-            if (c in u'}])') and parendepth:
-                parendepth -= 1
-
-            # Comments.
-            if c == u'#':
-                endpos = pos
-
-                while data[pos] != u'\n':
-                    pos += 1
-
-                continue
-
-            # Strings.
-            if c in u'"\'`':
-                delim = c
-                line.append(c)
-                pos += 1
-
-                escape = False
-                triplequote = False
+    def munge_substitutions(s):
+        return re.sub(r'(\.|\[+)__(\w+)', munge_string, s)
 
-                if (pos < len_data - 1) and (data[pos] == delim) and (data[pos + 1] == delim):
-                    line.append(delim)
-                    line.append(delim)
-                    pos += 2
-                    triplequote = True
-
-                s = [ ]
-
-                while pos < len_data:
-
-                    c = data[pos]
-
-                    if c == u'\n':
-                        number += 1
-
-                    if c == u'\r':
-                        pos += 1
-                        continue
-
-                    if escape:
-                        escape = False
-                        pos += 1
-                        s.append(c)
-                        continue
-
-                    if c == delim:
-
-                        if not triplequote:
-                            pos += 1
-                            s.append(c)
-                            break
-
-                        if (pos < len_data - 2) and (data[pos + 1] == delim) and (data[pos + 2] == delim):
-                            pos += 3
-                            s.append(delim)
-                            s.append(delim)
-                            s.append(delim)
-                            break
-
-                    if c == u'\\':
-                        escape = True
-
-                    s.append(c)
-                    pos += 1
-
-                    continue
-
-                s = "".join(s)
-
-                if "[__" in s:
-
-                    # Munge substitutions.
-                    s = re.sub(r'(\.|\[+)__(\w+)', munge_string, s)
-
-                line.append(s)
-
-                continue
-
-            word, magic, end = match_logical_word(data, pos)
-
-            if magic:
-
-                rest = word[2:]
-
-                if u"__" not in rest:
-                    word = prefix + rest
-
-            line.append(word)
-            pos = end
-
-            if (pos - startpos) > 65536:
-                raise ParseError(filename, start_number, "Overly long logical line. (Check strings and parenthesis.)", line=line, first=True)
-
-    if line:
-        raise ParseError(filename, start_number, "is not terminated with a newline. (Check strings and parenthesis.)", line=line, first=True)
-
-    return rv
+    return split_logical_lines(data, pos, filename, original_filename, number, lines, prefix, munge_substitutions)
 
 
 def group_logical_lines(lines):
@@ -730,7 +560,12 @@ class Lexer(object):
         if self.pos == len(self.text):
             return None
 
-        m = re.compile(regexp, re.DOTALL).match(self.text, self.pos)
+        compiled = regexp_cache.get(regexp, None)
+
+        if compiled is None:
+            compiled = regexp_cache[regexp] = re.compile(regexp, re.DOTALL)
+
+        m = compiled.match(self.text, self.pos)
 
         if not m:
             return None
@@ -744,9 +579,26 @@ class Lexer(object):
         Advances the current position beyond any contiguous whitespace.
         """
 
-        # print self.text[self.pos].encode('unicode_escape')
+        if self.eob:
+            return
+
+        text = self.text
+        pos = self.pos
+
+        if pos == len(text):
+            return
+
+        # Most tokens aren't preceded by whitespace, so check the first
+        # character before running the regexp.
+        c = text[pos]
+
+        if not (c.isspace() or c == "\\"):
+            return
+
+        m = whitespace_regexp.match(text, pos)
 
-        self.match_regexp(r"(\s+|\\\n)+")
+        if m:
+            self.pos = m.end()
 
     def match(self, regexp):
         """
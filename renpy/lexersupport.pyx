@@ -21,8 +21,10 @@
 
 from __future__ import print_function
 
+import renpy
 
-cdef inline int letterlike(Py_UNICODE c):
+
+cdef inline int letterlike(Py_UCS4 c):
     if u'a' <= c <= u'z':
         return 1
 
@@ -77,3 +79,255 @@ def match_logical_word(unicode s, int pos):
 
 
     return s[start:pos], magic, pos
+
+
+cdef Py_ssize_t logical_word_end(unicode s, Py_ssize_t pos, Py_ssize_t len_s):
+    """
+    Returns the end of the logical word starting at `pos` in `s`.
+    """
+
+    cdef Py_UCS4 c = s[pos]
+
+    if c == u' ':
+
+        pos += 1
+
+        while pos < len_s:
+            if s[pos] != u' ':
+                break
+
+            pos += 1
+
+    elif letterlike(c):
+
+        pos += 1
+
+        while pos < len_s:
+            if not letterlike(s[pos]):
+                break
+
+            pos += 1
+
+    else:
+
+        pos += 1
+
+    return pos
+
+
+def split_logical_lines(unicode data, Py_ssize_t pos, filename, original_filename, int number, lines, prefix, munge):
+    """
+    Divides `data`, the contents of a file, into logical lines, starting
+    at `pos`, which is on physical line `number`. This is the core of
+    renpy.lexer.list_logical_lines.
+
+    `filename`
+        The elided filename, used in the results and errors.
+
+    `original_filename`
+        The filename given to renpy.scriptedit.Line.
+
+    `lines`
+        A dictionary that a renpy.scriptedit.Line is stored in for each
+        logical line.
+
+    `prefix`
+        The prefix that replaces the __ at the start of a magic word.
+
+    `munge`
+        A function that's called with a string that contains "[__", and
+        returns the string with the substitutions munged.
+
+    Returns a list of (filename, line number, line text) triples.
+    """
+
+    cdef Py_ssize_t len_data = len(data)
+    cdef Py_ssize_t startpos
+    cdef Py_ssize_t endpos
+    cdef Py_ssize_t strstart
+    cdef Py_ssize_t end
+    cdef int start_number = 0
+    cdef int parendepth
+    cdef Py_UCS4 c
+    cdef Py_UCS4 delim
+    cdef bint escape
+    cdef bint triplequote
+
+    ParseError = renpy.lexer.ParseError
+    Line = renpy.scriptedit.Line
+
+    rv = [ ]
+
+    line = [ ]
+
+    # Looping over the lines in the file.
+    while pos < len_data:
+
+        # The line number of the start of this logical line.
+        start_number = number
+
+        # The line that we're building up.
+        line = [ ]
+
+        # The number of open parenthesis there are right now.
+        parendepth = 0
+
+        loc = (filename, start_number)
+        entry = lines[loc] = Line(original_filename, start_number, pos)
+
+        # The end of the line, before any comment, or -1 if not known.
+        endpos = -1
+
+        while pos < len_data:
+
+            startpos = pos
+            c = data[pos]
+
+            if c == u'\t':
+                raise ParseError(filename, number, "Tab characters are not allowed in Ren'Py scripts.")
+
+            if c == u'\n' and not parendepth:
+
+                text = u''.join(line)
+
+                # If not blank...
+                if not text.isspace() and text:
+
+                    # Add to the results.
+                    rv.append((filename, start_number, text))
+
+                if endpos == -1:
+                    endpos = pos
+
+                entry.end_delim = endpos + 1
+
+                while data[endpos - 1] == u' ' or data[endpos - 1] == u'\r':
+                    endpos -= 1
+
+                entry.end = endpos
+                entry.text = data[entry.start:entry.end]
+                entry.full_text = data[entry.start:entry.end_delim]
+
+                pos += 1
+                number += 1
+                endpos = -1
+
+                # This helps out error checking.
+                line = [ ]
+                break
+
+            if c == u'\n':
+                number += 1
+                endpos = -1
+
+            if c == u'\r':
+                pos += 1
+                continue
+
+            # Backslash/newline.
+            if c == u'\\' and data[pos + 1] == u'\n':
+                pos += 2
+                number += 1
+                line.append(u"\\\n")
+                continue
+
+            # Parenthesis.
+            if c == u'(' or c == u'[' or c == u'{':
+                parendepth += 1
+
+            if (c == u')' or c == u']' or c == u'}') and parendepth:
+                parendepth -= 1
+
+            # Comments.
+            if c == u'#':
+                endpos = pos
+
+                while data[pos] != u'\n':
+                    pos += 1
+
+                continue
+
+            # Strings.
+            if c == u'"' or c == u"'" or c == u'`':
+                delim = c
+                pos += 1
+
+                escape = False
+                triplequote = False
+
+                if (pos < len_data - 1) and (data[pos] == delim) and (data[pos + 1] == delim):
+                    pos += 2
+                    triplequote = True
+
+                line.append(data[startpos:pos])
+
+                strstart = pos
+
+                while pos < len_data:
+
+                    c = data[pos]
+
+                    if c == u'\n':
+                        number += 1
+
+                    if c == u'\r':
+                        pos += 1
+                        continue
+
+                    if escape:
+                        escape = False
+                        pos += 1
+                        continue
+
+                    if c == delim:
+
+                        if not triplequote:
+                            pos += 1
+                            break
+
+                        if (pos < len_data - 2) and (data[pos + 1] == delim) and (data[pos + 2] == delim):
+                            pos += 3
+                            break
+
+                    if c == u'\\':
+                        escape = True
+
+                    pos += 1
+
+                s = data[strstart:pos]
+
+                if u'\r' in s:
+                    s = s.replace(u'\r', u'')
+
+                if u"[__" in s:
+
+                    # Munge substitutions.
+                    s = munge(s)
+
+                line.append(s)
+
+                continue
+
+            end = logical_word_end(data, pos, len_data)
+
+            if (end - pos) >= 3 and data[pos] == u'_' and data[pos + 1] == u'_':
+
+                rest = data[pos + 2:end]
+
+                if u"__" not in rest:
+                    line.append(prefix + rest)
+                else:
+                    line.append(data[pos:end])
+
+            else:
+                line.append(data[pos:end])
+
+            pos = end
+
+            if (pos - startpos) > 65536:
+                raise ParseError(filename, start_number, "Overly long logical line. (Check strings and parenthesis.)", line=line, first=True)
+
+    if line:
+        raise ParseError(filename, start_number, "is not terminated with a newline. (Check strings and parenthesis.)", line=line, first=True)
+
+    return rv
@@ -32,6 +32,8 @@ import threading
 import zlib
 import re
 import io
+import select
+import struct
 import unicodedata
 
 from pygame_sdl2.rwobject import RWops_from_file, RWops_create_subfile
@@ -1115,32 +1117,174 @@ def add_auto(fn, force=False):
         auto_mtimes[fn] = mtime
 
 
+class Inotify(object):
+    """
+    Uses the Linux inotify API to wait for changes to the files in a set
+    of directories.
+    """
+
+    # IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+    # IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    MASK = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400
+
+    # IN_NONBLOCK | IN_CLOEXEC
+    FLAGS = 0o4000 | 0o2000000
+
+    # The header of an inotify event - wd, mask, cookie, len.
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+
+        self.inotify_add_watch = libc.inotify_add_watch
+        self.inotify_add_watch.argtypes = [ ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32 ]
+        self.inotify_add_watch.restype = ctypes.c_int
+
+        self.fd = libc.inotify_init1(self.FLAGS)
+
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed.")
+
+        # A map from watch descriptor to directory.
+        self.watches = { }
+
+        # A map from directory to watch descriptor, or None if the directory
+        # can't be watched, and has to be polled.
+        self.directories = { }
+
+    def watch(self, dn):
+        """
+        Starts watching `dn`, if it isn't already being watched. Returns
+        True if this is a new directory.
+        """
+
+        if dn in self.directories:
+            return False
+
+        wd = self.inotify_add_watch(self.fd, renpy.exports.fsencode(dn or ".", force=True), self.MASK)
+
+        if wd < 0:
+            self.directories[dn] = None
+        else:
+            self.directories[dn] = wd
+            self.watches[wd] = dn
+
+        return True
+
+    def wait(self, timeout):
+        """
+        Waits up to `timeout` seconds for a change. Returns the set of
+        directories that changed, including those that can't be watched.
+        """
+
+        rv = set(k for k, v in self.directories.items() if v is None)
+
+        try:
+            readable = select.select([ self.fd ], [ ], [ ], timeout)[0]
+        except (OSError, select.error):
+            readable = [ ]
+
+        if not readable:
+            return rv
+
+        try:
+            data = os.read(self.fd, 65536)
+        except OSError:
+            return rv
+
+        pos = 0
+
+        while pos + self.EVENT.size <= len(data):
+            wd, mask, _cookie, length = self.EVENT.unpack_from(data, pos)
+            pos += self.EVENT.size + length
+
+            dn = self.watches.get(wd, None)
+
+            if dn is None:
+                continue
+
+            rv.add(dn)
+
+            # IN_IGNORED - the watch was removed, so the directory is
+            # watched again if it comes back.
+            if mask & 0x8000:
+                self.watches.pop(wd, None)
+                self.directories.pop(dn, None)
+
+        return rv
+
+    def close(self):
+        os.close(self.fd)
+
+
 def auto_thread_function():
     """
     This thread sets need_autoreload when necessary.
     """
 
-    while True:
+    inotify = None
 
-        with auto_lock:
+    if renpy.linux:
+        try:
+            inotify = Inotify()
+        except Exception:
+            inotify = None
+
+    try:
 
-            auto_lock.wait(1.5)
+        while True:
 
-            if auto_quit_flag:
-                return
+            if inotify is None:
 
-            items = list(auto_mtimes.items())
+                with auto_lock:
 
-        for fn, mtime in items:
+                    auto_lock.wait(1.5)
 
-            if mtime is auto_blacklisted:
-                continue
+                    if auto_quit_flag:
+                        return
+
+                    items = list(auto_mtimes.items())
 
-            if auto_mtime(fn) != mtime:
+            else:
 
                 with auto_lock:
-                    if auto_mtime(fn) != auto_mtimes[fn]:
-                        needs_autoreload.add(fn)
+
+                    if auto_quit_flag:
+                        return
+
+                    items = list(auto_mtimes.items())
+
+                # Directories that have just started being watched are
+                # checked, in case a file changed before it was watched.
+                changed = set()
+
+                for fn, _mtime in items:
+                    dn = os.path.dirname(fn)
+
+                    if inotify.watch(dn):
+                        changed.add(dn)
+
+                changed |= inotify.wait(1.5)
+
+                items = [ i for i in items if os.path.dirname(i[0]) in changed ]
+
+            for fn, mtime in items:
+
+                if mtime is auto_blacklisted:
+                    continue
+
+                if auto_mtime(fn) != mtime:
+
+                    with auto_lock:
+                        if auto_mtime(fn) != auto_mtimes[fn]:
+                            needs_autoreload.add(fn)
+
+    finally:
+        if inotify is not None:
+            inotify.close()
+
 
 def check_git_index_lock():
     """
@@ -1190,9 +1334,38 @@ def check_autoreload():
                 func(fn)
                 break
         else:
+            if renpy.config.autoreload_incremental and reload_file(fn):
+                continue
+
             renpy.exports.reload_script()
 
 
+def reload_file(fn):
+    """
+    Tries to reload the script file `fn` by itself. Returns True if that
+    worked, or False if the whole game needs to be reloaded.
+    """
+
+    if not fn.endswith(".rpy"):
+        return False
+
+    if renpy.store._in_replay:
+        return False
+
+    try:
+        if not renpy.game.script.reload_file(fn):
+            return False
+    except Exception:
+        renpy.display.log.write("While reloading %r:", fn)
+        renpy.display.log.exception()
+        return False
+
+    renpy.display.log.write("Reloaded %r.", fn)
+    renpy.exports.restart_interaction()
+
+    return True
+
+
 def auto_init():
     """
     Starts the autoreload thread.
@@ -29,6 +29,7 @@ from future.utils import reraise
 from typing import Optional
 
 import io
+import functools
 import zipfile
 import re
 import threading
@@ -40,7 +41,7 @@ import sys
 import renpy
 from json import dumps as json_dumps
 
-from renpy.compat.pickle import PROTOCOL, dump, loads
+from renpy.compat.pickle import PROTOCOL, pickler, unpickler, pickler_memo, unpickler_memo
 
 
 # This is used as a quick and dirty way of versioning savegame
@@ -408,9 +409,20 @@ def save(slotname, extra_info='', mutate_flag=False):
     if renpy.config.save_dump:
         save_dump(roots, renpy.game.log)
 
+    # The history is pickled after the rest of the game, so loading can
+    # stop before it, and load it when it's needed.
+    log, history = renpy.game.log.split_history()
+
     logf = io.BytesIO()
     try:
-        dump((roots, renpy.game.log), logf)
+        p = pickler(logf, save=True)
+        p.dump((roots, log))
+
+        if history:
+            history_data, refs = dump_history(history, pickler_memo(p))
+            p.dump(refs)
+            logf.write(history_data)
+
     except Exception:
 
         t, e, tb = sys.exc_info()
@@ -450,6 +462,48 @@ def save(slotname, extra_info='', mutate_flag=False):
     clear_slot(slotname)
 
 
+def dump_history(history, memo):
+    """
+    Pickles `history`, the rollback entries older than those saved with the
+    rest of the game. Objects that were pickled with the rest of the game
+    are replaced by their index in its pickle memo. `memo` is a map from
+    the id of each of those objects to its index.
+
+    Returns a (data, refs) tuple, where data is the pickled history, and
+    refs is a list of the indexes it uses.
+    """
+
+    refs = set()
+
+    def persistent_id(o):
+        rv = memo.get(id(o), None)
+
+        if rv is not None:
+            refs.add(rv)
+
+        return rv
+
+    f = io.BytesIO()
+
+    p = pickler(f, save=True)
+    p.persistent_id = persistent_id
+    p.dump(history)
+
+    return f.getvalue(), sorted(refs)
+
+
+def load_history(data, shared):
+    """
+    Unpickles history pickled by dump_history. `shared` is a map from the
+    index of each object the history uses to the object.
+    """
+
+    up = unpickler(io.BytesIO(data))
+    up.persistent_load = shared.__getitem__
+
+    return up.load()
+
+
 # The thread used for autosave.
 autosave_thread = None
 
@@ -596,6 +650,9 @@ def force_autosave(take_screenshot=False, block=False):
 
         return
 
+    # Load the history here, as it has to be loaded on the main thread.
+    renpy.game.log.load_history()
+
     autosave_not_running.clear()
 
     if not renpy.emscripten:
@@ -809,7 +866,23 @@ def load(filename):
     if not renpy.savetoken.check_load(log_data, signature):
         return
 
-    roots, log = loads(log_data)
+    f = io.BytesIO(log_data)
+    up = unpickler(f)
+
+    roots, log = up.load()
+
+    # Saves made by older versions don't have a history.
+    if f.tell() < len(log_data):
+        refs = up.load()
+
+        memo = unpickler_memo(up)
+        log.history_loader = functools.partial(load_history, log_data[f.tell():], { i : memo[i] for i in refs })
+        del memo
+
+    # Drop the unpickler and the data before the game starts, as the memo
+    # refers to every object that was loaded.
+    del f, up, log_data
+
     log.unfreeze(roots, label="_after_load")
 
 
@@ -40,6 +40,8 @@ last_clock = time.time()
 def log_clock(s):
     global last_clock
     now = time.time()
+    renpy.startupprofile.phase(s, now - last_clock)
+
     s = "{} took {:.2f}s".format(s, now - last_clock)
 
     renpy.display.log.write(s)
@@ -338,6 +340,7 @@ def android_searchpath():
 
 def main():
 
+    renpy.gcmanager.init()
     gc.set_threshold(*renpy.config.gc_thresholds)
 
     log_clock("Bootstrap to the start of init.init.")
@@ -542,7 +545,7 @@ def main():
         log_clock("Loading persistent.")
 
         # Clear the list of seen statements in this game.
-        game.seen_session = { }
+        game.seen_session = renpy.persistent.SeenSet()
 
         # Initialize persistent variables.
         renpy.store.persistent = game.persistent # type: ignore
@@ -647,6 +650,8 @@ def main():
         else:
             gc.set_threshold(700, 10, 10)
 
+        renpy.gcmanager.freeze()
+
         log_clock("Initial gc.")
 
         # Start debugging file opens.
@@ -502,6 +502,51 @@ def profile_rollback():
     write("")
 
 
+def profile_rollback_entries():
+    """
+    :doc: memory
+
+    Profiles memory used by each entry in the rollback log. Writes (to
+    memory.txt and stdout) the number of bytes first reachable from each
+    entry, newest entry first, along with the statement the entry rolls
+    back to. Memory that is also used by the running game, or by a
+    newer entry, is not counted.
+    """
+
+    write("=" * 78)
+    write("")
+    write("Rollback entry profile at " + time.ctime() + ":")
+    write("")
+
+    seen = profile_memory_common([ "store", "renpy.display" ])[1]
+
+    log = list(renpy.game.log.log)
+    log.reverse()
+
+    write("Entry".rjust(6) + " " + "Bytes".rjust(13) + " " + "Statement")
+    write("-" * 6 + " " + "-" * 13 + " " + "-" * 50)
+
+    total = 0
+
+    for i, rb in enumerate(log):
+        name = "<rollback {}>".format(i)
+
+        size = walk_memory([ (name, rb) ], seen)[0][name]
+        total += size
+
+        try:
+            node = renpy.game.script.lookup(rb.context.current)
+            where = "{}:{}".format(node.filename, node.linenumber)
+        except Exception:
+            where = repr(rb.context.current)
+
+        write("{:6d} {:13,d} {}".format(i, size, where))
+
+    write("-" * 6 + " " + "-" * 13)
+    write("{:6d} {:13,d} Total bytes used by the rollback log.".format(len(log), total))
+    write("")
+
+
 def find_parents(cls):
     """
     Finds the parents of every object of type `cls`.
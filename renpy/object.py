@@ -22,7 +22,9 @@
 from __future__ import division, absolute_import, with_statement, print_function, unicode_literals
 from renpy.compat import PY2, basestring, bchr, bord, chr, open, pystr, range, round, str, tobytes, unicode # *
 
+import copyreg
 
+import renpy
 
 
 # Allow pickling NoneType.
@@ -59,9 +61,15 @@ class Object(object):
 
     def __setstate__(self, new_dict):
 
-        version = new_dict.pop("__version__", 0)
+        if isinstance(new_dict, tuple):
 
-        self.__dict__.update(new_dict)
+            # A (names, values, version) tuple, from reduce_object.
+            names, values, version = new_dict
+            self.__dict__.update(zip(names, values))
+
+        else:
+            version = new_dict.pop("__version__", 0)
+            self.__dict__.update(new_dict)
 
         if version != self.__version__:
             self.after_upgrade(version)  # type: ignore
@@ -73,6 +81,36 @@ class Object(object):
 # throw an error.
 
 
+# A map from a tuple of field names to itself, so that objects with the same
+# fields share one tuple, which is only pickled once.
+layouts = { }
+
+
+def reduce_object(o):
+    """
+    A save reducer for Objects that are saved in large numbers. This stores
+    the object's fields as a tuple of names that's shared between objects,
+    and a tuple of values, rather than as a dict. It should only be used
+    with classes that don't override __getstate__.
+
+    If config.save_object_vectors is false, the object is saved with a
+    dict, which versions of Ren'Py older than this one can load.
+    """
+
+    if not renpy.config.save_object_vectors:
+        return o.__reduce_ex__(renpy.compat.pickle.PROTOCOL)
+
+    d = vars(o)
+
+    if o.nosave:
+        d = { k : v for k, v in d.items() if k not in o.nosave }
+
+    names = tuple(d)
+    names = layouts.setdefault(names, names)
+
+    return (copyreg.__newobj__, (type(o), ), (names, tuple(d.values()), o.__version__))
+
+
 sentinels = { }
 
 
@@ -26,7 +26,10 @@ from renpy.compat import PY2, basestring, bchr, bord, chr, open, pystr, range, r
 
 
 
+import collections
+import json
 import time
+
 import renpy
 
 # A list of (time, depth, message) tuples.
@@ -117,3 +120,249 @@ def analyze():
 
         for i in range(depth, DEPTH_LEVELS):
             times[i] = t
+
+
+################################################################################
+# The frame profiler.
+################################################################################
+
+clock = getattr(time, "perf_counter", time.time)
+
+
+class Frame(object):
+    """
+    :doc: frame_profile class
+
+    Information about a frame recorded by the frame profiler. This has
+    the following fields:
+
+    `start`, `end`
+        The times the frame started and ended, in seconds. These can only
+        be compared to other times from the frame profiler.
+
+    `spans`
+        A list of (name, start, end) tuples, one for each span that ended
+        during the frame. The names are "update", "render", "draw", "flip",
+        "video", "event", "predict", and "gc".
+    """
+
+    __slots__ = [ "start", "end", "spans" ]
+
+    def __init__(self, start, end, spans):
+        self.start = start
+        self.end = end
+        self.spans = spans
+
+    @property
+    def duration(self):
+        """
+        The time the frame took, in seconds.
+        """
+
+        return self.end - self.start
+
+    def span_time(self, name):
+        """
+        Returns the total time taken by spans named `name` during this
+        frame, in seconds.
+        """
+
+        return sum(end - start for n, start, end in self.spans if n == name)
+
+
+# The frames recorded by the frame profiler, oldest first.
+frames = collections.deque()
+
+# The time the frame in progress started, or None if no frame is in progress.
+frame_start = None
+
+# The spans that have ended during the frame in progress.
+frame_spans = [ ]
+
+
+def begin_span():
+    """
+    Called at the start of a span. Returns the time the span started, or
+    None if the frame profiler isn't running.
+    """
+
+    if renpy.config.frame_profile:
+        return clock()
+
+    return None
+
+
+def end_span(name, start):
+    """
+    Called at the end of the span named `name`, with the value begin_span
+    returned at its start.
+    """
+
+    if start is None:
+        return
+
+    frame_spans.append((name, start, clock()))
+
+
+def begin_frame():
+    """
+    Called when a frame begins being drawn. This ends the previous frame,
+    and adds it to the frames.
+    """
+
+    global frame_start
+    global frame_spans
+    global frames
+
+    if not renpy.config.frame_profile:
+        frame_start = None
+        return
+
+    now = clock()
+
+    if frame_start is not None:
+
+        if frames.maxlen != renpy.config.frame_profile_frames:
+            frames = collections.deque(frames, renpy.config.frame_profile_frames)
+
+        frames.append(Frame(frame_start, now, frame_spans))
+
+    frame_start = now
+    frame_spans = [ ]
+
+
+def get_frame_profile():
+    """
+    :doc: frame_profile
+
+    Returns a list of :class:`Frame` objects, one for each frame recorded
+    by the frame profiler, oldest first. Frames are only recorded while
+    :var:`config.frame_profile` is true.
+    """
+
+    return list(frames)
+
+
+def clear_frame_profile():
+    """
+    :doc: frame_profile
+
+    Discards the frames recorded by the frame profiler.
+    """
+
+    global frame_start
+
+    frames.clear()
+    frame_start = None
+
+
+def percentile(times, fraction):
+    """
+    Returns the value `fraction` of the way through the sorted list `times`.
+    """
+
+    if not times:
+        return 0.0
+
+    return times[min(int(len(times) * fraction), len(times) - 1)]
+
+
+def frame_profile_summary():
+    """
+    :doc: frame_profile
+
+    Summarizes the frames recorded by the frame profiler. Returns a
+    dictionary mapping "frame" and each span name to a dictionary with
+    the keys "count", "mean", "median", "p95", "p99", and "max". The
+    count is the number of frames, and the other values are the time
+    per frame, in seconds.
+    """
+
+    names = set()
+
+    for f in frames:
+        for n, _start, _end in f.spans:
+            names.add(n)
+
+    per_frame = { "frame" : [ f.duration for f in frames ] }
+
+    for n in names:
+        per_frame[n] = [ f.span_time(n) for f in frames ]
+
+    rv = { }
+
+    for n, times in per_frame.items():
+        times.sort()
+
+        rv[n] = {
+            "count" : len(times),
+            "mean" : sum(times) / len(times) if times else 0.0,
+            "median" : percentile(times, .5),
+            "p95" : percentile(times, .95),
+            "p99" : percentile(times, .99),
+            "max" : times[-1] if times else 0.0,
+            }
+
+    return rv
+
+
+def frame_time_histogram(bucket=0.001, span=None):
+    """
+    :doc: frame_profile
+
+    Returns a histogram of the times taken by the frames recorded by the
+    frame profiler, as a list of (time, count) tuples, sorted by time.
+    Each time is the start of a bucket, in seconds.
+
+    `bucket`
+        The width of each bucket, in seconds.
+
+    `span`
+        If not None, the name of a span. The histogram is of the time
+        taken by that span in each frame, rather than of the whole frame.
+    """
+
+    counts = collections.Counter()
+
+    for f in frames:
+        if span is None:
+            t = f.duration
+        else:
+            t = f.span_time(span)
+
+        counts[int(t / bucket)] += 1
+
+    return [ (i * bucket, counts[i]) for i in sorted(counts) ]
+
+
+def export_frame_profile(filename):
+    """
+    :doc: frame_profile
+
+    Writes the frames recorded by the frame profiler to `filename`, in
+    the Chrome trace event format. The file can be viewed with the
+    about://tracing page of Chrome, or with Perfetto.
+    """
+
+    events = [ ]
+
+    def event(name, cat, start, end, **args):
+        events.append({
+            "name" : name,
+            "cat" : cat,
+            "ph" : "X",
+            "ts" : round(start * 1000000, 3),
+            "dur" : round((end - start) * 1000000, 3),
+            "pid" : 1,
+            "tid" : 1,
+            "args" : args,
+            })
+
+    for i, f in enumerate(frames):
+        event("frame", "frame", f.start, f.end, frame=i)
+
+        for n, start, end in f.spans:
+            event(n, "span", start, end, frame=i)
+
+    with open(filename, "w") as f:
+        f.write(str(json.dumps({ "traceEvents" : events, "displayTimeUnit" : "ms" })))
@@ -25,7 +25,6 @@ from renpy.compat import PY2, basestring, bchr, bord, chr, open, pystr, range, r
 
 
 import os
-import copy
 import time
 import zlib
 import weakref
@@ -34,6 +33,271 @@ import renpy
 
 from renpy.compat.pickle import dump, dumps, loads
 
+class NameTable(object):
+    """
+    Maps statement names to dense integers, which index the bits of a
+    SeenSet. Names are added the first time they're added to a SeenSet, so
+    only names that have been seen take up space.
+    """
+
+    def __init__(self):
+
+        # A map from name to integer.
+        self.ids = { }
+
+        # A list of names, indexed by integer.
+        self.names = [ ]
+
+    def intern(self, name):
+        """
+        Returns the integer corresponding to `name`, assigning a new
+        integer if needed.
+        """
+
+        rv = self.ids.get(name, None)
+
+        if rv is None:
+            rv = len(self.names)
+            self.ids[name] = rv
+            self.names.append(name)
+
+        return rv
+
+
+# The table that's used by new SeenSets.
+name_table = NameTable()
+
+
+class SeenSet(object):
+    """
+    A compact set of statement or label names, with a dictionary-like
+    interface where every name present maps to True. This is used for
+    persistent._seen_ever and renpy.game.seen_session.
+
+    In memory, this is a bitset indexed by integers from a NameTable. It
+    pickles in the form returned by `encode`, or as a plain dictionary if
+    config.persistent_seen_dicts is true, so the persistent data can be read
+    by versions of Ren'Py that don't have SeenSets. The dictionary is turned
+    back into a SeenSet when the persistent data is loaded.
+    """
+
+    def __init__(self, names=()):
+        self.table = name_table
+        self.bits = bytearray()
+
+        self.update(names)
+
+    def __reduce__(self):
+
+        if renpy.config.persistent_seen_dicts:
+            return (dict, (dict.fromkeys(self, True),))
+
+        return (decode_seen_set, self.encode())
+
+    def encode(self):
+        """
+        Returns a compact form of this set, as a tuple of two lists. The
+        first is a list of (filename, version, start, bits) tuples. The bits
+        are a byte string, with bit `i` set if the statement name (filename,
+        version, start + i) is in the set. The second is a list of the other
+        names in the set, like labels.
+        """
+
+        serials = { }
+        names = [ ]
+
+        for name in self:
+            if isinstance(name, tuple) and (len(name) == 3) and (type(name[2]) is int):
+                serials.setdefault(name[:2], [ ]).append(name[2])
+            else:
+                names.append(name)
+
+        runs = [ ]
+
+        for (filename, version), l in serials.items():
+            start = min(l)
+            bits = bytearray(((max(l) - start) >> 3) + 1)
+
+            for i in l:
+                i -= start
+                bits[i >> 3] |= (1 << (i & 7))
+
+            runs.append((filename, version, start, bytes(bits)))
+
+        return runs, names
+
+    # Sets.
+
+    def add(self, name):
+        i = self.table.intern(name)
+        byte = i >> 3
+
+        bits = self.bits
+
+        if byte >= len(bits):
+            bits.extend(bytearray(byte + 1 - len(bits)))
+
+        bits[byte] |= (1 << (i & 7))
+
+    def discard(self, name):
+        i = self.table.ids.get(name, None)
+
+        if i is None:
+            return
+
+        byte = i >> 3
+
+        if byte < len(self.bits):
+            self.bits[byte] &= ~(1 << (i & 7)) & 0xff
+
+    def update(self, other):
+
+        if isinstance(other, SeenSet) and (other.table is self.table):
+            bits = self.bits
+            obits = other.bits
+
+            if len(bits) < len(obits):
+                bits.extend(bytearray(len(obits) - len(bits)))
+
+            if PY2:
+                for i, b in enumerate(obits):
+                    if b:
+                        bits[i] |= b
+
+            else:
+                n = int.from_bytes(bits, "little") | int.from_bytes(obits, "little")
+                self.bits = bytearray(n.to_bytes(len(bits), "little"))
+
+            return
+
+        for name in other:
+            self.add(name)
+
+    def clear(self):
+        self.bits = bytearray()
+
+    def __contains__(self, name):
+        i = self.table.ids.get(name, None)
+
+        if i is None:
+            return False
+
+        byte = i >> 3
+
+        if byte >= len(self.bits):
+            return False
+
+        return bool(self.bits[byte] & (1 << (i & 7)))
+
+    def __iter__(self):
+        names = self.table.names
+
+        for byte, b in enumerate(self.bits):
+            if not b:
+                continue
+
+            for bit in range(8):
+                if b & (1 << bit):
+                    yield names[(byte << 3) + bit]
+
+    def __len__(self):
+
+        if not PY2:
+            return bin(int.from_bytes(self.bits, "little")).count("1")
+
+        rv = 0
+
+        for b in self.bits:
+            if b:
+                rv += bin(b).count("1")
+
+        return rv
+
+    def __eq__(self, other):
+
+        if isinstance(other, SeenSet) and (other.table is self.table):
+            return self.bits.rstrip(b"\0") == other.bits.rstrip(b"\0")
+
+        try:
+            return set(self) == set(other)
+        except Exception:
+            return False
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    __hash__ = None # type: ignore
+
+    def copy(self):
+        rv = SeenSet()
+        rv.table = self.table
+        rv.bits = bytearray(self.bits)
+        return rv
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    # Dictionaries.
+
+    def __getitem__(self, name):
+        if name in self:
+            return True
+
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        if value:
+            self.add(name)
+        else:
+            self.discard(name)
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+
+        self.discard(name)
+
+    def get(self, name, default=None):
+        if name in self:
+            return True
+
+        return default
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [ True ] * len(self)
+
+    def items(self):
+        return [ (i, True) for i in self ]
+
+    def __repr__(self):
+        return "<SeenSet {} names>".format(len(self))
+
+
+def decode_seen_set(runs, names):
+    """
+    Returns a SeenSet containing the names in `runs` and `names`, in the
+    form returned by SeenSet.encode.
+    """
+
+    rv = SeenSet(names)
+
+    for filename, version, start, bits in runs:
+        for byte, b in enumerate(bytearray(bits)):
+            if not b:
+                continue
+
+            for bit in range(8):
+                if b & (1 << bit):
+                    rv.add((filename, version, start + (byte << 3) + bit))
+
+    return rv
+
+
 # The class that's used to hold the persistent data.
 
 class Persistent(object):
@@ -90,7 +354,9 @@ class Persistent(object):
 
         # Initialize the set of statements seen ever.
         if not self._seen_ever:
-            self._seen_ever = { }
+            self._seen_ever = SeenSet()
+        elif not isinstance(self._seen_ever, SeenSet):
+            self._seen_ever = SeenSet(self._seen_ever)
 
         # Initialize the set of images seen ever.
         if not self._seen_images:
@@ -125,37 +391,145 @@ renpy.game.Persistent = Persistent # type: ignore
 renpy.game.persistent = Persistent()
 
 
-def safe_deepcopy(o):
+class Decompress(object):
+    """
+    Pickles as a call to zlib.decompress, with `data` as the argument.
     """
-    A "safe" version of deepcopy. If an object doesn't implement __eq__
-    correctly, we replace it with its original.
 
-    This tries to ensure we don't constantly find changes in the same
-    field.
+    __slots__ = [ "data" ]
+
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce__(self):
+        return (zlib.decompress, (self.data,))
+
+
+class Record(object):
+    """
+    A field of persistent data that is pickled and compressed separately
+    from the other fields, so fields that haven't changed don't need to be
+    pickled or compressed again when the persistent data is saved.
+
+    A record pickles as a call that unpickles the field's value, so the
+    field takes its value when the persistent data is loaded, even by
+    code that doesn't know about records. Objects are not shared between
+    fields.
     """
 
-    rv = copy.deepcopy(o)
+    __slots__ = [ "pickled", "compressed", "snapshot" ]
 
-    if not (o == rv):
+    def __init__(self, pickled, snapshot=None):
 
-        if renpy.config.developer:
-            raise Exception("To be persisted, %r must support equality comparison." % o)
+        # The pickled value of the field.
+        self.pickled = pickled
+
+        # The compressed version of pickled, or None if it hasn't been
+        # compressed yet.
+        self.compressed = None
+
+        # A snapshot of the value of the field, from the snapshot function.
+        self.snapshot = snapshot
+
+    def __reduce__(self):
+        if self.compressed is None:
+            self.compressed = zlib.compress(self.pickled, 3)
+
+        return (loads, (Decompress(self.compressed),))
+
+
+def dump_records(o, records):
+    """
+    Pickles `o`, an object that uses its __dict__ as its state, using the
+    fields in `records` (a map from field name to Record) where possible.
+    Returns the pickled data.
+    """
+
+    rv = o.__class__.__new__(o.__class__)
+
+    for k, v in vars(o).items():
+        r = records.get(k, None)
+
+        if r is not None:
+            rv.__dict__[k] = r
         else:
-            rv = o
+            rv.__dict__[k] = v
 
-    return rv
+    return dumps(rv)
+
+
+# The types of values that can't change, and so can be compared to a
+# snapshot of themselves.
+snapshot_types = { type(None), bool, int, float, complex, bytes, str }
+
+if PY2:
+    snapshot_types.add(long) # type: ignore
+
+
+def snapshot(value):
+    """
+    Returns a copy of `value` that can be compared to a later value to find
+    out if it has changed without pickling it, or None if the type of value
+    can't be compared that way.
+    """
+
+    t = type(value)
+
+    if t in snapshot_types:
+        return (t, value)
+
+    if t is SeenSet:
+        return (t, value.copy())
+
+    return None
+
+
+def update_record(records, field, value):
+    """
+    Updates the record for `field` in `records` to match `value`. Returns
+    True if the field has changed, or False if it is the same as the
+    record.
+    """
+
+    old = records.get(field, None)
 
+    new_snapshot = snapshot(value)
 
-# A map from field names to a backup of the field names in the persistent
-# object.
-backup = { }
+    if (old is not None) and (new_snapshot is not None) and (old.snapshot == new_snapshot):
+        return False
+
+    pickled = dumps(value)
+
+    if old is not None:
+
+        if old.pickled == pickled:
+            return False
+
+        # Pickles of equal objects aren't always the same, for example
+        # sets that were built in a different order.
+        try:
+            loaded = loads(old.pickled)
+            same = (type(loaded) is type(value)) and (loaded == value)
+        except Exception:
+            same = False
+
+        if same:
+            return False
+
+    records[field] = Record(pickled, new_snapshot)
+    return True
+
+
+# A map from field names to the Record of that field as of the last time
+# changes were found. These double as the backup used to find changes.
+records = { }
 
 
 def find_changes():
     """
     This finds changes in the persistent object. When it finds a change, it
-    backs up that changed, and puts the current time for that field into
-    persistent._changed.
+    updates the record of that field, and puts the current time for that
+    field into persistent._changed.
 
     This returns True if there was at least one change, and False
     otherwise.
@@ -168,21 +542,34 @@ def find_changes():
     persistent = renpy.game.persistent
     pvars = vars(persistent)
 
-    fields = set(backup.keys()) | set(pvars.keys())
+    for f in list(records):
+        if f not in pvars:
+            del records[f]
+            persistent._changed[f] = now # type: ignore
+            rv = True
 
-    for f in fields:
+    for f, new in pvars.items():
 
         if f == "_changed":
             continue
 
-        old = backup.get(f, None)
-        new = pvars.get(f, None)
+        try:
+            changed = update_record(records, f, new)
+        except Exception:
+            if renpy.config.developer:
+                raise Exception("To be persisted, %r must be picklable." % (new,))
 
-        if not (new == old):
+            # Without a record, write() tries to pickle the field itself,
+            # rather than saving a value it used to have.
+            records.pop(f, None)
 
-            persistent._changed[f] = now # type: ignore
-            backup[f] = safe_deepcopy(new)
+            renpy.display.log.write("Could not pickle persistent.%s:", f)
+            renpy.display.log.exception()
 
+            changed = True
+
+        if changed:
+            persistent._changed[f] = now # type: ignore
             rv = True
 
     return rv
@@ -241,9 +628,17 @@ def init():
     if persistent is None:
         persistent = Persistent()
 
-    # Create the backup of the persistent data.
+    # Create the records of the persistent data.
+    records.clear()
+
     for k, v in persistent.__dict__.items():
-        backup[k] = safe_deepcopy(v)
+        if k == "_changed":
+            continue
+
+        try:
+            update_record(records, k, v)
+        except Exception:
+            pass
 
     return persistent
 
@@ -341,9 +736,13 @@ def merge(other):
         val = merge_func(old, new, pval)
 
         pvars[f] = val
-        backup[f] = safe_deepcopy(val)
         persistent._changed[f] = t # type: ignore
 
+        try:
+            update_record(records, f, val)
+        except Exception:
+            records.pop(f, None)
+
 
 # The mtime of the most recently processed savefile.
 persistent_mtime = 0
@@ -398,7 +797,7 @@ def update(force_save=False):
     persistent_mtime = mtime
 
     if need_save:
-        save()
+        write()
 
 
 should_save_persistent = True
@@ -409,12 +808,28 @@ def save():
     Saves the persistent data to disk.
     """
 
+    if not should_save_persistent:
+        return
+
+    find_changes()
+    write()
+
+
+def write():
+    """
+    Writes the persistent data to disk, using the records of fields that
+    haven't changed since find_changes was last called.
+    """
+
     if not should_save_persistent:
         return
 
     try:
-        data = dumps(renpy.game.persistent)
-        compressed = zlib.compress(data, 3)
+        data = dump_records(renpy.game.persistent, records)
+
+        # The records are already compressed, so there's little to gain
+        # from compressing them again.
+        compressed = zlib.compress(data, 0)
         compressed += renpy.savetoken.sign_data(data).encode("utf-8")
         renpy.loadsave.location.save_persistent(compressed)
     except Exception:
@@ -467,12 +882,14 @@ class _MultiPersistent(object):
     _filename = ""
     _name = ""
     _save_on_quit = False
+    _records = None
 
     def __getstate__(self):
         state = self.__dict__.copy()
         del state['_filename']
         del state['_name']
         del state['_save_on_quit']
+        state.pop('_records', None)
         return state
 
     def __setstate__(self, state):
@@ -485,10 +902,27 @@ class _MultiPersistent(object):
         return None
 
     def save(self):
+
+        if self._records is None:
+            self._records = { }
+
+        records = self._records
+        state = self.__getstate__()
+
+        for k in list(records):
+            if k not in state:
+                del records[k]
+
+        for k, v in state.items():
+            try:
+                update_record(records, k, v)
+            except Exception:
+                records.pop(k, None)
+
         try:
             fn = self._filename
             with open(fn + ".new", "wb") as f:
-                dump(self, f)
+                f.write(dump_records(self, records))
         except OSError as e:
             if renpy.config.developer:
                 raise e
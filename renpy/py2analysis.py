@@ -30,6 +30,8 @@ from renpy.python import py_compile
 # Import the Python AST module, instead of the Ren'Py ast module.
 import ast
 
+import hashlib
+import os
 import zlib
 
 from renpy.compat.pickle import loads, dumps
@@ -674,7 +676,43 @@ class CompilerCache(object):
         self.updated = False
 
         # The version of this object.
-        self.version = 1
+        self.version = 2
+
+        # True if caches should be loaded from disk when a file is first
+        # used.
+        self.load_files = False
+
+        # The files whose caches have been loaded, or that have no cache.
+        self.loaded_files = set()
+
+        # The files with entries that weren't in the cache.
+        self.updated_files = set()
+
+    def load_file(self, filename):
+        """
+        Loads the cache for `filename`, unless it's already been loaded, or
+        the cache is for an older version of the file.
+        """
+
+        self.loaded_files.add(filename)
+
+        if not self.load_files:
+            return
+
+        try:
+            with renpy.loader.load(cache_filename(filename)) as f:
+                c = loads(zlib.decompress(f.read()))
+        except Exception:
+            return
+
+        if c["version"] != self.version:
+            return
+
+        if c["digest"] != file_digest(filename):
+            return
+
+        self.ast_eval_cache.update(c["eval"])
+        self.ast_exec_cache.update(c["exec"])
 
     def ast_eval_literal(self, expr):
         """
@@ -688,6 +726,9 @@ class CompilerCache(object):
             filename = None
             linenumber = None
 
+        if filename not in self.loaded_files:
+            self.load_file(filename)
+
         key = (expr, filename, linenumber)
 
         rv = self.ast_eval_cache.get(key, None)
@@ -705,6 +746,7 @@ class CompilerCache(object):
 
             self.ast_eval_cache[key] = rv
             self.updated = True
+            self.updated_files.add(filename)
 
         new_ccache.ast_eval_cache[key] = rv
 
@@ -723,12 +765,16 @@ class CompilerCache(object):
         else:
             key = (code, None, None)
 
+        if key[1] not in self.loaded_files:
+            self.load_file(key[1])
+
         rv = self.ast_exec_cache.get(key, None)
 
         if rv is None:
             rv = py_compile(code, 'exec', ast_node=True)
             self.ast_exec_cache[key] = rv
             self.updated = True
+            self.updated_files.add(key[1])
 
         new_ccache.ast_exec_cache[key] = rv
 
@@ -738,36 +784,103 @@ class CompilerCache(object):
 ccache = CompilerCache()
 new_ccache = CompilerCache()
 
-CACHE_FILENAME = "cache/pyanalysis.rpyb"
+# The directory the cache for each file is stored in.
+CACHE_DIRECTORY = "cache/pyanalysis"
+
+# The file the cache was stored in by older versions of Ren'Py.
+OLD_CACHE_FILENAME = "cache/pyanalysis.rpyb"
+
+
+def cache_filename(filename):
+    """
+    Returns the name of the file the cache for `filename` is stored in.
+    """
+
+    name = hashlib.md5(repr(filename).encode("utf-8")).hexdigest()
+
+    return CACHE_DIRECTORY + "/" + name + ".rpyb"
+
+
+def file_digest(filename):
+    """
+    Returns the digest of the script file `filename`, or None if it's
+    not a script file.
+    """
+
+    return renpy.game.script.file_digests.get(filename, None)
 
 
 def load_cache():
+    """
+    Enables loading the cache. The cache for each file is loaded when code
+    from that file is first analyzed.
+    """
+
     if renpy.game.args.compile: # type: ignore
         return
 
-    try:
-        with renpy.loader.load(CACHE_FILENAME) as f:
-            c = loads(zlib.decompress(f.read()))
-
-        if c.version == ccache.version:
-            ccache.ast_eval_cache.update(c.ast_eval_cache)
-            ccache.ast_exec_cache.update(c.ast_exec_cache)
-    except Exception:
-        pass
+    ccache.load_files = True
 
 
 def save_cache():
+    """
+    Saves the cache for each file with code that wasn't in the cache. Only
+    the entries used by this run are saved, so stale entries are dropped.
+    """
+
     if not ccache.updated:
         return
 
     if renpy.macapp:
         return
 
+    # A map from filename to the (eval, exec) caches for that file.
+    files = { }
+
+    for key, rv in new_ccache.ast_eval_cache.items():
+        files.setdefault(key[1], ({ }, { }))[0][key] = rv
+
+    for key, rv in new_ccache.ast_exec_cache.items():
+        files.setdefault(key[1], ({ }, { }))[1][key] = rv
+
+    for filename in ccache.updated_files:
+
+        if filename not in files:
+            continue
+
+        eval_cache, exec_cache = files[filename]
+
+        c = {
+            "version" : ccache.version,
+            "digest" : file_digest(filename),
+            "eval" : eval_cache,
+            "exec" : exec_cache,
+            }
+
+        try:
+            data = zlib.compress(dumps(c, True), 3)
+
+            with open(renpy.loader.get_path(cache_filename(filename)), "wb") as f:
+                f.write(data)
+        except Exception:
+            pass
+
+    # Remove the caches of files that no longer exist, and the old cache.
+    keep = { os.path.basename(cache_filename(i)) for i in files }
+    keep.update(os.path.basename(cache_filename(i)) for i in renpy.game.script.file_digests)
+
     try:
-        data = zlib.compress(dumps(new_ccache, True), 3)
+        directory = os.path.join(renpy.config.gamedir, CACHE_DIRECTORY)
+
+        for fn in os.listdir(directory):
+            if fn not in keep:
+                os.unlink(os.path.join(directory, fn))
+
+        old = os.path.join(renpy.config.gamedir, OLD_CACHE_FILENAME)
+
+        if os.path.exists(old):
+            os.unlink(old)
 
-        with open(renpy.loader.get_path(CACHE_FILENAME), "wb") as f:
-            f.write(data)
     except Exception:
         pass
 
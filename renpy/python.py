@@ -335,6 +335,46 @@ def reset_store_changes(name):
     sd = store_dicts[name]
     sd.begin()
 
+
+def clean_store_names(name, names):
+    """
+    Makes the current values of the variables in `names` part of the clean
+    copy of the store `name`, as if they had been set during init. This is
+    used when init code is re-run after the game has started.
+    """
+
+    if not name.startswith("store."):
+        name = "store." + name
+
+    sd = store_dicts[name]
+
+    old = sd.old.as_dict()
+
+    for i in names:
+        if i in sd:
+            old[i] = sd[i]
+        else:
+            old.pop(i, None)
+
+        sd.ever_been_changed.discard(i)
+
+    sd.old = DictItems(old)
+
+    if clean_store_backup is None:
+        return
+
+    store = clean_store_backup.store.get(name, None)
+
+    if store is None:
+        return
+
+    for i in names:
+        if i in sd:
+            store[i] = sd[i]
+            clean_store_backup.old[name][i] = sd[i]
+
+        clean_store_backup.ever_been_changed[name].discard(i)
+
 # Code that replaces literals will calls to magic constructors.
 
 
@@ -36,8 +36,10 @@ import sys
 import time
 import io
 import types
+import copy
 import copyreg
 import functools
+import collections
 
 import renpy
 
@@ -243,6 +245,17 @@ class Rollback(renpy.object.Object):
 
         self.context = renpy.game.context().rollback_copy()
 
+        # Share unchanged parts of the context with the previous entry. This
+        # isn't done if that entry's context is running, as its containers
+        # will change.
+        log = renpy.game.log
+
+        if (log is not None) and (log.current is not None):
+            other = log.current.context
+
+            if not any(i is other for i in renpy.game.contexts):
+                self.context.compact(other)
+
         self.objects = [ ]
         self.purged = False
         self.random = [ ]
@@ -417,14 +430,19 @@ class Rollback(renpy.object.Object):
         the data information intact.
         """
 
+        self.context.unshare()
         renpy.game.contexts = renpy.game.contexts[:-1] + [ self.context ]
 
 
+renpy.compat.pickle.register_save_reducer(Rollback, renpy.object.reduce_object)
+
+
 class RollbackLog(renpy.object.Object):
     """
     This class manages the list of Rollback objects.
 
-    @ivar log: The log of rollback objects.
+    @ivar log: The log of rollback objects. This is a deque, so old
+    entries can be cheaply removed from the start.
 
     @ivar current: The current rollback object. (Equivalent to
     log[-1])
@@ -436,19 +454,24 @@ class RollbackLog(renpy.object.Object):
 
     @ivar mutated: A dictionary that maps object ids to a tuple of
     (weakref to object, information needed to rollback that object)
+
+    @ivar history_loader: If not None, a function that loads and returns
+    the rollback entries older than those in log, which weren't loaded
+    with the rest of the game.
     """
 
     __version__ = 5
 
-    nosave = [ 'old_store', 'mutated', 'identifier_cache' ]
+    nosave = [ 'old_store', 'mutated', 'identifier_cache', 'history_loader' ]
     identifier_cache = None
+    history_loader = None
     force_checkpoint = False
 
     def __init__(self):
 
         super(RollbackLog, self).__init__()
 
-        self.log = [ ]
+        self.log = collections.deque()
         self.current = None
         self.mutated = { }
         self.rollback_limit = 0
@@ -480,6 +503,9 @@ class RollbackLog(renpy.object.Object):
         self.mutated = { }
         self.rolled_forward = False
 
+        if not isinstance(self.log, collections.deque):
+            self.log = collections.deque(self.log)
+
     def after_upgrade(self, version):
         if version < 2:
             self.ever_been_changed = { "store" : set(self.ever_been_changed) }
@@ -496,7 +522,7 @@ class RollbackLog(renpy.object.Object):
             if self.rollback_limit:
                 nrbl = 0
 
-                for rb in self.log[-self.rollback_limit:]:
+                for rb in list(self.log)[-self.rollback_limit:]:
                     if rb.hard_checkpoint:
                         nrbl += 1
 
@@ -541,7 +567,7 @@ class RollbackLog(renpy.object.Object):
 
         # If the log is too long, prune it.
         while len(self.log) > renpy.config.rollback_length:
-            self.log.pop(0)
+            self.log.popleft()
 
         # check for the end of fixed rollback
         if len(self.log) >= 2:
@@ -572,6 +598,8 @@ class RollbackLog(renpy.object.Object):
         `new` ast node.
         """
 
+        self.load_history()
+
         for i in self.log:
             i.context.replace_node(old, new)
 
@@ -667,7 +695,7 @@ class RollbackLog(renpy.object.Object):
 
         reached_vars(roots, reachable, wait)
 
-        revlog = self.log[:]
+        revlog = list(self.log)
         revlog.reverse()
 
         for i in revlog:
@@ -779,7 +807,7 @@ class RollbackLog(renpy.object.Object):
         renpy.game.context().force_checkpoint = True
 
         if purge:
-            del self.log[:]
+            self.log.clear()
 
     def retain_after_load(self):
         """
@@ -876,6 +904,14 @@ class RollbackLog(renpy.object.Object):
         if checkpoints and (self.rollback_limit <= 0) and (not force):
             return
 
+        # Rolling back to the checkpoint the game was saved at only needs
+        # the entries that were loaded with the game, but anything further
+        # needs the history.
+        if checkpoints or greedy:
+            self.load_history()
+
+        rollback_limit = self.rollback_limit
+
         self.suspend_checkpointing(False)
         # will always rollback to before suspension
 
@@ -883,6 +919,8 @@ class RollbackLog(renpy.object.Object):
 
         revlog = [ ]
 
+        original_checkpoints = checkpoints
+
         # Find the place to roll back to.
         while self.log:
             rb = self.log.pop()
@@ -899,11 +937,20 @@ class RollbackLog(renpy.object.Object):
                     break
 
         else:
-            # Otherwise, just give up.
 
             revlog.reverse()
             self.log.extend(revlog)
 
+            # Look for a place to stop in the history, if it hasn't been
+            # loaded yet.
+            if self.history_loader is not None:
+                self.rollback_limit = rollback_limit
+                self.load_history()
+
+                return self.rollback(original_checkpoints, force=force, label=label, greedy=greedy, on_load=on_load, abnormal=abnormal, current_label=current_label)
+
+            # Otherwise, just give up.
+
             if force:
                 self.load_failed()
             else:
@@ -1014,6 +1061,9 @@ class RollbackLog(renpy.object.Object):
             if force_checkpoint:
                 renpy.game.contexts[0].force_checkpoint = True
 
+            # The current entry was rolled back, so there's nothing to
+            # share with.
+            self.current = None
             self.current = Rollback()
             self.current.context = renpy.game.contexts[0].rollback_copy()
 
@@ -1024,6 +1074,7 @@ class RollbackLog(renpy.object.Object):
 
         else:
 
+            self.current = None
             self.current = Rollback()
             self.current.context = renpy.game.context().rollback_copy()
 
@@ -1043,6 +1094,9 @@ class RollbackLog(renpy.object.Object):
         (called after the save is complete).
         """
 
+        # The history has to be loaded so it can be saved again.
+        self.load_history()
+
         # Purge unreachable objects, so we don't save them.
         self.complete(False)
         roots = self.get_roots()
@@ -1054,6 +1108,68 @@ class RollbackLog(renpy.object.Object):
 
         return roots
 
+    def split_history(self):
+        """
+        Splits the log for saving, after it's been frozen. Returns a (log,
+        history) tuple. The log is a copy of this object that only has the
+        rollback entries needed to load the game. The history is a list of
+        the older entries, which can be saved after the log, and loaded
+        the first time they're needed.
+        """
+
+        entries = list(self.log)
+
+        # Keep the entries back to the hard checkpoint before the current
+        # statement, which is as far as loading rolls back.
+        keep = 0
+
+        for rb in reversed(entries):
+            keep += 1
+
+            if (keep > 1) and rb.hard_checkpoint:
+                break
+
+        rv = copy.copy(self)
+        rv.log = collections.deque(entries[-keep:])
+
+        return rv, entries[:-keep]
+
+    def load_history(self):
+        """
+        Loads the history, the rollback entries that weren't loaded with the
+        rest of the game, if it hasn't been loaded already. Returns True if
+        the history was loaded, and False otherwise.
+
+        If the history can't be loaded, it's treated as empty, so rollback
+        stops at the oldest entry that was loaded.
+        """
+
+        loader = self.history_loader
+
+        if loader is None:
+            return False
+
+        self.history_loader = None
+
+        # Objects created while loading haven't been changed, and shouldn't
+        # be rolled back.
+        mutated = self.mutated
+        self.mutated = { }
+
+        try:
+            history = loader()
+        except Exception:
+            renpy.display.log.write("Could not load the rollback history:")
+            renpy.display.log.exception()
+            return False
+        finally:
+            self.mutated = mutated
+
+        self.log.extendleft(reversed(history))
+        self.identifier_cache = None
+
+        return True
+
     def discard_freeze(self):
         """
         Called to indicate that we will not be restoring from the
@@ -1136,4 +1252,10 @@ class RollbackLog(renpy.object.Object):
 
     def get_identifier_checkpoints(self, identifier):
         self.build_identifier_cache()
-        return self.identifier_cache.get(identifier, None)
+        rv = self.identifier_cache.get(identifier, None)
+
+        if (rv is None) and self.load_history():
+            self.build_identifier_cache()
+            rv = self.identifier_cache.get(identifier, None)
+
+        return rv
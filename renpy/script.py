@@ -33,6 +33,7 @@ import os
 import difflib
 import time
 import marshal
+import re
 import struct
 import zlib
 import sys
@@ -91,6 +92,56 @@ def collapse_stmts(stmts):
     return rv
 
 
+# Matches the start of a top-level statement that can be re-run when a file
+# is reloaded by itself.
+reloadable_statement_regex = re.compile(r'(?:label|image|transform)\b|define\s+(?:-?\d+\s+)?(?!config\.|gui\.)[\w.]+\s*=(?!=)')
+
+# Matches the start of a statement that runs at init time even when it's
+# inside a label, like a screen or define.
+nested_init_regex = re.compile(r'(?:init|python\s+early|define|default|image|transform|layeredimage|screen|style|translate|testcase)\b')
+
+
+def init_signature(data):
+    """
+    Returns a digest of the statements in the script `data`, a byte string,
+    that can't be re-run when the file is reloaded by itself. These are the
+    top-level statements that aren't labels, images, transforms, or simple
+    defines, and the statements inside labels that run at init time. If the
+    digest changes, the whole game needs to be reloaded.
+    """
+
+    md5 = hashlib.md5()
+
+    include = False
+
+    # The indentation of the init statement inside a label whose block is
+    # being included, or None if there isn't one.
+    nested = None
+
+    for l in data.decode("utf-8", "replace").splitlines():
+        l = l.rstrip()
+
+        stripped = l.lstrip()
+        indent = len(l) - len(stripped)
+
+        if l and l[0] not in " \t#":
+            include = not reloadable_statement_regex.match(l)
+            nested = None
+
+        elif (not include) and stripped and (stripped[0] != "#"):
+
+            if (nested is not None) and (indent <= nested):
+                nested = None
+
+            if (nested is None) and nested_init_regex.match(stripped):
+                nested = indent
+
+        if include or (nested is not None):
+            md5.update((l + "\n").encode("utf-8"))
+
+    return md5.digest()
+
+
 class Script(object):
     """
     This class represents a Ren'Py script, which is parsed out of a
@@ -131,6 +182,10 @@ class Script(object):
 
         self.namemap = { }
         self.all_stmts = [ ]
+
+        # A map from the full path of a .rpy file to its init_signature,
+        # used when the file is reloaded by itself.
+        self.init_signatures = { }
         self.all_pycode = [ ]
         self.all_pyexpr = [ ]
 
@@ -158,6 +213,10 @@ class Script(object):
         self.loaded_rpy = False
         self.backup_list = [ ]
 
+        # A map from the elided filename of each .rpy file that has been
+        # loaded to the digest of that file.
+        self.file_digests = { }
+
         self.duplicate_labels = [ ]
 
     def choose_backupdir(self):
@@ -547,6 +606,286 @@ class Script(object):
 
         return stmts
 
+    def reload_file(self, fn):
+        """
+        Reloads the .rpy file `fn` by itself, replacing its statements in
+        place. This is only possible if the file was loaded when the game
+        started, it parses without errors, and the only init code in it that
+        changed are top-level images, transforms, and simple defines. The
+        init code in the file that consists of those statements is then
+        re-run.
+
+        Returns True if the file was reloaded, or False if the whole game
+        needs to be reloaded.
+        """
+
+        fn = fn.replace("\\", "/")
+
+        signature = self.init_signatures.get(fn, None)
+
+        if signature is None:
+            return False
+
+        try:
+            with open(fn, "rb") as f:
+                data = f.read()
+        except Exception:
+            return False
+
+        if init_signature(data) != signature:
+            return False
+
+        filename = renpy.lexer.elide_filename(fn)
+
+        # The deferred errors found while loading the game are kept.
+        old_deferred_parse_errors = renpy.parser.deferred_parse_errors
+        renpy.parser.deferred_parse_errors = collections.defaultdict(list)
+
+        try:
+            stmts = renpy.parser.parse(fn, data.decode("utf-8", "python_strict"))
+        finally:
+            renpy.parser.deferred_parse_errors = old_deferred_parse_errors
+
+        if (stmts is None) or renpy.parser.parse_errors:
+            del renpy.parser.parse_errors[:]
+            return False
+
+        def node_order(n):
+            if isinstance(n.name, tuple):
+                return (n.linenumber, n.name[2:])
+            else:
+                return (n.linenumber, ())
+
+        old_all = [ i for i in self.namemap.values() if i.filename == filename ]
+        old_all.sort(key=node_order)
+
+        # Give unchanged statements the names they had before, so anything
+        # that refers to them by name now refers to the new statements. The
+        # translate statements are created from the names of the statements
+        # they contain, so they're left out.
+        old_stmts = [ i for i in old_all if not isinstance(i, (renpy.ast.Translate, renpy.ast.EndTranslate)) ]
+        new_stmts = collapse_stmts(stmts)
+
+        old_info = [ i.diff_info() for i in old_stmts ]
+        new_info = [ i.diff_info() for i in new_stmts ]
+
+        sm = difflib.SequenceMatcher(None, old_info, new_info)
+
+        # A list of (old, new) pairs of statements that were changed in place.
+        replaced = [ ]
+
+        for tag, i1, i2, j1, j2 in sm.get_opcodes():
+
+            if tag == "equal":
+                for old, new in zip(old_stmts[i1:i2], new_stmts[j1:j2]):
+                    if new.name is None:
+                        new.name = old.name
+
+            elif (tag == "replace") and (i2 - i1 == j2 - j1):
+                replaced.extend(zip(old_stmts[i1:i2], new_stmts[j1:j2]))
+
+        self.assign_names(stmts, filename)
+
+        translator = self.translator
+        translator_fn = os.path.normpath(os.path.abspath(fn))
+
+        # The state that reloading the file changes, so it can be put back if
+        # the reload fails part of the way through.
+        old_names = { i.name : i for i in old_all }
+        old_lines = { k : v for k, v in renpy.scriptedit.lines.items() if k[0] == filename }
+        old_default_translates = dict(translator.default_translates)
+        old_file_translates = translator.file_translates.get(translator_fn, None)
+        old_additional_strings = translator.additional_strings.get(translator_fn, None)
+        old_chain_worklist = list(translator.chain_worklist)
+        old_script_all_stmts = self.all_stmts
+        old_need_analysis = list(self.need_analysis)
+        old_define_statements = list(renpy.ast.define_statements)
+
+        new_all = [ ]
+
+        def restore():
+
+            for i in new_all:
+                if self.namemap.get(i.name, None) is i:
+                    del self.namemap[i.name]
+
+            self.namemap.update(old_names)
+
+            renpy.scriptedit.lines.update(old_lines)
+
+            translator.default_translates.clear()
+            translator.default_translates.update(old_default_translates)
+
+            if old_file_translates is None:
+                translator.file_translates.pop(translator_fn, None)
+            else:
+                translator.file_translates[translator_fn] = old_file_translates
+
+            if old_additional_strings is None:
+                translator.additional_strings.pop(translator_fn, None)
+            else:
+                translator.additional_strings[translator_fn] = old_additional_strings
+
+            # Chain translations of the dialogue back to the old statements.
+            identifiers = set(i.identifier for i in old_all if isinstance(i, renpy.ast.Translate))
+
+            translator.chain_worklist = old_chain_worklist
+            translator.chain_worklist.extend(k for k in translator.language_translates if k[0] in identifiers)
+            translator.chain_translates()
+
+            self.all_stmts = old_script_all_stmts
+            self.need_analysis = old_need_analysis
+            renpy.ast.define_statements[:] = old_define_statements
+
+        try:
+
+            # The lines of the file will be listed again when needed.
+            renpy.scriptedit.files.discard(filename)
+
+            for k in old_lines:
+                del renpy.scriptedit.lines[k]
+
+            # Remove the dialogue in the old file from the translator, so the
+            # new file gets the same identifiers.
+            for i in old_all:
+                if isinstance(i, renpy.ast.Translate) and (i.language is None):
+                    if translator.default_translates.get(i.identifier, None) is i:
+                        del translator.default_translates[i.identifier]
+
+            translator.file_translates.pop(translator_fn, None)
+            translator.additional_strings.pop(translator_fn, None)
+
+            self.static_transforms(stmts)
+
+            new_all[:] = collapse_stmts(stmts)
+
+            # A name that's defined twice, or in another file, is reported by
+            # a full reload.
+            new_names = set()
+
+            for i in new_all:
+                duplicate = i.name in new_names
+                new_names.add(i.name)
+
+                if not duplicate and ((i.name in old_names) or (i.name not in self.namemap)):
+                    continue
+
+                if isinstance(i.name, basestring) and renpy.config.allow_duplicate_labels:
+                    continue
+
+                restore()
+                return False
+
+            if self.all_stmts is not None:
+                self.all_stmts = [ i for i in self.all_stmts if i.filename != filename ]
+
+            self.finish_load(stmts, [ ], check_names=False)
+
+            # Chain translations of the dialogue in the file to the new
+            # statements.
+            identifiers = set(i.identifier for i in new_all if isinstance(i, renpy.ast.Translate))
+
+            for identifier, language in translator.language_translates:
+                if identifier in identifiers:
+                    translator.chain_worklist.append((identifier, language))
+
+            translator.chain_translates()
+
+            # Re-run the init code that consists of images, transforms, and
+            # simple defines.
+            def reloadable(node):
+                if isinstance(node, (renpy.ast.Image, renpy.ast.Transform)):
+                    return True
+
+                if isinstance(node, renpy.ast.Define):
+                    return (node.operator == "=") and (node.index is None) and (node.store not in ("store.config", "store.gui"))
+
+                return False
+
+            inits = [ i for i in stmts if isinstance(i, renpy.ast.Init) and all(reloadable(j) for j in i.block) ]
+            inits.sort(key=lambda i : i.priority)
+
+            renpy.ast.define_statements[:] = [ i for i in renpy.ast.define_statements if i.filename != filename ]
+
+            self.analyze()
+
+            context = renpy.game.context()
+            init_phase = context.init_phase
+            next_node = context.next_node
+
+            try:
+                context.init_phase = True
+
+                for i in inits:
+                    for j in i.block:
+                        j.execute()
+
+            finally:
+                context.init_phase = init_phase
+                context.next_node = next_node
+
+            renpy.atl.compile_all()
+
+        except Exception:
+            restore()
+            raise
+
+        # The variables that were just defined are part of the clean store,
+        # so they aren't rolled back, saved, or reported as changed.
+        names = collections.defaultdict(list)
+
+        for i in inits:
+            for j in i.block:
+                if isinstance(j, (renpy.ast.Define, renpy.ast.Transform)):
+                    names[j.store].append(j.varname)
+
+        for k, v in names.items():
+            renpy.python.clean_store_names(k, v)
+
+        # The statements that were changed in place, including the translate
+        # statements around them.
+        for old, new in list(replaced):
+            if not (isinstance(old.name, tuple) and isinstance(new.name, tuple)):
+                continue
+
+            for suffix in [ ("translate",), ("end_translate",) ]:
+                old_node = self.namemap.get(old.name + suffix, None)
+                new_node = self.namemap.get(new.name + suffix, None)
+
+                if (old_node is not None) and (new_node is not None):
+                    replaced.append((old_node, new_node))
+
+        # A map from the id of an old statement to the statement that
+        # replaces it.
+        moved = { }
+
+        for old in old_all:
+            new = self.namemap.get(old.name, None)
+
+            if (new is not None) and (new is not old):
+                moved[id(old)] = new
+
+        for old, new in replaced:
+            moved[id(old)] = new
+
+            for i in renpy.game.contexts:
+                i.replace_node(old, new)
+
+            renpy.game.log.replace_node(old, new)
+
+        # Statements that are about to run continue with the new statements.
+        for i in renpy.game.contexts:
+            if i.next_node is not None:
+                i.next_node = moved.get(id(i.next_node), i.next_node)
+
+        # The names of statements that were deleted or replaced are gone, so
+        # they can't be jumped to, or matched by the next reload.
+        for name, old in old_names.items():
+            if self.namemap.get(name, None) is old:
+                del self.namemap[name]
+
+        return True
+
     def write_rpyc_header(self, f):
         """
         Writes an empty version 2 .rpyc header to the open binary file `f`.
@@ -816,7 +1155,12 @@ class Script(object):
                 source, rpyfn = rpyfns[0]
 
                 with open(rpyfn, "rb") as f:
-                    rpydigest = hashlib.md5(f.read()).digest()
+                    rpydata = f.read()
+
+                rpydigest = hashlib.md5(rpydata).digest()
+
+                if renpy.autoreload and rpyfn.endswith(".rpy"):
+                    self.init_signatures[rpyfn.replace("\\", "/")] = init_signature(rpydata)
             else:
                 source = source_extensions[-1]
                 rpyfn = dir + "/" + fn + source_extensions[-1]
@@ -879,6 +1223,7 @@ class Script(object):
 
             if digest is not None:
                 self.backup_list.append((rpyfn, digest))
+                self.file_digests[renpy.lexer.elide_filename(rpyfn)] = digest
 
         if data is None:
             raise Exception("Could not load file %s." % lastfn) # type: ignore
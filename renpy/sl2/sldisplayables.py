@@ -387,6 +387,8 @@ DisplayableParser("vpgrid", sl2vpgrid, "vpgrid", many, replaces=True, pass_conte
 Keyword("rows")
 Keyword("cols")
 Keyword("allow_underfull")
+Keyword("item_count")
+Keyword("item_function")
 Keyword("child_size")
 Keyword("mousewheel")
 Keyword("arrowkeys")
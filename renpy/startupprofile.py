@@ -0,0 +1,184 @@
+# Copyright 2004-2023 Tom Rothamel <pytom@bishoujo.us>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# This file implements --profile-startup, which records how long it takes
+# to import each module, and how long each phase of startup reported by
+# renpy.main.log_clock takes, and then writes it out as JSON.
+
+from __future__ import division, absolute_import, with_statement, print_function, unicode_literals
+from renpy.compat import PY2, basestring, bchr, bord, chr, open, pystr, range, round, str, tobytes, unicode # *
+
+import atexit
+import json
+import sys
+import threading
+import time
+
+import renpy
+
+if PY2:
+    import __builtin__ as builtins # type: ignore
+else:
+    import builtins
+
+clock = getattr(time, "perf_counter", time.time)
+
+# True if the startup profile is being recorded.
+enabled = False
+
+# The file the profile is written to, or "-" to write it to stdout.
+filename = None
+
+# The root of the tree of imports. Each node is a dict with the name of
+# the module, the time taken to import it, and the nodes for the modules
+# imported while it was being imported.
+root = { "name" : "", "time" : 0.0, "children" : [ ] }
+
+# The nodes for the imports in progress.
+stack = [ root ]
+
+# A list of (phase, seconds) tuples, from log_clock.
+phases = [ ]
+
+# The import function that was replaced.
+real_import = None
+
+# The thread imports are profiled on.
+main_thread = None
+
+# Has the profile been written?
+written = False
+
+
+def profiled_import(name, globals=None, locals=None, fromlist=(), level=0): # @ReservedAssignment
+    """
+    Replaces __import__, timing imports of modules that haven't been
+    imported yet.
+    """
+
+    if level or (name in sys.modules) or (threading.current_thread() is not main_thread):
+        return real_import(name, globals, locals, fromlist, level)
+
+    node = { "name" : name, "time" : 0.0, "children" : [ ] }
+
+    stack[-1]["children"].append(node)
+    stack.append(node)
+
+    start = clock()
+
+    try:
+        return real_import(name, globals, locals, fromlist, level)
+    finally:
+        node["time"] = clock() - start
+        stack.pop()
+
+
+def start(fn):
+    """
+    Starts profiling imports, with the profile written to `fn`.
+    """
+
+    global enabled
+    global filename
+    global real_import
+    global main_thread
+
+    if enabled:
+        return
+
+    enabled = True
+    filename = fn
+
+    main_thread = threading.current_thread()
+
+    real_import = builtins.__import__
+    builtins.__import__ = profiled_import
+
+    atexit.register(write)
+
+
+def end_imports():
+    """
+    Stops profiling imports.
+    """
+
+    if not enabled:
+        return
+
+    if builtins.__import__ is profiled_import:
+        builtins.__import__ = real_import
+
+    root["time"] = sum(i["time"] for i in root["children"])
+
+
+def phase(name, seconds):
+    """
+    Records that the startup phase `name` took `seconds`.
+    """
+
+    if enabled:
+        phases.append((name, seconds))
+
+
+def finish_tree(node):
+    """
+    Returns a copy of `node` with the time taken by the module itself,
+    excluding the modules it imports, added.
+    """
+
+    children = [ finish_tree(i) for i in node["children"] ]
+
+    return {
+        "name" : node["name"],
+        "time" : round(node["time"], 6),
+        "self" : round(max(0.0, node["time"] - sum(i["time"] for i in node["children"])), 6),
+        "children" : children,
+        }
+
+
+def write():
+    """
+    Writes the profile out, if it hasn't been written already.
+    """
+
+    global written
+
+    if (not enabled) or written:
+        return
+
+    written = True
+
+    end_imports()
+
+    data = {
+        "imports" : finish_tree(root),
+        "phases" : [ { "name" : n, "time" : round(t, 6) } for n, t in phases ],
+        }
+
+    s = str(json.dumps(data, indent=1))
+
+    if filename == "-":
+        renpy.log.real_stdout.write(s + "\n")
+        return
+
+    with open(filename, "w") as f:
+        f.write(s + "\n")
+
@@ -120,6 +120,10 @@ cdef class StyleCore:
     cdef StyleCore down_parent
     cdef StyleCore left_parent
 
+    # A copy of self.properties, taken when this style was last built. This
+    # is used to tell if the style needs to be rebuilt.
+    cdef list built_properties
+
     # This is a map from prefixed style property to its value, or NULL if
     # the prefixed style property is not defined by this style.
     #
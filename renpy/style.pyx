@@ -674,6 +674,8 @@ cpdef build_style(StyleCore s):
 
     try:
 
+        s.built_properties = copy_properties(s.properties)
+
         # Find our parents.
         if s.parent is not None:
             s.down_parent = get_full_style(s.parent)
@@ -732,10 +734,41 @@ cpdef unbuild_style(StyleCore s):
 
     s.left_parent = None
     s.down_parent = None
+    s.built_properties = None
 
     s.built = False
     s.building = False
 
+cdef bint style_changed(StyleCore s):
+    """
+    Returns true if `s` has changed since it was last built, either because
+    its properties have changed, or because its parents now refer to
+    different style objects.
+    """
+
+    if not s.built:
+        return True
+
+    try:
+
+        if s.properties != s.built_properties:
+            return True
+
+        if s.parent is not None:
+            if s.down_parent is not get_full_style(s.parent):
+                return True
+        elif s.down_parent is not None:
+            return True
+
+        if s.name is not None and len(s.name) > 1:
+            if s.left_parent is not get_full_style(s.name[:-1]):
+                return True
+
+    except Exception:
+        return True
+
+    return False
+
 ################################################################################
 # Inspect support
 ################################################################################
@@ -777,28 +810,52 @@ def reset():
 
 def build_styles():
     """
-    Builds or rebuilds all styles.
+    Builds all styles, rebuilding only the styles that have changed since
+    they were last built. Returns the number of styles that were rebuilt.
     """
+
+    cdef StyleCore s
+
     for i in renpy.config.build_styles_callbacks:
         i()
 
+    changed = 0
+
     for s in list(styles.values()):
-        unbuild_style(s)
+        if style_changed(s):
+            unbuild_style(s)
+            changed += 1
 
     for s in list(styles.values()):
         build_style(s)
 
+    return changed
+
 def rebuild(prepare_screens=True):
     """
-    Rebuilds all styles.
+    Rebuilds the styles that have changed.
+
+    `prepare_screens`
+        If true, screens are prepared again, as they may contain constants
+        that depend on the store. If false, only caches of things that
+        depend on styles are cleared, and only if a style changed.
     """
 
-    build_styles()
+    changed = build_styles()
+
+    if prepare_screens:
+
+        renpy.display.screen.prepared = False
+
+        if not renpy.game.context().init_phase:
+            renpy.display.screen.prepare_screens()
 
-    renpy.display.screen.prepared = False
+    elif changed:
 
-    if not renpy.game.context().init_phase:
-        renpy.display.screen.prepare_screens()
+        # Displayables in the screen caches are reused, so drop what was
+        # laid out and rendered with the old style properties.
+        renpy.text.text.layout_cache_clear()
+        renpy.display.render.render_cache.clear()
 
     renpy.exports.restart_interaction()
 
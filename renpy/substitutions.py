@@ -31,6 +31,12 @@ import renpy
 import string
 import os
 
+if PY2:
+    def field_name_split(field_name):
+        return field_name._formatter_field_name_split()
+else:
+    from _string import formatter_field_name_split as field_name_split # type: ignore
+
 update_translations = "RENPY_UPDATE_TRANSLATIONS" in os.environ
 
 
@@ -175,12 +181,26 @@ class Formatter(string.Formatter):
         if conversion is None:
             return value
 
+        self.check_conversion(conversion)
+
+        return self.apply_conversion(value, conversion, kwargs)
+
+    def check_conversion(self, conversion):
+        """
+        Raises ValueError if `conversion` isn't a valid conversion specifier.
+        """
+
         if not conversion:
             raise ValueError("Conversion specifier can't be empty.")
 
         if set(conversion) - set("rstqulci!"):
             raise ValueError("Unknown symbols in conversion specifier, this must use only the \"rstqulci\".")
 
+    def apply_conversion(self, value, conversion, kwargs):
+        """
+        Applies the already-checked `conversion` to `value`.
+        """
+
         if "r" in conversion:
             value = repr(value)
             conversion = conversion.replace("r", "")
@@ -219,9 +239,149 @@ class Formatter(string.Formatter):
         return value
 
 
+    def compile(self, s):
+        """
+        Parses `s` into a Template, or returns None if `s` uses a feature
+        that Template doesn't handle, in which case vformat should be used.
+        """
+
+        segments = [ ]
+
+        for literal, field_name, format_spec, conversion in self.parse(s):
+
+            if literal:
+                segments.append(literal)
+
+            if field_name is None:
+                continue
+
+            first, rest = field_name_split(field_name)
+
+            if not isinstance(first, basestring) or not first:
+                return None
+
+            rest = tuple(rest)
+
+            if conversion is not None:
+                self.check_conversion(conversion)
+
+            if format_spec and ("[" in format_spec):
+                spec_template = self.compile(format_spec)
+
+                if spec_template is None:
+                    return None
+
+            else:
+                spec_template = None
+
+            segments.append((first, rest, format_spec, conversion, spec_template))
+
+        return Template(segments)
+
+    def vformat(self, format_string, args, kwargs):
+
+        if args:
+            return super(Formatter, self).vformat(format_string, args, kwargs)
+
+        return get_template(format_string).format(kwargs)
+
+
+class Template(object):
+    """
+    A string that has been parsed according to Ren'Py's formatting rules,
+    so that it can be formatted repeatedly without being parsed again.
+
+    `segments`
+        A list of segments. Each is either a literal string, or a
+        (first, rest, format_spec, conversion, spec_template) tuple
+        describing a field, where first is the name looked up in the scope,
+        rest is a tuple of (is_attr, key) pairs applied to it in turn,
+        and spec_template is a Template if the format spec itself contains
+        fields.
+    """
+
+    __slots__ = [ "segments" ]
+
+    def __init__(self, segments):
+        self.segments = segments
+
+    def format(self, kwargs):
+
+        rv = [ ]
+
+        for seg in self.segments:
+
+            if isinstance(seg, basestring):
+                rv.append(seg)
+                continue
+
+            first, rest, format_spec, conversion, spec_template = seg
+
+            value = kwargs[first]
+
+            for is_attr, key in rest:
+                if is_attr:
+                    value = getattr(value, key)
+                else:
+                    value = value[key]
+
+            if conversion is not None:
+                value = formatter.apply_conversion(value, conversion, kwargs)
+
+            if spec_template is not None:
+                format_spec = spec_template.format(kwargs)
+
+            rv.append(format(value, format_spec))
+
+        return "".join(rv)
+
+
 # The instance of Formatter we use.
 formatter = Formatter()
 
+# The maximum number of templates that are kept in template_cache.
+TEMPLATE_CACHE_SIZE = 1024
+
+# A map from a string to the Template for that string. The most recently
+# used templates are at the end.
+template_cache = { }
+
+
+def get_template(s):
+    """
+    Returns a Template for `s`, using the cache if possible. If `s` can't be
+    compiled, returns an object that formats it with the base Formatter.
+    """
+
+    rv = template_cache.pop(s, None)
+
+    if rv is None:
+        rv = formatter.compile(s)
+
+        if rv is None:
+            rv = Uncompiled(s)
+
+        if len(template_cache) >= TEMPLATE_CACHE_SIZE:
+            del template_cache[next(iter(template_cache))]
+
+    template_cache[s] = rv
+
+    return rv
+
+
+class Uncompiled(object):
+    """
+    Stands in for a Template for strings that can't be compiled.
+    """
+
+    __slots__ = [ "s" ]
+
+    def __init__(self, s):
+        self.s = s
+
+    def format(self, kwargs):
+        return string.Formatter.vformat(formatter, self.s, (), kwargs)
+
 
 class MultipleDict(object):
 
@@ -275,7 +435,7 @@ def substitute(s, scope=None, force=False, translate=True):
         kwargs = renpy.store.__dict__ # @UndefinedVariable
 
     try:
-        s = formatter.vformat(s, (), kwargs) # type: ignore
+        s = get_template(s).format(kwargs)
     except Exception:
         if renpy.display.predict.predicting: # @UndefinedVariable
             return " ", True
@@ -986,6 +986,91 @@ def detect_user_locale():
     return language, region
 
 
+################################################################################
+# Transforming text
+################################################################################
+
+
+def generic_filter(s, function):
+    """
+    :doc: text_utility
+
+    Transforms `s`, while leaving text tags and interpolation the same.
+
+    `function`
+        A function that is called with strings corresponding to runs of
+        text, and should return a second string that replaces that run
+        of text.
+
+    ::
+
+        init python:
+            def upper(s):
+                return s.upper()
+
+        $ upper_string = renpy.transform_text("{b}Not Upper{/b}", upper)
+
+    """
+
+    def remove_special(s, start, end, process):
+
+        # A count of the number of special characters we've seen.
+        specials = 0
+
+        # The return value of the function.
+        rv = ""
+
+        # If specials == 0, the norma l
+        buf = ""
+
+        for i in s:
+
+            if i == start:
+
+                # Handle the case where there is a duplicate start.
+                if i == buf and specials:
+                    rv += buf + i
+                    specials = 0
+                    buf = ""
+                    continue
+
+                if specials == 0:
+                    rv += process(buf)
+                    buf = ""
+
+                buf += i
+                specials += 1
+
+            elif i == end and specials:
+
+                buf += i
+                specials -= 1
+
+                if specials == 0:
+                    rv += buf
+                    buf = ""
+
+            else:
+                buf += i
+
+        if buf:
+            if specials == 0:
+                rv += process(buf)
+            else:
+                rv += buf
+
+        return rv
+
+    def remove_braces(s):
+        return remove_special(s, "{", "}", function)
+
+    return remove_special(s, "[", "]", remove_braces)
+
+
+def __getattr__(name):
+    return renpy.lazy_getattr(__name__, name)
+
+
 # Generated by scripts/relative_imports.py, do not edit below this line.
 if 1 == 0:
     from . import dialogue
@@ -0,0 +1,177 @@
+#@PydevCodeAnalysisIgnore
+import unittest
+
+import os
+import random
+import re
+import shutil
+import tempfile
+import threading
+
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import renpy
+renpy.import_all()
+
+from renpy.chunking import make_delta, read_index, apply_delta, URLFetcher
+
+
+class DataHandler(BaseHTTPRequestHandler):
+    """
+    Serves the server's data, honoring Range headers if the server's
+    ranges field is true.
+    """
+
+    def do_GET(self):
+
+        if self.path != "/new.data":
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        data = self.server.data
+        self.server.requests.append(self.headers.get("Range"))
+
+        m = re.match(r"bytes=(\d+)-(\d+)$", self.headers.get("Range", ""))
+
+        if self.server.ranges and m:
+            start = int(m.group(1))
+            end = int(m.group(2)) + 1
+
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes {}-{}/{}".format(start, end - 1, len(data)))
+            data = data[start:end]
+
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        return
+
+
+class TestChunking(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+        rng = random.Random(42)
+
+        def block(n):
+            return bytes(bytearray(rng.getrandbits(8) for _i in range(n)))
+
+        a = block(400000)
+        b = block(400000)
+        c = block(400000)
+
+        # The old file, and a new file with data inserted and replaced.
+        self.old = self.write("old", a + b + c)
+        self.new_data = a + block(5000) + b + block(300000)
+        self.new = self.write("new", self.new_data)
+
+        self.index_fn = os.path.join(self.dir, "new.chunks")
+        self.data_fn = os.path.join(self.dir, "new.data")
+
+        make_delta(self.new, self.index_fn, self.data_fn)
+
+        with open(self.index_fn, "rb") as f:
+            self.index = read_index(f.read())
+
+        with open(self.data_fn, "rb") as f:
+            self.data = f.read()
+
+        self.server = HTTPServer(("127.0.0.1", 0), DataHandler)
+        self.server.data = self.data
+        self.server.requests = [ ]
+        self.server.ranges = True
+
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+        self.url = "http://127.0.0.1:{}/new.data".format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+        shutil.rmtree(self.dir)
+
+    def write(self, name, data):
+        fn = os.path.join(self.dir, name)
+
+        with open(fn, "wb") as f:
+            f.write(data)
+
+        return fn
+
+    def read(self, fn):
+        with open(fn, "rb") as f:
+            return f.read()
+
+    def test_index(self):
+
+        self.assertEqual(sum(i[3] for i in self.index), len(self.new_data))
+        self.assertEqual(sum(i[2] for i in set(self.index)), len(self.data))
+
+    def test_ranges(self):
+
+        out = os.path.join(self.dir, "out")
+        progress = [ ]
+
+        fetched = apply_delta(self.index, [ self.old ], out, URLFetcher(self.url), progress.append)
+
+        self.assertEqual(self.read(out), self.new_data)
+        self.assertFalse(os.path.exists(out + ".chunks"))
+
+        # Only the chunks that changed are downloaded, one range at a time.
+        self.assertTrue(0 < fetched < len(self.data))
+        self.assertTrue(all(i is not None for i in self.server.requests))
+
+        self.assertEqual(progress[-1], 1.0)
+        self.assertEqual(progress, sorted(progress))
+
+    def test_whole_file(self):
+
+        self.server.ranges = False
+
+        out = os.path.join(self.dir, "out")
+
+        apply_delta(self.index, [ self.old ], out, URLFetcher(self.url))
+
+        self.assertEqual(self.read(out), self.new_data)
+
+        # The data file is downloaded once, then used for every range.
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_no_sources(self):
+
+        out = os.path.join(self.dir, "out")
+
+        fetched = apply_delta(self.index, [ ], out, URLFetcher(self.url))
+
+        self.assertEqual(self.read(out), self.new_data)
+        self.assertEqual(fetched, len(self.data))
+
+    def test_unchanged(self):
+
+        out = os.path.join(self.dir, "out")
+
+        fetched = apply_delta(self.index, [ self.new ], out, URLFetcher(self.url))
+
+        self.assertEqual(self.read(out), self.new_data)
+        self.assertEqual(fetched, 0)
+        self.assertEqual(self.server.requests, [ ])
+
+    def test_error(self):
+
+        fetcher = URLFetcher(self.url.replace("new.data", "missing.data"))
+        self.assertIsNone(fetcher(0, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
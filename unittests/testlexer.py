@@ -0,0 +1,280 @@
+#@PydevCodeAnalysisIgnore
+import unittest
+
+import os
+import re
+
+import renpy
+renpy.import_all()
+
+from renpy.lexer import ParseError, match_logical_word
+from renpy.lexersupport import split_logical_lines
+from renpy.scriptedit import Line
+
+# The root of the Ren'Py tree.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PREFIX = "_m1_test__"
+
+
+def munge(s):
+
+    def munge_string(m):
+        brackets = m.group(1)
+
+        if (len(brackets) & 1) == 0:
+            return m.group(0)
+
+        if "__" in m.group(2):
+            return m.group(0)
+
+        return brackets + PREFIX + m.group(2)
+
+    return re.sub(r'(\.|\[+)__(\w+)', munge_string, s)
+
+
+def old_split_logical_lines(data, pos, filename, original_filename, number, lines, prefix, munge):
+    """
+    The splitter from list_logical_lines before it was moved into
+    lexersupport, taking the same arguments as split_logical_lines.
+    """
+
+    rv = []
+
+    len_data = len(data)
+
+    line = 0
+    start_number = 0
+
+    while pos < len_data:
+
+        start_number = number
+
+        line = [ ]
+
+        parendepth = 0
+
+        loc = (filename, start_number)
+        lines[loc] = Line(original_filename, start_number, pos)
+
+        endpos = None
+
+        while pos < len_data:
+
+            startpos = pos
+            c = data[pos]
+
+            if c == u'\t':
+                raise ParseError(filename, number, "Tab characters are not allowed in Ren'Py scripts.")
+
+            if c == u'\n' and not parendepth:
+
+                line = ''.join(line)
+
+                if not re.match(r"^\s*$", line):
+                    rv.append((filename, start_number, line))
+
+                if endpos is None:
+                    endpos = pos
+
+                lines[loc].end_delim = endpos + 1
+
+                while data[endpos - 1] in u' \r':
+                    endpos -= 1
+
+                lines[loc].end = endpos
+                lines[loc].text = data[lines[loc].start:lines[loc].end]
+                lines[loc].full_text = data[lines[loc].start:lines[loc].end_delim]
+
+                pos += 1
+                number += 1
+                endpos = None
+                line = [ ]
+                break
+
+            if c == u'\n':
+                number += 1
+                endpos = None
+
+            if c == u"\r":
+                pos += 1
+                continue
+
+            if c == u"\\" and data[pos + 1] == u"\n":
+                pos += 2
+                number += 1
+                line.append(u"\\\n")
+                continue
+
+            if c in u'([{':
+                parendepth += 1
+
+            if (c in u'}])') and parendepth:
+                parendepth -= 1
+
+            if c == u'#':
+                endpos = pos
+
+                while data[pos] != u'\n':
+                    pos += 1
+
+                continue
+
+            if c in u'"\'`':
+                delim = c
+                line.append(c)
+                pos += 1
+
+                escape = False
+                triplequote = False
+
+                if (pos < len_data - 1) and (data[pos] == delim) and (data[pos + 1] == delim):
+                    line.append(delim)
+                    line.append(delim)
+                    pos += 2
+                    triplequote = True
+
+                s = [ ]
+
+                while pos < len_data:
+
+                    c = data[pos]
+
+                    if c == u'\n':
+                        number += 1
+
+                    if c == u'\r':
+                        pos += 1
+                        continue
+
+                    if escape:
+                        escape = False
+                        pos += 1
+                        s.append(c)
+                        continue
+
+                    if c == delim:
+
+                        if not triplequote:
+                            pos += 1
+                            s.append(c)
+                            break
+
+                        if (pos < len_data - 2) and (data[pos + 1] == delim) and (data[pos + 2] == delim):
+                            pos += 3
+                            s.append(delim)
+                            s.append(delim)
+                            s.append(delim)
+                            break
+
+                    if c == u'\\':
+                        escape = True
+
+                    s.append(c)
+                    pos += 1
+
+                    continue
+
+                s = "".join(s)
+
+                if "[__" in s:
+                    s = munge(s)
+
+                line.append(s)
+
+                continue
+
+            word, magic, end = match_logical_word(data, pos)
+
+            if magic:
+
+                rest = word[2:]
+
+                if u"__" not in rest:
+                    word = prefix + rest
+
+            line.append(word)
+            pos = end
+
+            if (pos - startpos) > 65536:
+                raise ParseError(filename, start_number, "Overly long logical line. (Check strings and parenthesis.)", line=line, first=True)
+
+    if line:
+        raise ParseError(filename, start_number, "is not terminated with a newline. (Check strings and parenthesis.)", line=line, first=True)
+
+    return rv
+
+
+class TestSplitLogicalLines(unittest.TestCase):
+
+    def split(self, function, data):
+        """
+        Splits `data` with `function`. Returns the logical lines and the
+        state of the Line objects, or the message of the error raised.
+        """
+
+        lines = { }
+
+        try:
+            rv = function(data + "\n\n", 0, "test.rpy", "game/test.rpy", 1, lines, PREFIX, munge)
+        except ParseError as e:
+            return e.message
+
+        lines = { k : (v.filename, v.number, v.start, v.end, v.end_delim, v.text, v.full_text) for k, v in lines.items() }
+
+        return rv, lines
+
+    def check(self, data):
+        self.assertEqual(self.split(split_logical_lines, data), self.split(old_split_logical_lines, data), data[:200])
+
+    def test_examples(self):
+
+        for data in [
+                "",
+                "label start:\n    e \"Hello, world.\"\n    return\n",
+                "# A comment.\n\n   \nlabel a: # Another.\n    pass\n",
+                "$ a = (1,\n    2, # comment\n    3)\n",
+                "$ a = [ { 'b' : (1, 2) } ]\n",
+                "$ a = 1 + \\\n    2\n",
+                "e \"She said \\\"hi\\\".\"\n",
+                "e 'It''s'\n",
+                "$ a = \"\"\"One\nTwo\n\"Three\"\n\"\"\"\n",
+                "$ a = '''x''' + `y`\n",
+                "e \"[__private] [[__not] [[[__yes] [a.__b]\"\n",
+                "$ __private = __a__b + __c\n",
+                "label start:\r\n    e \"Windows.\"\r\n",
+                "e \"Unicode é中文 \U0001f600.\"\n",
+                "$ a = ')' + \"(\"\n",
+                "$ a = (1))\n",
+                "label start:\n\te \"Tab.\"\n",
+                "$ a = (1,\n",
+                "e \"Unterminated\n",
+                "$ a = '" + "x" * 70000 + "'\n",
+                ]:
+
+            self.check(data)
+
+    def test_tree(self):
+
+        count = 0
+
+        for directory in [ "renpy/common", "launcher/game", "tutorial/game", "the_question/game" ]:
+            for dirpath, _dirnames, filenames in os.walk(os.path.join(ROOT, directory)):
+                for fn in filenames:
+                    if not fn.endswith(".rpy"):
+                        continue
+
+                    with open(os.path.join(dirpath, fn), "rb") as f:
+                        data = f.read().decode("utf-8")
+
+                    if data.startswith(u"\ufeff"):
+                        data = data[1:]
+
+                    self.check(data)
+                    count += 1
+
+        self.assertTrue(count > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
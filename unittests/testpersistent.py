@@ -0,0 +1,223 @@
+#@PydevCodeAnalysisIgnore
+import unittest
+
+from unittest import mock
+
+import renpy
+renpy.import_all()
+
+from renpy.compat.pickle import dumps, loads, PROTOCOL
+from renpy.persistent import NameTable, Persistent, Record, SeenSet, decode_seen_set, dump_records, update_record
+
+
+class TestRecords(unittest.TestCase):
+
+    def test_update_record(self):
+
+        records = { }
+
+        self.assertTrue(update_record(records, "a", [ 1, 2, 3 ]))
+        self.assertFalse(update_record(records, "a", [ 1, 2, 3 ]))
+        self.assertTrue(update_record(records, "a", [ 1, 2, 3, 4 ]))
+
+        self.assertEqual(loads(records["a"].pickled), [ 1, 2, 3, 4 ])
+
+    def test_equal_sets(self):
+
+        records = { }
+
+        a = set(range(0, 1000, 7))
+        b = set(reversed(sorted(a)))
+
+        update_record(records, "a", a)
+        self.assertFalse(update_record(records, "a", b))
+
+    def test_default_protocol(self):
+
+        records = { }
+        update_record(records, "a", { "b" : 1 })
+
+        # Protocol 2 pickles start with PROTO 2, so they can be read by
+        # Ren'Py 7.
+        self.assertEqual(records["a"].pickled[:2], b"\x80" + bytes(bytearray([ PROTOCOL ])))
+
+    def test_snapshot(self):
+
+        records = { }
+
+        seen = SeenSet([ "start" ])
+
+        update_record(records, "a", 1)
+        update_record(records, "seen", seen)
+
+        # Fields of these types are compared without pickling them.
+        with mock.patch("renpy.persistent.dumps", side_effect=AssertionError):
+            self.assertFalse(update_record(records, "a", 1))
+            self.assertFalse(update_record(records, "seen", seen))
+
+        self.assertTrue(update_record(records, "a", True))
+        self.assertTrue(update_record(records, "a", 2))
+
+        seen.add("ending")
+        self.assertTrue(update_record(records, "seen", seen))
+        self.assertFalse(update_record(records, "seen", seen))
+
+    def test_unpicklable(self):
+
+        p = Persistent()
+        p._clear()
+        p.a = 1
+
+        old_persistent = renpy.game.persistent
+        old_developer = renpy.config.developer
+        old_records = dict(renpy.persistent.records)
+
+        try:
+            renpy.game.persistent = p
+            renpy.config.developer = False
+
+            renpy.persistent.records.clear()
+            renpy.persistent.find_changes()
+            self.assertIn("a", renpy.persistent.records)
+
+            p.a = lambda : None
+
+            with mock.patch("renpy.display.log.write"), mock.patch("renpy.display.log.exception") as exception:
+                self.assertTrue(renpy.persistent.find_changes())
+
+            # The old value isn't saved in place of the new one.
+            self.assertNotIn("a", renpy.persistent.records)
+            self.assertTrue(exception.called)
+
+        finally:
+            renpy.game.persistent = old_persistent
+            renpy.config.developer = old_developer
+
+            renpy.persistent.records.clear()
+            renpy.persistent.records.update(old_records)
+
+    def test_dump_records(self):
+
+        p = Persistent()
+        p._clear()
+
+        p.a = [ 1, 2, 3 ]
+        p.b = { "c" : 4 }
+
+        records = { }
+        update_record(records, "a", p.a)
+
+        data = dump_records(p, records)
+        self.assertEqual(data[:2], b"\x80" + bytes(bytearray([ PROTOCOL ])))
+
+        loaded = loads(data)
+
+        self.assertIsInstance(loaded, Persistent)
+        self.assertEqual(loaded.a, [ 1, 2, 3 ])
+        self.assertEqual(loaded.b, { "c" : 4 })
+
+        self.assertIsInstance(records["a"], Record)
+        self.assertNotIn("b", records)
+
+
+class TestSeenSet(unittest.TestCase):
+
+    names = [ ("game/script.rpy", 1, i) for i in range(20) ] + [ "start", "ending" ]
+
+    def test_name_table(self):
+
+        t = NameTable()
+
+        self.assertEqual(t.intern("a"), 0)
+        self.assertEqual(t.intern("b"), 1)
+        self.assertEqual(t.intern("a"), 0)
+        self.assertEqual(t.names, [ "a", "b" ])
+
+    def test_set(self):
+
+        s = SeenSet(self.names[:10])
+
+        self.assertEqual(len(s), 10)
+        self.assertIn(self.names[0], s)
+        self.assertNotIn(self.names[10], s)
+
+        s[self.names[10]] = True
+        del s[self.names[0]]
+
+        self.assertEqual(set(s), set(self.names[1:11]))
+        self.assertEqual(s, dict.fromkeys(self.names[1:11], True))
+
+    def setUp(self):
+        self.old_dicts = renpy.config.persistent_seen_dicts
+
+    def tearDown(self):
+        renpy.config.persistent_seen_dicts = self.old_dicts
+
+    def test_encode(self):
+
+        names = self.names + [ ("game/other.rpy", 2, 100), ("game/other.rpy", 2, 117), ("game/script.rpy", 1, 0, "translate") ]
+        s = SeenSet(names)
+
+        runs, other = s.encode()
+
+        self.assertEqual(sorted(runs), [
+            ("game/other.rpy", 2, 100, b"\x01\x00\x02"),
+            ("game/script.rpy", 1, 0, b"\xff\xff\x0f"),
+            ])
+
+        self.assertEqual(set(other), set([ "start", "ending", ("game/script.rpy", 1, 0, "translate") ]))
+
+        self.assertEqual(decode_seen_set(runs, other), s)
+
+    def test_pickle(self):
+
+        renpy.config.persistent_seen_dicts = False
+
+        s = SeenSet(self.names)
+
+        data = dumps(s)
+        loaded = loads(data)
+
+        self.assertIsInstance(loaded, SeenSet)
+        self.assertEqual(loaded, s)
+
+        # Older versions of Ren'Py need to be able to read the pickle.
+        renpy.config.persistent_seen_dicts = True
+
+        dict_data = dumps(s)
+        loaded = loads(dict_data)
+
+        self.assertIs(type(loaded), dict)
+        self.assertEqual(loaded, dict.fromkeys(self.names, True))
+        self.assertEqual(SeenSet(loaded), s)
+
+        self.assertLess(len(data), len(dict_data))
+
+    def test_persistent(self):
+
+        p = Persistent()
+        p._clear()
+        p._seen_ever = SeenSet(self.names)
+
+        for dicts in [ False, True ]:
+            renpy.config.persistent_seen_dicts = dicts
+
+            loaded = loads(dumps(p))
+
+            loaded._update()
+            self.assertIsInstance(loaded._seen_ever, SeenSet)
+            self.assertEqual(loaded._seen_ever, p._seen_ever)
+
+    def test_copy(self):
+
+        import copy
+
+        s = SeenSet(self.names)
+
+        for c in [ copy.copy(s), copy.deepcopy(s) ]:
+            self.assertIsInstance(c, SeenSet)
+            self.assertEqual(c, s)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,372 @@
+#@PydevCodeAnalysisIgnore
+import unittest
+
+import os
+import shutil
+import tempfile
+import time
+
+from unittest import mock
+
+import renpy
+renpy.import_all()
+
+from renpy.execution import Context
+from renpy.rollback import RollbackLog
+from renpy.script import Script, init_signature
+from renpy.translation import ScriptTranslator
+
+SCRIPT = u"""\
+label start:
+    "One."
+    "Two."
+    "Three."
+    return
+
+label other:
+    "Other."
+    return
+"""
+
+
+class TestInitSignature(unittest.TestCase):
+
+    def check(self, a, b, same):
+        a = init_signature(a.encode("utf-8"))
+        b = init_signature(b.encode("utf-8"))
+
+        if same:
+            self.assertEqual(a, b)
+        else:
+            self.assertNotEqual(a, b)
+
+    def test_top_level(self):
+
+        # Labels, images, transforms, and simple defines can be re-run.
+        self.check(SCRIPT, SCRIPT.replace("Two.", "Deux."), True)
+        self.check(u"define e = 1\n", u"define e = 2\n", True)
+        self.check(u"image bg = 'a.png'\n", u"image bg = 'b.png'\n", True)
+
+        self.check(u"define config.a = 1\n", u"define config.a = 2\n", False)
+        self.check(u"define e += [ 1 ]\n", u"define e += [ 2 ]\n", False)
+        self.check(u"default e = 1\n", u"default e = 2\n", False)
+        self.check(u"init python:\n    a = 1\n", u"init python:\n    a = 2\n", False)
+
+    def test_nested(self):
+
+        before = u"""\
+label start:
+    "Hello."
+
+    screen s():
+        text "A"
+        if x:
+            text "B"
+
+    define e = 1
+
+    "Goodbye."
+"""
+
+        # The body of the label isn't part of the signature.
+        self.check(before, before.replace("Hello.", "Hi."), True)
+        self.check(before, before.replace("Goodbye.", "Bye."), True)
+
+        # The init code inside the label is, including its nested blocks.
+        self.check(before, before.replace('"A"', '"C"'), False)
+        self.check(before, before.replace('"B"', '"C"'), False)
+        self.check(before, before.replace("e = 1", "e = 2"), False)
+
+        # Adding or removing init code inside the label changes it.
+        self.check(before, before.replace("    define e = 1\n", ""), False)
+        self.check(before, before.replace('    "Goodbye."', '    default f = 1'), False)
+
+        # Comments and blank lines in the label don't.
+        self.check(before, before.replace('    "Hello."', '    # Comment.\n\n    "Hello."'), True)
+
+
+class TestReload(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.dir, "game"))
+
+        self.fn = os.path.join(self.dir, "game", "script.rpy").replace("\\", "/")
+
+        self.old_basedir = renpy.config.basedir
+        self.old_renpy_base = renpy.config.renpy_base
+        self.old_script = renpy.game.script
+        self.old_contexts = renpy.game.contexts
+        self.old_log = renpy.game.log
+
+        renpy.config.basedir = self.dir
+        renpy.config.renpy_base = self.dir
+
+        script = Script.__new__(Script)
+        script.namemap = { }
+        script.all_stmts = None
+        script.init_signatures = { }
+        script.all_pycode = [ ]
+        script.all_pyexpr = [ ]
+        script.need_analysis = [ ]
+        script.record_pycode = False
+        script.bytecode_oldcache = { }
+        script.bytecode_newcache = { }
+        script.bytecode_dirty = False
+        script.translator = ScriptTranslator()
+        script.serial = 0
+        script.duplicate_labels = [ ]
+
+        self.script = script
+
+        renpy.game.script = script
+        renpy.game.contexts = [ Context(True) ]
+        renpy.game.log = RollbackLog()
+
+        self.load(SCRIPT)
+
+    def tearDown(self):
+        renpy.config.basedir = self.old_basedir
+        renpy.config.renpy_base = self.old_renpy_base
+        renpy.game.script = self.old_script
+        renpy.game.contexts = self.old_contexts
+        renpy.game.log = self.old_log
+
+        shutil.rmtree(self.dir)
+
+    def write(self, text):
+        with open(self.fn, "wb") as f:
+            f.write(text.encode("utf-8"))
+
+    def load(self, text):
+        """
+        Loads `text` as the script file, as Script.load_file does when the
+        game starts.
+        """
+
+        self.write(text)
+
+        filename = renpy.lexer.elide_filename(self.fn)
+
+        stmts = renpy.parser.parse(self.fn, text)
+        self.script.assign_names(stmts, filename)
+        self.script.static_transforms(stmts)
+        self.script.finish_load(stmts, [ ])
+        self.script.analyze()
+
+        self.script.init_signatures[self.fn] = init_signature(text.encode("utf-8"))
+
+    def reload(self, text):
+        self.write(text)
+        return self.script.reload_file(self.fn)
+
+    def nodes(self):
+        """
+        Returns a map from the name of each statement in the file to the
+        statement.
+        """
+
+        filename = renpy.lexer.elide_filename(self.fn)
+        return { k : v for k, v in self.script.namemap.items() if v.filename == filename }
+
+    def say(self, what):
+        """
+        Returns the say statement that says `what`.
+        """
+
+        rv = [ i for i in self.nodes().values() if isinstance(i, renpy.ast.Say) and i.what == what ]
+        self.assertEqual(len(rv), 1, what)
+
+        return rv[0]
+
+    def check_consistent(self):
+        """
+        Checks that every statement in the namemap is one of the statements
+        loaded from the file most recently.
+        """
+
+        nodes = self.nodes()
+
+        for k, v in nodes.items():
+            self.assertEqual(k, v.name)
+
+        for i in self.script.translator.default_translates.values():
+            self.assertIs(self.script.namemap[i.name], i)
+
+        return nodes
+
+    def test_matching(self):
+
+        one = self.say("One.")
+        two = self.say("Two.")
+        three = self.say("Three.")
+        other = self.script.namemap["other"]
+
+        context = renpy.game.context()
+        context.current = two.name
+        context.return_stack = [ three.name ]
+
+        new = SCRIPT.replace("Two.", "Deux.").replace("label other:\n    \"Other.\"\n    return\n", "label added:\n    return\n")
+        self.assertTrue(self.reload(new))
+
+        nodes = self.check_consistent()
+
+        # Unchanged statements keep their names.
+        self.assertEqual(self.say("One.").name, one.name)
+        self.assertIsNot(self.say("One."), one)
+        self.assertEqual(self.say("Three.").name, three.name)
+
+        # Replaced statements get a new name, and the context follows them.
+        deux = self.say("Deux.")
+        self.assertNotEqual(deux.name, two.name)
+        self.assertNotIn(two.name, nodes)
+        self.assertEqual(context.current, deux.name)
+        self.assertEqual(context.return_stack, [ three.name ])
+
+        # Deleted statements are gone, and added statements are there.
+        self.assertFalse(self.script.has_label("other"))
+        self.assertNotIn(other.name, self.script.namemap)
+        self.assertTrue(self.script.has_label("added"))
+
+        self.assertFalse([ i for i in nodes.values() if isinstance(i, renpy.ast.Say) and i.what in ("Two.", "Other.") ])
+
+        # A second reload matches against the statements of the first.
+        deux = self.say("Deux.")
+        added = self.script.namemap["added"]
+
+        self.assertTrue(self.reload(new.replace("One.", "Un.")))
+
+        nodes = self.check_consistent()
+
+        self.assertNotEqual(self.say("Un.").name, one.name)
+        self.assertEqual(self.say("Deux.").name, deux.name)
+        self.assertEqual(self.say("Three.").name, three.name)
+        self.assertEqual(self.script.namemap["added"].name, added.name)
+        self.assertIsNot(self.script.namemap["added"], added)
+
+        self.assertNotIn(one.name, self.script.namemap)
+        self.assertFalse(self.script.has_label("other"))
+
+        # Reloading the file twice leaves the same number of statements.
+        count = len(nodes)
+        self.assertTrue(self.reload(new.replace("One.", "Un.")))
+        self.assertEqual(len(self.check_consistent()), count)
+
+    def test_duplicate(self):
+
+        # A label in another file.
+        elsewhere = renpy.ast.Label(("game/other.rpy", 1), "elsewhere", [ ], None)
+        self.script.namemap["elsewhere"] = elsewhere
+
+        before = dict(self.script.namemap)
+
+        self.assertFalse(self.reload(SCRIPT + "\nlabel elsewhere:\n    return\n"))
+        self.assertEqual(self.script.namemap, before)
+
+        self.assertFalse(self.reload(SCRIPT + "\nlabel start:\n    return\n"))
+        self.assertEqual(self.script.namemap, before)
+
+        self.assertIs(self.script.namemap["elsewhere"], elsewhere)
+
+    def test_failure(self):
+
+        one = self.say("One.")
+
+        before = dict(self.script.namemap)
+        default_translates = dict(self.script.translator.default_translates)
+
+        def analyze():
+            raise Exception("Analysis failed.")
+
+        self.script.analyze = analyze
+
+        with self.assertRaises(Exception):
+            self.reload(SCRIPT.replace("Two.", "Deux.").replace("label other", "label added"))
+
+        # The old statements are still in use.
+        self.assertEqual(self.script.namemap, before)
+        self.assertEqual(self.script.translator.default_translates, default_translates)
+
+        del self.script.analyze
+
+        self.assertTrue(self.reload(SCRIPT.replace("Two.", "Deux.")))
+        self.assertEqual(self.say("One.").name, one.name)
+
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.fn = os.path.join(self.dir, "script.rpy")
+
+        with open(self.fn, "w") as f:
+            f.write("label start:\n    return\n")
+
+        self.old_mtimes = renpy.loader.auto_mtimes
+        self.old_needs_autoreload = renpy.loader.needs_autoreload
+
+        renpy.loader.auto_mtimes = { self.fn : renpy.loader.auto_mtime(self.fn) }
+        renpy.loader.needs_autoreload = set()
+        renpy.loader.auto_quit_flag = False
+
+    def tearDown(self):
+        renpy.loader.auto_mtimes = self.old_mtimes
+        renpy.loader.needs_autoreload = self.old_needs_autoreload
+
+        shutil.rmtree(self.dir)
+
+    def test_polling(self):
+
+        with mock.patch.object(renpy, "linux", True), mock.patch.object(renpy.loader, "Inotify", side_effect=OSError(38, "inotify_init1 failed.")) as inotify:
+
+            thread = renpy.loader.threading.Thread(target=renpy.loader.auto_thread_function)
+            thread.daemon = True
+            thread.start()
+
+            try:
+                mtime = os.path.getmtime(self.fn)
+                os.utime(self.fn, (mtime + 10, mtime + 10))
+
+                deadline = time.time() + 10
+
+                while (self.fn not in renpy.loader.needs_autoreload) and (time.time() < deadline):
+                    time.sleep(.1)
+
+            finally:
+                with renpy.loader.auto_lock:
+                    renpy.loader.auto_quit_flag = True
+                    renpy.loader.auto_lock.notify_all()
+
+                thread.join()
+
+        self.assertTrue(inotify.called)
+        self.assertIn(self.fn, renpy.loader.needs_autoreload)
+
+    @unittest.skipUnless(renpy.linux, "inotify is only used on Linux.")
+    def test_unwatchable(self):
+
+        inotify = renpy.loader.Inotify()
+
+        try:
+            missing = os.path.join(self.dir, "missing")
+
+            self.assertTrue(inotify.watch(self.dir))
+            self.assertTrue(inotify.watch(missing))
+            self.assertFalse(inotify.watch(missing))
+
+            # Directories that can't be watched are polled every time.
+            self.assertIsNotNone(inotify.directories[self.dir])
+            self.assertIsNone(inotify.directories[missing])
+            self.assertEqual(inotify.wait(0), { missing })
+
+            with open(self.fn, "a") as f:
+                f.write("\n")
+
+            self.assertEqual(inotify.wait(1), { self.dir, missing })
+
+        finally:
+            inotify.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+#@PydevCodeAnalysisIgnore
+import unittest
+
+import renpy
+renpy.import_all()
+
+import io
+
+from renpy.ast import MissingNode
+from renpy.compat.pickle import dumps, loads, pickler, unpickler, pickler_memo, unpickler_memo
+from renpy.display.transform import TransformState
+from renpy.execution import Context
+from renpy.loadsave import dump_history, load_history
+from renpy.rollback import Rollback, RollbackLog
+from renpy.script import Script
+
+
+class TestRollback(unittest.TestCase):
+
+    def setUp(self):
+        self.old_contexts = renpy.game.contexts
+        self.old_log = renpy.game.log
+
+        renpy.game.contexts = [ Context(True) ]
+        renpy.game.log = RollbackLog()
+
+    def tearDown(self):
+        renpy.game.contexts = self.old_contexts
+        renpy.game.log = self.old_log
+
+    def begin(self):
+        """
+        Adds a new entry to the log, as RollbackLog.begin does.
+        """
+
+        log = renpy.game.log
+
+        log.current = Rollback()
+        log.log.append(log.current)
+
+        return log.current
+
+    def roll_back(self, rb):
+        """
+        Makes the context of `rb` the running one, as Rollback.rollback
+        does.
+        """
+
+        log = renpy.game.log
+        log.log.remove(rb)
+
+        rb.rollback_control()
+
+    def call(self, label):
+        """
+        Pushes a call onto the running context, as Context.call does.
+        """
+
+        context = renpy.game.context()
+
+        context.call_location_stack.append(label)
+        context.return_stack.append(label)
+        context.dynamic_stack.append({ })
+        context.abnormal_stack.append(False)
+
+    def snapshot(self):
+        """
+        Returns a map from each entry in the log to the state of its
+        context.
+        """
+
+        return { rb : (list(rb.context.return_stack), list(rb.context.call_location_stack), len(rb.context.dynamic_stack)) for rb in renpy.game.log.log }
+
+    def test_entries_unchanged(self):
+
+        log = renpy.game.log
+
+        self.begin()
+        self.call("one")
+        self.begin()
+
+        before = self.snapshot()
+
+        for label in [ "two", "three" ]:
+            rb = self.begin()
+            self.roll_back(rb)
+            log.current = rb
+
+            self.begin()
+            self.call(label)
+
+        after = self.snapshot()
+
+        for rb, state in before.items():
+            if rb in after:
+                self.assertEqual(state, after[rb])
+
+    def test_no_sharing_with_running_context(self):
+
+        self.begin()
+
+        rb = self.begin()
+        self.roll_back(rb)
+
+        # rb is now log.current, and its context is running.
+        renpy.game.log.current = rb
+
+        new = self.begin()
+        self.call("label")
+
+        self.assertEqual(new.context.return_stack, [ ])
+        self.assertEqual(len(new.context.dynamic_stack), 1)
+
+
+class TestHistory(unittest.TestCase):
+
+    def test_shared_objects(self):
+
+        shared = [ 1, 2, 3 ]
+        game = { "shared" : shared, "other" : [ 4 ] }
+        history = [ { "old" : shared }, [ 5 ] ]
+
+        f = io.BytesIO()
+
+        p = pickler(f)
+        p.dump(game)
+
+        data, refs = dump_history(history, pickler_memo(p))
+        p.dump(refs)
+
+        f.seek(0)
+
+        up = unpickler(f)
+        loaded_game = up.load()
+        loaded_refs = up.load()
+
+        memo = unpickler_memo(up)
+        loaded_history = load_history(data, { i : memo[i] for i in loaded_refs })
+
+        self.assertEqual(loaded_history, history)
+        self.assertIs(loaded_history[0]["old"], loaded_game["shared"])
+
+        # Only the objects the history uses are kept.
+        self.assertEqual(len(loaded_refs), 1)
+
+    def test_failure(self):
+
+        log = RollbackLog()
+
+        entries = list(log.log)
+
+        def loader():
+            raise Exception("Broken history.")
+
+        log.history_loader = loader
+
+        self.assertFalse(log.load_history())
+        self.assertIsNone(log.history_loader)
+        self.assertEqual(list(log.log), entries)
+
+
+class TestSaveReducers(unittest.TestCase):
+
+    def setUp(self):
+        self.old_script = renpy.game.script
+        self.old_vectors = renpy.config.save_object_vectors
+
+        renpy.game.script = Script.__new__(Script)
+        renpy.game.script.namemap = { }
+
+    def tearDown(self):
+        renpy.game.script = self.old_script
+        renpy.config.save_object_vectors = self.old_vectors
+
+    def node(self, cls, name, filename="game/script.rpy", *args):
+        rv = cls((filename, 1), *args)
+        rv.name = name
+
+        renpy.game.script.namemap[name] = rv
+
+        return rv
+
+    def round_trip(self, o):
+        return loads(dumps(o, save=True))
+
+    def test_node_by_name(self):
+
+        node = self.node(renpy.ast.Pass, ("game/script.rpy", 1, 0))
+        label = self.node(renpy.ast.Label, "start", "game/script.rpy", "start", [ ], None)
+
+        self.assertIs(self.round_trip(node), node)
+        self.assertIs(self.round_trip(label), label)
+
+        # A subclass defined after the reducers were registered.
+        class Later(renpy.ast.Pass):
+            __slots__ = [ ]
+
+        later = self.node(Later, ("game/script.rpy", 2, 0))
+        self.assertIs(self.round_trip(later), later)
+
+    def test_unstable(self):
+
+        # Nodes that aren't in the script, or won't have the same name when
+        # the game is run again, are pickled as usual.
+        for node in [
+                renpy.ast.Pass(("game/script.rpy", 1)),
+                self.node(renpy.ast.Pass, ("<screen language>", 1, 0), "<screen language>"),
+                ]:
+
+            loaded = self.round_trip(node)
+
+            self.assertIsNot(loaded, node)
+            self.assertIsInstance(loaded, renpy.ast.Pass)
+            self.assertEqual(loaded.name, node.name)
+
+    def test_missing(self):
+
+        node = self.node(renpy.ast.Pass, ("game/script.rpy", 1, 0))
+        data = dumps([ node, node ], save=True)
+
+        del renpy.game.script.namemap[node.name]
+
+        loaded = loads(data)
+
+        self.assertIsInstance(loaded[0], MissingNode)
+        self.assertIs(loaded[0], loaded[1])
+        self.assertEqual(loaded[0].name, node.name)
+
+        with self.assertRaises(Exception):
+            loaded[0].execute()
+
+    def test_object_vectors(self):
+
+        a = TransformState()
+        a.xpos = 0.5
+        a.zoom = 2.0
+
+        b = TransformState()
+        b.xpos = 0.25
+
+        for vectors in [ True, False ]:
+            renpy.config.save_object_vectors = vectors
+
+            # Objects saved both ways, and with the stock reductions, load.
+            for data in [ dumps([ a, b ], save=True), dumps([ a, b ]) ]:
+                loaded = loads(data)
+
+                self.assertEqual(vars(loaded[0]), vars(a))
+                self.assertEqual(vars(loaded[1]), vars(b))
+
+        states = [ TransformState() for _i in range(10) ]
+
+        renpy.config.save_object_vectors = True
+        vector = len(dumps(states, save=True))
+
+        renpy.config.save_object_vectors = False
+        self.assertLess(vector, len(dumps(states, save=True)))
+
+
+if __name__ == "__main__":
+    unittest.main()
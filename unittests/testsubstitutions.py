@@ -0,0 +1,108 @@
+#@PydevCodeAnalysisIgnore
+import unittest
+import string
+
+import renpy
+renpy.import_all()
+
+from renpy.substitutions import formatter, get_template, Uncompiled
+
+
+class Object(object):
+    pass
+
+
+class TestTemplate(unittest.TestCase):
+
+    def setUp(self):
+
+        o = Object()
+        o.name = "Eileen"
+        o.child = Object()
+        o.child.age = 20
+
+        self.kwargs = {
+            "name" : "lucy",
+            "number" : 42,
+            "pi" : 3.14159,
+            "o" : o,
+            "l" : [ "zero", "one", "two" ],
+            "d" : { "key" : "value" },
+            "inner" : "[name] and [number]",
+            }
+
+    def formatted(self, s):
+        """
+        Returns the result of formatting `s` with string.Formatter, using
+        Ren'Py's parser.
+        """
+
+        return string.Formatter.vformat(formatter, s, (), self.kwargs)
+
+    def check(self, s):
+        template = formatter.compile(s)
+
+        self.assertIsNotNone(template, s)
+        self.assertEqual(template.format(self.kwargs), self.formatted(s), s)
+
+    def test_same_as_formatter(self):
+
+        for s in [
+                "",
+                "No fields at all.",
+                "Hello, [name].",
+                "[name][number]",
+                "[[name] is not a field.",
+                "[number:>6]",
+                "[pi:.2f]",
+                "[name!u]",
+                "[name!c]",
+                "[name!r]",
+                "[number!s]",
+                "[name!q]",
+                "[name!cl]",
+                "[o.name] is [o.child.age].",
+                "[l[1]] and [l[2]]",
+                "[d[key]]",
+                "[inner!i]",
+                "[o.name:>10!u]",
+                ]:
+
+            self.check(s)
+
+    def test_uncompiled(self):
+
+        for s in [ "[0]", "[l[0]] [0]" ]:
+            self.assertIsNone(formatter.compile(s), s)
+            self.assertIsInstance(get_template(s), Uncompiled)
+
+    def test_errors(self):
+
+        for s, exception in [
+                ("[missing]", KeyError),
+                ("[o.missing]", AttributeError),
+                ("[l[5]]", IndexError),
+                ]:
+
+            with self.assertRaises(exception):
+                self.formatted(s)
+
+            with self.assertRaises(exception):
+                formatter.compile(s).format(self.kwargs)
+
+        with self.assertRaises(ValueError):
+            formatter.compile("[name!x]")
+
+        with self.assertRaises(Exception):
+            formatter.compile("[name")
+
+    def test_cache(self):
+
+        s = "Hello, [name]."
+
+        self.assertIs(get_template(s), get_template(s))
+        self.assertEqual(formatter.vformat(s, (), self.kwargs), "Hello, lucy.")
+
+
+if __name__ == "__main__":
+    unittest.main()
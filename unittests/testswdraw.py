@@ -0,0 +1,192 @@
+#@PydevCodeAnalysisIgnore
+import unittest
+
+import types
+
+from unittest import mock
+
+import renpy
+renpy.import_all()
+
+from renpy.display.render import Render
+from renpy.display.swdraw import Clipper, do_draw_screen, surface
+
+WIDTH = 400
+HEIGHT = 300
+
+# The clipping rectangle of the whole screen.
+CLIP = (0, 0, WIDTH, HEIGHT)
+
+
+class Window(object):
+    """
+    Stands in for the screen, recording the rectangles that are drawn.
+    """
+
+    def __init__(self):
+        self.surface = surface(WIDTH, HEIGHT, False)
+        self.rects = [ ]
+
+    def subsurface(self, rect):
+        self.rects.append(rect)
+        return self.surface.subsurface(rect)
+
+
+class TestDamage(unittest.TestCase):
+
+    def setUp(self):
+        self.old_width = renpy.config.screen_width
+        self.old_height = renpy.config.screen_height
+
+        renpy.config.screen_width = WIDTH
+        renpy.config.screen_height = HEIGHT
+
+        self.clipper = Clipper()
+        self.window = Window()
+        self.swdraw = types.SimpleNamespace(window=self.window)
+
+        self.patches = [
+            mock.patch.object(renpy.display.swdraw, "clippers", [ self.clipper ]),
+            mock.patch.object(renpy.display, "interface", types.SimpleNamespace(text_rect=None)),
+            ]
+
+        for i in self.patches:
+            i.start()
+
+    def tearDown(self):
+        for i in self.patches:
+            i.stop()
+
+        renpy.config.screen_width = self.old_width
+        renpy.config.screen_height = self.old_height
+
+    def screen(self, *children):
+        """
+        Returns a screen Render, with each child blitted at its position.
+        """
+
+        rv = Render(WIDTH, HEIGHT)
+
+        for child, pos in children:
+            rv.blit(child, pos)
+
+        return rv
+
+    def draw(self, screen_render, full_redraw=False):
+        """
+        Draws `screen_render`, returning the update rectangles.
+        """
+
+        self.window.rects = [ ]
+        return sorted(do_draw_screen(screen_render, full_redraw, self.swdraw))
+
+    def test_unchanged(self):
+
+        child = Render(50, 50)
+        child.blit(surface(50, 50, True), (0, 0))
+
+        self.assertEqual(self.draw(self.screen((child, (10, 10))), True), [ CLIP ])
+
+        key = (id(child), 10, 10, CLIP)
+        entry = self.clipper.old_renders[key]
+
+        # An unchanged child of a changed Render reuses what it recorded,
+        # and nothing is drawn.
+        screen = self.screen((child, (10, 10)))
+
+        self.assertEqual(self.draw(screen), [ ])
+        self.assertIs(self.clipper.old_renders[key], entry)
+        self.assertEqual(self.window.rects, [ ])
+
+        # An unchanged Render isn't walked at all.
+        key = (id(screen), 0, 0, CLIP)
+        entry = self.clipper.old_renders[key]
+
+        self.assertEqual(self.draw(screen), [ ])
+        self.assertIs(self.clipper.old_renders[key], entry)
+        self.assertEqual(list(self.clipper.old_renders), [ key ])
+
+    def test_moved(self):
+
+        child = Render(50, 50)
+        child.blit(surface(50, 50, True), (0, 0))
+
+        self.draw(self.screen((child, (10, 10))), True)
+
+        # The old and new positions are redrawn, rounded up by a pixel.
+        updates = self.draw(self.screen((child, (100, 100))))
+        self.assertEqual(updates, [ (10, 10, 51, 51), (100, 100, 51, 51) ])
+
+        self.assertNotIn((id(child), 10, 10, CLIP), self.clipper.old_renders)
+        self.assertIn((id(child), 100, 100, CLIP), self.clipper.old_renders)
+
+    def test_changed_surface(self):
+
+        self.draw(self.screen((surface(20, 20, True), (30, 40))), True)
+        self.assertEqual(self.draw(self.screen((surface(20, 20, True), (30, 40)))), [ (30, 40, 21, 21) ])
+
+    def viewport(self, *children):
+        """
+        Returns a 100x100 clipped Render at (50, 50) on the screen, showing
+        the top of a taller Render containing `children`.
+        """
+
+        inner = Render(100, 300)
+
+        for child, pos in children:
+            inner.blit(child, pos)
+
+        rv = Render(100, 100)
+        rv.xclipping = True
+        rv.yclipping = True
+        rv.blit(inner, (0, 0))
+
+        return self.screen((rv, (50, 50)))
+
+    def test_viewport(self):
+
+        top = surface(20, 20, True)
+
+        self.draw(self.viewport((top, (0, 0)), (surface(20, 20, True), (0, 200))), True)
+
+        # A change that's clipped out of the viewport isn't redrawn, and
+        # nor is the rest of the viewport.
+        self.assertEqual(self.draw(self.viewport((top, (0, 0)), (surface(20, 20, True), (0, 200)))), [ ])
+
+        # A change inside the viewport only redraws the area that changed.
+        self.assertEqual(self.draw(self.viewport((surface(20, 20, True), (10, 0)))), [ (50, 50, 31, 21) ])
+
+        # A change that crosses the edge of the viewport is clipped to it.
+        self.assertEqual(self.draw(self.viewport((surface(20, 20, True), (90, 90)))), [ (60, 50, 21, 21), (140, 140, 10, 10) ])
+
+    def test_separate(self):
+
+        def frame():
+            return self.screen((surface(50, 50, True), (10, 10)), (surface(50, 50, True), (300, 200)))
+
+        self.draw(frame(), True)
+
+        # Rectangles far apart cover less than half of the area containing
+        # them, so each is drawn on its own.
+        updates = self.draw(frame())
+
+        self.assertEqual(updates, [ (10, 10, 51, 51), (300, 200, 51, 51) ])
+        self.assertEqual(sorted(self.window.rects), updates)
+
+    def test_bounding_box(self):
+
+        def frame():
+            return self.screen((surface(50, 50, True), (10, 10)), (surface(50, 50, True), (62, 10)))
+
+        self.draw(frame(), True)
+
+        # Rectangles close together cover most of the area containing them,
+        # so it's drawn once.
+        updates = self.draw(frame())
+
+        self.assertEqual(updates, [ (10, 10, 51, 51), (62, 10, 51, 51) ])
+        self.assertEqual(self.window.rects, [ (10, 10, 103, 51) ])
+
+
+if __name__ == "__main__":
+    unittest.main()
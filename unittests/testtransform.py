@@ -0,0 +1,175 @@
+#@PydevCodeAnalysisIgnore
+import unittest
+
+import renpy
+renpy.import_all()
+
+from renpy.display.transform import TransformState, all_properties, diff2_properties, diff4_properties
+
+
+def old_take_state(self, ts):
+    """
+    TransformState.take_state before it only copied the properties that
+    were set, walking every property instead.
+    """
+
+    d = self.__dict__
+
+    for k in all_properties:
+        d[k] = getattr(ts, k)
+
+    self.last_angle = ts.last_angle
+    self.last_anchorangle = ts.last_anchorangle
+    self.last_events = ts.last_events
+
+    self.available_width = ts.available_width
+    self.available_height = ts.available_height
+
+    if self.perspective is None:
+        self.xpos = None
+        self.ypos = None
+        self.xanchor = None
+        self.yanchor = None
+
+    (self.inherited_xpos,
+     self.inherited_ypos,
+     self.inherited_xanchor,
+     self.inherited_yanchor,
+     _,
+     _,
+     _) = ts.get_placement()
+
+    self.xoffset = ts.xoffset
+    self.yoffset = ts.yoffset
+    self.subpixel = ts.subpixel
+
+
+def old_diff(self, newts):
+    """
+    TransformState.diff before it only compared the properties that were
+    set, walking every property instead.
+    """
+
+    rv = { }
+
+    for prop in diff2_properties:
+        new = getattr(newts, prop)
+        old = getattr(self, prop)
+
+        if new != old:
+            rv[prop] = (old, new)
+
+    for prop in diff4_properties:
+
+        new = getattr(newts, prop)
+        old = getattr(self, prop)
+
+        if new is None:
+            new = getattr(newts, "inherited_" + prop)
+        if old is None:
+            old = getattr(self, "inherited_" + prop)
+
+        if new != old:
+            rv[prop] = (old, new)
+
+    return rv
+
+
+def values(state):
+    """
+    Returns a dict giving the value of every property of `state`, and the
+    fields take_state copies.
+    """
+
+    rv = { k : getattr(state, k) for k in all_properties }
+
+    for k in [ "inherited_xpos", "inherited_ypos", "inherited_xanchor", "inherited_yanchor",
+               "last_angle", "last_anchorangle", "last_events", "available_width", "available_height" ]:
+
+        rv[k] = getattr(state, k)
+
+    return rv
+
+
+def states():
+    """
+    Returns a list of states, with properties set, reset to their defaults,
+    and inherited from other states.
+    """
+
+    default = TransformState()
+
+    # Properties set.
+    changed = TransformState()
+    changed.xalign = 0.5
+    changed.ypos = 100
+    changed.zoom = 2.0
+    changed.alpha = 0.5
+    changed.rotate = 45.0
+    changed.xoffset = 10.0
+    changed.subpixel = True
+
+    # Properties reset to their defaults.
+    reset = TransformState()
+    reset.xalign = 0.5
+    reset.zoom = 1.0
+    reset.alpha = 1.0
+    reset.rotate = None
+    reset.xoffset = 0.0
+
+    # Properties inherited, some of which are then changed.
+    inherited = TransformState()
+    inherited.take_state(changed)
+    inherited.alpha = 1.0
+    inherited.xzoom = 3.0
+
+    twice = TransformState()
+    twice.take_state(inherited)
+    twice.zoom = 1.0
+
+    # Properties inherited from a state that has them at their defaults.
+    cleared = TransformState()
+    cleared.take_state(changed)
+    cleared.take_state(default)
+
+    perspective = TransformState()
+    perspective.perspective = True
+    perspective.take_state(changed)
+
+    return [ default, changed, reset, inherited, twice, cleared, perspective ]
+
+
+class TestTransformState(unittest.TestCase):
+
+    def test_take_state(self):
+
+        for i in range(len(states())):
+            for j in range(len(states())):
+
+                new = states()
+                new[i].take_state(new[j])
+
+                old = states()
+                old_take_state(old[i], old[j])
+
+                self.assertEqual(values(new[i]), values(old[i]), (i, j))
+
+    def test_diff(self):
+
+        for i, a in enumerate(states()):
+            for j, b in enumerate(states()):
+                self.assertEqual(a.diff(b), old_diff(a, b), (i, j))
+
+    def test_nondefault(self):
+
+        for i, state in enumerate(states()):
+
+            nondefault = set(state.nondefault(all_properties))
+
+            for k in all_properties:
+                if getattr(state, k) != getattr(TransformState, k):
+                    self.assertIn(k, nondefault, (i, k))
+
+
+if __name__ == "__main__":
+    unittest.main()